@@ -0,0 +1,133 @@
+"""
+Analytics Lookup Benchmark
+--------------------------
+This file measures get_property_analytics against a local DynamoDB stub
+(DynamoDB Local, or `moto_server`) given by DYNAMODB_ENDPOINT_URL.
+It is responsible for:
+1. Creating the two analytics tables on the stub and seeding view/interest events.
+2. Timing the old per-property COUNT queries, the concurrent event-query fallback
+   and the batch_get_item lookup of the per-property total items.
+3. Counting the DynamoDB requests each approach sends.
+
+Run with:  DYNAMODB_ENDPOINT_URL=http://localhost:5000 python -m app.analytics.benchmark
+--latency-ms adds a delay to every request, to stand in for the network round
+trip to the real service that a local stub doesn't have.
+"""
+import argparse
+import os
+import random
+import time
+from datetime import date, timedelta
+
+from boto3.dynamodb.conditions import Key
+
+from app.analytics import dynamo
+
+
+def create_tables():
+    existing = dynamo.dynamodb.meta.client.list_tables()['TableNames']
+    for name, sort_key in ((dynamo.VIEW_TABLE, 'date'), (dynamo.INTEREST_TABLE, 'interested_at')):
+        if name in existing:
+            continue
+        dynamo.dynamodb.create_table(
+            TableName=name,
+            KeySchema=[
+                {'AttributeName': 'property_id', 'KeyType': 'HASH'},
+                {'AttributeName': sort_key, 'KeyType': 'RANGE'},
+            ],
+            AttributeDefinitions=[
+                {'AttributeName': 'property_id', 'AttributeType': 'S'},
+                {'AttributeName': sort_key, 'AttributeType': 'S'},
+            ],
+            BillingMode='PAY_PER_REQUEST',
+        ).wait_until_exists()
+
+
+def seed(property_ids, days, with_totals):
+    rng = random.Random(7)
+    today = date.today()
+    with dynamo.view_table.batch_writer(overwrite_by_pkeys=['property_id', 'date']) as views, \
+            dynamo.interest_table.batch_writer(overwrite_by_pkeys=['property_id', 'interested_at']) as interests:
+        for pid in property_ids:
+            total_views = 0
+            for n in range(days):
+                count = rng.randint(0, 15)
+                total_views += count
+                views.put_item(Item={
+                    'property_id': pid,
+                    'date': (today - timedelta(days=n)).isoformat(),
+                    'view_count': count,
+                })
+            total_interests = rng.randint(0, 8)
+            for n in range(total_interests):
+                interests.put_item(Item={
+                    'property_id': pid,
+                    'interested_at': f"{today.isoformat()}T00:00:{n:02d}",
+                })
+
+            if with_totals:
+                views.put_item(Item={'property_id': pid, 'date': dynamo.TOTAL_SORT_KEY, 'view_count': total_views})
+                interests.put_item(Item={
+                    'property_id': pid,
+                    'interested_at': dynamo.TOTAL_SORT_KEY,
+                    'interest_count': total_interests,
+                })
+            else:
+                views.delete_item(Key={'property_id': pid, 'date': dynamo.TOTAL_SORT_KEY})
+                interests.delete_item(Key={'property_id': pid, 'interested_at': dynamo.TOTAL_SORT_KEY})
+
+
+def sequential_counts(properties):
+    """The previous implementation: one COUNT query per property per table, in turn."""
+    for prop in properties:
+        dynamo.view_table.query(KeyConditionExpression=Key('property_id').eq(prop['property_id']), Select='COUNT')
+    for prop in properties:
+        dynamo.interest_table.query(KeyConditionExpression=Key('property_id').eq(prop['property_id']), Select='COUNT')
+
+
+def measure(label, fn, properties, runs, counter):
+    fn(properties)  # warm up connections
+    counter['requests'] = 0
+    started = time.perf_counter()
+    for _ in range(runs):
+        fn(properties)
+    elapsed = (time.perf_counter() - started) / runs
+    print(f"  {label:<28} {elapsed * 1000:8.1f} ms  {counter['requests'] / runs:5.0f} requests")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--properties', type=int, default=5, help="retrieved properties per question (retriever k)")
+    parser.add_argument('--days', type=int, default=30, help="daily view items per property")
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    args = parser.parse_args()
+
+    if not os.getenv('DYNAMODB_ENDPOINT_URL'):
+        raise SystemExit("Set DYNAMODB_ENDPOINT_URL to a local DynamoDB stub; this script writes test data.")
+
+    counter = {'requests': 0}
+
+    def before_send(**kwargs):
+        counter['requests'] += 1
+        if args.latency_ms:
+            time.sleep(args.latency_ms / 1000)
+
+    # The lookups use dynamo.client; sequential_counts goes through the table resources
+    for client in (dynamo.client, dynamo.dynamodb.meta.client):
+        client.meta.events.register('before-send.dynamodb', before_send)
+
+    create_tables()
+    property_ids = [f"bench-{n}" for n in range(args.properties)]
+    properties = [{'property_id': pid} for pid in property_ids]
+
+    print(f"{args.properties} properties, {args.days} days of views, +{args.latency_ms:g} ms per request")
+    seed(property_ids, args.days, with_totals=False)
+    measure("sequential COUNT queries", sequential_counts, properties, args.runs, counter)
+    measure("concurrent event queries", dynamo.get_property_analytics, properties, args.runs, counter)
+    seed(property_ids, args.days, with_totals=True)
+    measure("batch_get_item of totals", dynamo.get_property_analytics, properties, args.runs, counter)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Analytics Cache Module
+----------------------
+This file keeps recently fetched property analytics so that popular properties,
+which show up in the results of many questions, don't hit DynamoDB every time.
+It is responsible for:
+1. An in-process LRU cache whose entries expire after a TTL.
+2. Optionally sharing entries between pods through Redis (ANALYTICS_CACHE_REDIS_URL),
+   so a property fetched by one replica is a hit on the others.
+3. Counting hits and misses, reported by /health.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    def __init__(
+        self, ttl: float, maxsize: int, redis_url: str = None, prefix: str = "ai:analytics:",
+        clock=time.monotonic,
+    ):
+        self.ttl = ttl
+        # Local expiry only; entries shared through Redis carry wall-clock times
+        self.clock = clock
+        self.maxsize = maxsize
+        self.prefix = prefix
+        # key -> (expires_at, value), least recently used first
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+        self._redis = None
+        if redis_url:
+            try:
+                import redis
+                self._redis = redis.Redis.from_url(redis_url, decode_responses=True, socket_timeout=0.2)
+            except Exception as e:
+                print(f" Analytics cache: Redis unavailable, using the local cache only: {e}")
+
+    def get_many(self, keys: list) -> dict:
+        """Returns {key: value} for the keys that are cached and not expired."""
+        found = {}
+        now = self.clock()
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                if entry[0] <= now:
+                    del self._entries[key]
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = entry[1]
+            self.hits += len(found)
+
+        missing = [key for key in keys if key not in found]
+        if missing and self._redis is not None:
+            shared = self._get_shared(missing)
+            for key, (expires_at, value) in shared.items():
+                # The local copy expires together with the shared entry
+                self._set_local({key: value}, expires_at - time.time())
+                found[key] = value
+            with self._lock:
+                self.redis_hits += len(shared)
+
+        with self._lock:
+            self.misses += len(keys) - len(found)
+        return found
+
+    def set_many(self, values: dict):
+        if not values:
+            return
+        self._set_local(values, self.ttl)
+        if self._redis is not None:
+            expires_at = time.time() + self.ttl
+            try:
+                pipe = self._redis.pipeline(transaction=False)
+                for key, value in values.items():
+                    pipe.set(self.prefix + key, json.dumps([expires_at, value]), ex=max(1, int(self.ttl)))
+                pipe.execute()
+            except Exception as e:
+                print(f" Analytics cache: Redis write failed: {e}")
+
+    def _set_local(self, values: dict, ttl: float):
+        if ttl <= 0:
+            return
+        expires_at = self.clock() + ttl
+        with self._lock:
+            for key, value in values.items():
+                self._entries[key] = (expires_at, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _get_shared(self, keys: list) -> dict:
+        try:
+            raw = self._redis.mget([self.prefix + key for key in keys])
+        except Exception as e:
+            print(f" Analytics cache: Redis read failed: {e}")
+            return {}
+        # key -> (wall-clock expiry, value)
+        return {key: json.loads(value) for key, value in zip(keys, raw) if value is not None}
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.redis_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "redis_hits": self.redis_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.redis_hits) / lookups, 3) if lookups else None,
+                "shared": self._redis is not None,
+            }
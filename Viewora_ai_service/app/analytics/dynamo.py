@@ -4,74 +4,216 @@ It is responsible for:
 1. Connecting to AWS DynamoDB tables (PropertyViewEvents, PropertyInterestEvents).
 2. Fetching view counts and interest metrics for specific properties.
 3. Summarizing this data into human-readable text (e.g., "High demand") for the AI to mention.
+
+The backend keeps one running-total item per property in each table (sort key
+"total"), so the counts for every retrieved property come back from a single
+batch_get_item call. Properties without total items yet are counted from their
+event items, with all of those queries running concurrently. Interest events
+expire after 90 days, so that fallback can report fewer interests than the
+all-time total; the backend's backfill_dynamo_totals command writes the totals
+for every published property.
 """
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
+
 import boto3   #aws sdk for python to connect aws service on here
-from boto3.dynamodb.conditions import Key
-from collections import defaultdict
 
-# Initialize DynamoDB client
-dynamodb = boto3.resource(
-    'dynamodb',
+from app.analytics.cache import TTLCache
+
+DYNAMODB_SETTINGS = dict(
     region_name=os.getenv('AWS_REGION', 'us-east-1'),
     aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-    aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY')
+    aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+    # Points at DynamoDB Local (or another stub) for development and benchmarks
+    endpoint_url=os.getenv('DYNAMODB_ENDPOINT_URL') or None,
+)
+
+# Table resources, used to write test data in benchmark.py
+dynamodb = boto3.resource('dynamodb', **DYNAMODB_SETTINGS)
+
+# The lookups run on executor threads. boto3 resources are not thread-safe,
+# and resource.meta.client still converts Python values to and from DynamoDB
+# types, so they use this plain client with typed values ({'S': ...}).
+client = boto3.client('dynamodb', **DYNAMODB_SETTINGS)
+
+VIEW_TABLE = 'PropertyViewEvents'
+INTEREST_TABLE = 'PropertyInterestEvents'
+
+view_table = dynamodb.Table(VIEW_TABLE)
+interest_table = dynamodb.Table(INTEREST_TABLE)
+
+# Sort key value of the per-property running totals written by the backend
+TOTAL_SORT_KEY = 'total'
+
+# BatchGetItem accepts at most 100 keys; each property needs one per table
+BATCH_GET_PROPERTIES = 50
+
+# Bounds the fallback queries across all concurrent requests
+analytics_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="dynamo")
+
+# Runs get_property_analytics for async routes. Separate from analytics_executor,
+# whose fallback queries it waits on, and sized for the concurrent questions of a pod
+# rather than the few threads of asyncio's default executor.
+lookup_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('ANALYTICS_LOOKUP_THREADS', '32')), thread_name_prefix="analytics"
+)
+
+# property_id -> [views, interests]; demand labels can be a minute behind
+analytics_cache = TTLCache(
+    ttl=float(os.getenv('ANALYTICS_CACHE_TTL', '60')),
+    maxsize=int(os.getenv('ANALYTICS_CACHE_SIZE', '10000')),
+    redis_url=os.getenv('ANALYTICS_CACHE_REDIS_URL'),
 )
 
-view_table = dynamodb.Table('PropertyViewEvents')
-interest_table = dynamodb.Table('PropertyInterestEvents')
+
+def fetch_counters(property_ids: list):
+    """
+    Reads the total items of both tables in one batch_get_item call per 50
+    properties. Returns ({property_id: views}, {property_id: interests}),
+    leaving out properties without a total item in that table.
+    """
+    total = {'S': TOTAL_SORT_KEY}
+    views, interests = {}, {}
+    for start in range(0, len(property_ids), BATCH_GET_PROPERTIES):
+        chunk = property_ids[start:start + BATCH_GET_PROPERTIES]
+        request = {
+            VIEW_TABLE: {
+                'Keys': [{'property_id': {'S': pid}, 'date': total} for pid in chunk],
+                'ProjectionExpression': 'property_id, view_count',
+            },
+            INTEREST_TABLE: {
+                'Keys': [{'property_id': {'S': pid}, 'interested_at': total} for pid in chunk],
+                'ProjectionExpression': 'property_id, interest_count',
+            },
+        }
+        # DynamoDB may hand back part of a batch when throttled; UnprocessedKeys
+        # has the same typed shape, so it is sent again as it is
+        while request:
+            response = client.batch_get_item(RequestItems=request)
+            for item in response['Responses'].get(VIEW_TABLE, []):
+                views[item['property_id']['S']] = int(item.get('view_count', {}).get('N', 0))
+            for item in response['Responses'].get(INTEREST_TABLE, []):
+                interests[item['property_id']['S']] = int(
+                    item.get('interest_count', {}).get('N', 0)
+                )
+            request = response.get('UnprocessedKeys')
+    return views, interests
+
+
+def count_views(prop_id: str) -> int:
+    """Sums the daily view items of one property."""
+    views = 0
+    kwargs = {
+        'TableName': VIEW_TABLE,
+        'KeyConditionExpression': 'property_id = :pid',
+        'ExpressionAttributeValues': {':pid': {'S': prop_id}},
+        'ProjectionExpression': 'view_count',
+    }
+    while True:
+        response = client.query(**kwargs)
+        views += sum(int(item.get('view_count', {}).get('N', 0)) for item in response['Items'])
+        if 'LastEvaluatedKey' not in response:
+            return views
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def count_interests(prop_id: str) -> int:
+    """Counts the interest event items of one property."""
+    interests = 0
+    kwargs = {
+        'TableName': INTEREST_TABLE,
+        'KeyConditionExpression': 'property_id = :pid',
+        'ExpressionAttributeValues': {':pid': {'S': prop_id}},
+        'Select': 'COUNT',
+    }
+    while True:
+        response = client.query(**kwargs)
+        interests += response.get('Count', 0)
+        if 'LastEvaluatedKey' not in response:
+            return interests
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def count_from_events(view_ids: list, interest_ids: list):
+    """
+    Fallback for properties without total items. Every query is submitted at
+    once, so the wait is about one round trip instead of one per query.
+    Returns ({property_id: views}, {property_id: interests}).
+    """
+    view_futures = {pid: analytics_executor.submit(count_views, pid) for pid in view_ids}
+    interest_futures = {pid: analytics_executor.submit(count_interests, pid) for pid in interest_ids}
+
+    views, interests = {}, {}
+    for counts, futures in ((views, view_futures), (interests, interest_futures)):
+        for pid, future in futures.items():
+            try:
+                counts[pid] = future.result()
+            except Exception as e:
+                print(f"DynamoDB Query Error for property {pid}: {e}")
+    return views, interests
+
+
+def fetch_analytics(property_ids: list) -> dict:
+    """
+    Fetches view and interest counts from DynamoDB and caches them.
+    Returns {property_id: [views, interests]}.
+    """
+    view_counts, interest_counts = {}, {}
+    try:
+        view_counts, interest_counts = fetch_counters(property_ids)
+    except Exception as e:
+        print(f"DynamoDB Batch Get Error: {e}")
+
+    missing_views = [pid for pid in property_ids if pid not in view_counts]
+    missing_interests = [pid for pid in property_ids if pid not in interest_counts]
+    if missing_views or missing_interests:
+        fallback_views, fallback_interests = count_from_events(missing_views, missing_interests)
+        view_counts.update(fallback_views)
+        interest_counts.update(fallback_interests)
+
+    counts = {
+        pid: [view_counts[pid], interest_counts[pid]]
+        for pid in property_ids
+        if pid in view_counts and pid in interest_counts
+    }
+    # Failed lookups are not cached, so the next question tries again
+    analytics_cache.set_many(counts)
+    return counts
 
 
 def get_property_analytics(properties: list) -> str:
     """
     Fetches real-time view and interest counts from DynamoDB for the given properties.
     Returns a human-readable summary for the AI to use in its response.
-    
+
     Args:
         properties: List of property metadata dicts containing 'property_id'
-    
+
     Returns:
         str: Analytics summary text
     """
     if not properties:
         return "No specific analytics available for the current query."
-    
-    # Extract property IDs
-    property_ids = [str(prop.get('property_id')) for prop in properties if prop.get('property_id')]
-    
+
+    # Extract property IDs (BatchGetItem rejects duplicate keys)
+    property_ids = list(dict.fromkeys(
+        str(prop.get('property_id')) for prop in properties if prop.get('property_id')
+    ))
+
     if not property_ids:
         return "Property analytics are being indexed."
-    
-    # Fetch view counts
-    view_counts = defaultdict(int)
-    try:
-        for prop_id in property_ids:
-            response = view_table.query(
-                KeyConditionExpression=Key('property_id').eq(prop_id),
-                Select='COUNT'
-            )
-            view_counts[prop_id] = response.get('Count', 0)
-    except Exception as e:
-        print(f"DynamoDB View Query Error: {e}")
-    
-    # Fetch interest counts
-    interest_counts = defaultdict(int)
-    try:
-        for prop_id in property_ids:
-            response = interest_table.query(
-                KeyConditionExpression=Key('property_id').eq(prop_id),
-                Select='COUNT'
-            )
-            interest_counts[prop_id] = response.get('Count', 0)
-    except Exception as e:
-        print(f"DynamoDB Interest Query Error: {e}")
-    
+
+    counts = analytics_cache.get_many(property_ids)
+    uncached = [pid for pid in property_ids if pid not in counts]
+    if uncached:
+        counts.update(fetch_analytics(uncached))
+
     # Build analytics summary
     analytics_lines = []
     for prop_id in property_ids:
-        views = view_counts.get(prop_id, 0)
-        interests = interest_counts.get(prop_id, 0)
-        
+        views, interests = counts.get(prop_id, (0, 0))
+
         # Categorize popularity
         if views > 20 or interests > 5:
             popularity = "High demand"
@@ -81,13 +223,23 @@ def get_property_analytics(properties: list) -> str:
             popularity = "Growing interest"
         else:
             popularity = "Newly listed"
-        
+
         analytics_lines.append(
             f"Property {prop_id}: {views} views, {interests} expressions of interest ({popularity})"
         )
-    
+
     if not analytics_lines:
         return "Real-time analytics are currently being synchronized."
-    
+
     return "Market Analytics:\n" + "\n".join(analytics_lines)
 
+
+async def aget_property_analytics(properties: list) -> str:
+    """
+    get_property_analytics for async routes. boto3 blocks, so the lookup runs
+    on lookup_executor: at most ANALYTICS_LOOKUP_THREADS (default 32) lookups
+    at once per process, with further ones queued. The event loop stays free
+    for other requests meanwhile.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(lookup_executor, get_property_analytics, properties)
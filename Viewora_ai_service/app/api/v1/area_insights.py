@@ -6,54 +6,235 @@ It is responsible for:
 2. receiving user queries.
 3. Invoking the RAG pipeline (Retriever -> Analytics -> Generator).
 4. Returning the final JSON response containing both the text answer and structured source references.
+5. Serving near-identical questions from the semantic answer cache, skipping analytics and Gemini.
+6. Streaming the answer as Server-Sent Events from /ai/area-insights/stream:
+   "token" events carry text as Gemini generates it, and a final "done" event carries
+   the full answer, the REFERENCES ids and the sources.
+
+Both routes are async: the question embedding and Gemini use async clients, so
+waiting on them holds no thread. boto3 has no async client, so the DynamoDB
+lookup still runs on a thread of dynamo.lookup_executor (ANALYTICS_LOOKUP_THREADS,
+default 32). A question holds that thread only for the DynamoDB round trip,
+never while Gemini answers; past 32 lookups at once the rest queue for a thread.
+
+With EXPOSE_TIMINGS=true every response carries "timings" (embed_ms, search_ms,
+analytics_ms, llm_ms, total_ms; stages a cached answer skips are left out), and
+the JSON route also sends them as a Server-Timing header. It is off by default,
+so production clients never see how the service spends its time.
 """
-from fastapi import APIRouter, Request
+import asyncio
+import json
+import os
+
+from fastapi import APIRouter, Request, Response
 from pydantic import BaseModel
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
-from app.rag.retriever import get_retriever
-from app.rag.chain import run_rag_chain
-from app.analytics.dynamo import get_property_analytics
+from app.rag.answer_cache import normalize_question
+from app.rag.embeddings import get_embeddings
+from app.rag.retriever import retrieve_by_vector
+from app.rag.chain import run_rag_chain, stream_rag_chain
+from app.rag.generator import REFERENCES_MARKER, AnswerUnavailable, split_references
+from app.rag.timings import StageTimings
+from app.analytics.dynamo import aget_property_analytics
 
 router = APIRouter()
 
+EXPOSE_TIMINGS = os.getenv("EXPOSE_TIMINGS", "false").lower() == "true"
+
 
 class AreaInsightRequest(BaseModel):
     question: str
 
 
+def not_ready():
+    return JSONResponse(
+        status_code=503,
+        content={"error": "RAG vector store not initialized"},
+    )
+
+
+def service_error(e: Exception):
+    print(f"RAG Error: {e}")
+    return JSONResponse(
+        status_code=503,
+        content={"error": "AI Service unable to process request", "detail": str(e)},
+    )
+
+
+class PreparedQuestion:
+    """Retrieval results for a question, plus its answer cache lookup."""
+
+    def __init__(self, request: Request, vector_store, vector):
+        self.vector = vector
+        self.docs = retrieve_by_vector(vector_store, self.vector)
+        self.sources = [doc.metadata for doc in self.docs if doc.metadata]
+
+        self.answer_cache = request.app.state.answer_cache
+        self.index_version = request.app.state.index_version
+        self.property_ids = [source.get("property_id") for source in self.sources]
+        self.cached = self.answer_cache.lookup(self.vector, self.index_version, self.property_ids)
+
+    def remember(self, answer: str):
+        self.answer_cache.store(
+            self.vector, self.index_version, self.property_ids, answer,
+            [doc.metadata for doc in self.docs],
+        )
+
+
+async def prepare_question(
+    request: Request, vector_store, question: str, timings: StageTimings
+) -> PreparedQuestion:
+    # One embedding serves both retrieval and the answer cache lookup
+    with timings.stage("embed"):
+        vector = await get_embeddings().aembed_query(normalize_question(question) or question)
+    with timings.stage("search"):
+        return PreparedQuestion(request, vector_store, vector)
+
+
+def prefetch_analytics(prepared: PreparedQuestion, timings: StageTimings) -> asyncio.Task:
+    """
+    Starts the DynamoDB lookup. It needs the retrieved property ids, so it cannot
+    overlap embedding or search, and a cache hit must not pay for it. The only
+    work left to overlap is building the prompt context, which takes well under
+    a millisecond, so in practice analytics_ms adds to the latency in full.
+    """
+    return asyncio.create_task(
+        timings.timed("analytics", aget_property_analytics(prepared.sources))
+    )
+
+
+def with_timings(body: dict, response: Response, timings: StageTimings) -> dict:
+    if not EXPOSE_TIMINGS:
+        return body
+    response.headers["Server-Timing"] = timings.server_timing()
+    return {**body, "timings": timings.as_dict()}
+
+
 @router.post("/area-insights")
-def area_insights(request: Request, payload: AreaInsightRequest):
+async def area_insights(request: Request, payload: AreaInsightRequest, response: Response):
     #  READ FROM FASTAPI APP STATE
     vector_store = getattr(request.app.state, "vector_store", None)
 
     if vector_store is None:
-        return JSONResponse(
-            status_code=503,
-            content={"error": "RAG vector store not initialized"},
-        )
+        return not_ready()
 
+    timings = StageTimings()
     try:
-        retriever = get_retriever(vector_store)
-        docs = retriever.invoke(payload.question)
+        prepared = await prepare_question(request, vector_store, payload.question, timings)
+        if prepared.cached is not None:
+            return with_timings({**prepared.cached, "cached": True}, response, timings)
 
-        sources = [
-            doc.metadata
-            for doc in docs
-            if doc.metadata
-        ]
+        analytics = prefetch_analytics(prepared, timings)
 
-        analytics = get_property_analytics(sources)
+        try:
+            answer = await run_rag_chain(prepared.docs, analytics, payload.question, timings)
+        except AnswerUnavailable as e:
+            return with_timings({
+                "answer": str(e),
+                "sources": [doc.metadata for doc in prepared.docs],
+            }, response, timings)
 
-        answer = run_rag_chain(docs, analytics, payload.question)
-
-        return {
+        prepared.remember(answer)
+        return with_timings({
             "answer": answer,
-            "sources": [doc.metadata for doc in docs],
-        }
+            "sources": [doc.metadata for doc in prepared.docs],
+        }, response, timings)
     except Exception as e:
-        print(f"RAG Error: {e}")
-        return JSONResponse(
-            status_code=503,
-            content={"error": "AI Service unable to process request", "detail": str(e)},
-        )
+        return service_error(e)
+
+
+def sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def single_chunk(text: str):
+    yield text
+
+
+async def answer_events(
+    chunks, sources: list, timings: StageTimings, cached: bool = False, on_complete=None
+):
+    """
+    Turns answer chunks into SSE "token" events and a final "done" event.
+    The REFERENCES trailer is never sent as text: the last few characters,
+    and any trailing whitespace, are held back until it is clear they don't
+    start it.
+    """
+    text = ""
+    sent = 0
+    try:
+        async for chunk in chunks:
+            text += chunk
+            if not sent:
+                # The final answer is stripped, so offsets into it match text's
+                text = text.lstrip()
+            marker = text.find(REFERENCES_MARKER)
+            if marker != -1:
+                end = marker
+            else:
+                end = len(text) - len(REFERENCES_MARKER) + 1
+            # Whitespace waits for the next word: it may precede the trailer
+            end = len(text[:end].rstrip())
+            if end > sent:
+                timings.mark("first_token")
+                yield sse("token", {"text": text[sent:end]})
+                sent = end
+    except AnswerUnavailable as e:
+        if sent:
+            yield sse("error", {"error": str(e)})
+            return
+        # Nothing shown yet: the message takes the place of the answer
+        text = str(e)
+        on_complete = None
+    except Exception as e:
+        print(f"RAG Stream Error: {e}")
+        yield sse("error", {"error": "AI Service unable to finish the answer"})
+        return
+
+    answer, references = split_references(text)
+    if len(answer) > sent:
+        timings.mark("first_token")
+        yield sse("token", {"text": answer[sent:]})
+    done = {
+        "answer": answer,
+        "references": references,
+        "sources": sources,
+        "cached": cached,
+    }
+    if EXPOSE_TIMINGS:
+        done["timings"] = timings.as_dict()
+    yield sse("done", done)
+    if on_complete is not None:
+        on_complete(text)
+
+
+@router.post("/area-insights/stream")
+async def area_insights_stream(request: Request, payload: AreaInsightRequest):
+    vector_store = getattr(request.app.state, "vector_store", None)
+
+    if vector_store is None:
+        return not_ready()
+
+    try:
+        timings = StageTimings()
+        prepared = await prepare_question(request, vector_store, payload.question, timings)
+        sources = [doc.metadata for doc in prepared.docs]
+        if prepared.cached is not None:
+            events = answer_events(
+                single_chunk(prepared.cached["answer"]), prepared.cached["sources"], timings,
+                cached=True,
+            )
+        else:
+            analytics = prefetch_analytics(prepared, timings)
+            chunks = stream_rag_chain(prepared.docs, analytics, payload.question, timings)
+            events = answer_events(chunks, sources, timings, on_complete=prepared.remember)
+    except Exception as e:
+        return service_error(e)
+
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        # Proxies must pass each event on instead of buffering the response
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
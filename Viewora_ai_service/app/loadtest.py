@@ -0,0 +1,196 @@
+"""
+Area Insights Load Test
+-----------------------
+This file measures how many questions one AI service process answers at once.
+It is responsible for:
+1. Sending --requests questions to /ai/area-insights, --concurrency of them at a time.
+2. Reporting throughput, latency percentiles, the peak number of threads in the process
+   and the average of each stage timing the service reports.
+3. With --simulate, serving the app in-process from a synthetic index, with the question
+   embedding, DynamoDB and Gemini replaced by fixed delays, so the numbers show the
+   service's own concurrency rather than Google's response times.
+
+Against a running pod (set ANSWER_CACHE_THRESHOLD=1.01 there, or repeated questions are
+answered from the cache, and EXPOSE_TIMINGS=true to get the stage averages):
+    python -m app.loadtest --url http://localhost:8001 --concurrency 100
+Simulated:
+    python -m app.loadtest --simulate --concurrency 500 --gemini-ms 2000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import threading
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+import httpx
+
+QUESTIONS = [
+    "Which 3BHK apartments in Kochi are getting the most interest?",
+    "Is a villa in Palakkad a good investment right now?",
+    "Show me affordable flats near Kakkanad",
+    "What are plot prices like in Thrissur?",
+    "Any independent houses in Kozhikode under 80 lakhs?",
+]
+
+
+class ThreadSampler:
+    """Records the highest thread count seen while the test runs."""
+
+    def __init__(self):
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(0.05):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+async def run_load(client, total: int, concurrency: int):
+    latencies, stages, failures = [], [], 0
+    queue = iter(range(total))
+
+    async def worker():
+        nonlocal failures
+        for n in queue:
+            question = f"{QUESTIONS[n % len(QUESTIONS)]} ({n})"
+            started = time.perf_counter()
+            try:
+                response = await client.post("/ai/area-insights", json={"question": question})
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+                stages.append(response.json().get("timings", {}))
+            except Exception as e:
+                failures += 1
+                if failures == 1:
+                    print(f"  first failure: {e!r}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - started, latencies, stages, failures
+
+
+def report(elapsed, latencies, stages, failures, peak_threads):
+    print(f"  completed  {len(latencies)} ok, {failures} failed in {elapsed:.2f} s")
+    print(f"  throughput {len(latencies) / elapsed:.1f} questions/s")
+    if latencies:
+        latencies.sort()
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(
+            f"  latency    p50 {statistics.median(latencies) * 1000:.0f} ms, "
+            f"p95 {p95 * 1000:.0f} ms, max {latencies[-1] * 1000:.0f} ms"
+        )
+    print(f"  threads    peak {peak_threads}")
+    names = sorted({name for timings in stages for name in timings})
+    if names:
+        averages = ", ".join(
+            f"{name} {statistics.mean(t[name] for t in stages if name in t):.0f}"
+            for name in names
+        )
+        print(f"  stages     avg {averages}")
+
+
+def simulated_app(args):
+    """The real app and routes, with every external call replaced by a delay."""
+    os.environ.setdefault("GOOGLE_API_KEY", "loadtest")
+    from langchain_community.vectorstores import FAISS
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+
+    from app.analytics import dynamo
+    from app.main import app
+    from app.rag import generator
+    from app.rag.answer_cache import SemanticAnswerCache
+
+    fake_embeddings = DeterministicFakeEmbedding(size=64)
+
+    class SlowEmbeddings:
+        async def aembed_query(self, text):
+            await asyncio.sleep(args.embed_ms / 1000)
+            return fake_embeddings.embed_query(text)
+
+    async def generate_content(model, contents):
+        await asyncio.sleep(args.gemini_ms / 1000)
+        return SimpleNamespace(text="The 3BHK in Kakkanad is popular.\nREFERENCES: [1]")
+
+    def fetch_counters(property_ids):
+        time.sleep(args.dynamo_ms / 1000)  # boto3 blocks its thread
+        return {pid: 10 for pid in property_ids}, {pid: 2 for pid in property_ids}
+
+    rng = random.Random(7)
+    cities = ["Kochi", "Palakkad", "Thrissur", "Kozhikode", "Kakkanad"]
+    texts = [f"{rng.choice(['Flat', 'Villa', 'Plot'])} in {rng.choice(cities)}" for _ in range(500)]
+    metadatas = [{"property_id": n} for n in range(len(texts))]
+    app.state.vector_store = FAISS.from_texts(texts, fake_embeddings, metadatas=metadatas)
+    # Every question must reach Gemini
+    app.state.answer_cache = SemanticAnswerCache(threshold=2.0, max_entries=1, ttl=0)
+    # Popular properties would be cached; the test measures uncached lookups
+    dynamo.analytics_cache.ttl = 0
+
+    patches = [
+        mock.patch("app.api.v1.area_insights.get_embeddings", lambda: SlowEmbeddings()),
+        mock.patch.object(generator.client.aio.models, "generate_content", generate_content),
+        mock.patch.object(dynamo, "fetch_counters", fetch_counters),
+        mock.patch("app.api.v1.area_insights.EXPOSE_TIMINGS", True),
+    ]
+    return app, patches
+
+
+async def main_async(args):
+    if args.simulate:
+        app, patches = simulated_app(args)
+        for patch in patches:
+            patch.start()
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://loadtest"
+        print(
+            f"Simulated: embedding {args.embed_ms:g} ms, DynamoDB {args.dynamo_ms:g} ms, "
+            f"Gemini {args.gemini_ms:g} ms"
+        )
+    else:
+        transport, base_url = None, args.url
+
+    print(f"{args.requests} questions, {args.concurrency} at a time")
+    limits = httpx.Limits(max_connections=args.concurrency)
+    timeout = httpx.Timeout(300.0)
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url=base_url, limits=limits, timeout=timeout
+        ) as client:
+            with ThreadSampler() as sampler:
+                elapsed, latencies, stages, failures = await run_load(
+                    client, args.requests, args.concurrency
+                )
+    finally:
+        if args.simulate:
+            for patch in patches:
+                patch.stop()
+    report(elapsed, latencies, stages, failures, sampler.peak)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:8001")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--simulate", action="store_true")
+    parser.add_argument("--embed-ms", type=float, default=150.0)
+    parser.add_argument("--dynamo-ms", type=float, default=10.0)
+    parser.add_argument("--gemini-ms", type=float, default=2000.0)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
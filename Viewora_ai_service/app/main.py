@@ -12,15 +12,20 @@ import os
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from fastapi import FastAPI
+from pydantic import BaseModel
+from typing import List, Optional
 from dotenv import load_dotenv
-import threading
+import time
 from datetime import datetime
 
 # Import components
-from app.rag.documents import property_to_document
-from app.rag.embeddings import get_embeddings
-from app.rag.vector_store import create_vector_store
+from app.rag.answer_cache import SemanticAnswerCache
+from app.rag.coordinator import SyncCoordinator
+from app.rag.embeddings import EMBEDDING_MODEL, get_embeddings
+from app.rag.indexer import IncrementalIndexer
+from app.rag.snapshots import load_snapshot, save_snapshot
 from app.api.v1.area_insights import router as area_router
+from app.analytics.dynamo import analytics_cache
 
 # Force load environment
 load_dotenv()
@@ -30,107 +35,145 @@ app = FastAPI(title="Viewora AI Service")
 # This will hold our vector store and diagnostic info
 app.state.vector_store = None
 app.state.last_error = "None - Indexing not started"
-app.state.is_indexing = False
 app.state.last_sync = None
+app.state.indexer = IncrementalIndexer()
+app.state.snapshot_version = None
+# Bumped whenever a different index is swapped in; invalidates cached answers
+app.state.index_version = 0
+app.state.answer_cache = SemanticAnswerCache(
+    threshold=float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.95")),
+    max_entries=int(os.getenv("ANSWER_CACHE_SIZE", "500")),
+    ttl=float(os.getenv("ANSWER_CACHE_TTL", "600")),
+)
 
-def rebuild_index():
+def get_db_connection():
+    return psycopg2.connect(
+        dbname=os.getenv("DB_NAME", "viewora_db"),
+        user=os.getenv("DB_USER", "postgres"),
+        password=os.getenv("DB_PASSWORD", "root"),
+        host=os.getenv("DB_HOST", "postgres"),
+        port=os.getenv("DB_PORT", "5432"),
+        sslmode="require",
+        cursor_factory=RealDictCursor
+    )
+
+def rebuild_index(property_ids=None):
     """
-    Connects to Postgres, fetches latest published properties,
-    and rebuilds the FAISS vector index.
+    Connects to Postgres and brings the FAISS vector index up to date.
+    Only new or changed properties are embedded; removed ones are deleted
+    from the index. The first run after startup indexes everything.
+    With property_ids (sent by the backend) only those are re-read.
+    Always runs through app.state.sync_coordinator, never concurrently.
     """
-    if app.state.is_indexing:
-        print(" SKIPPING: Indexing already in progress.")
-        return
-    
-    app.state.is_indexing = True
-    print(" REBUILDING AI INDEX: Fetching latest properties from Postgres...")
+    print(" SYNCING AI INDEX: Fetching changed properties from Postgres...")
     try:
-        conn = psycopg2.connect(
-            dbname=os.getenv("DB_NAME", "viewora_db"),
-            user=os.getenv("DB_USER", "postgres"),
-            password=os.getenv("DB_PASSWORD", "root"),
-            host=os.getenv("DB_HOST", "postgres"),
-            port=os.getenv("DB_PORT", "5432"),
-            sslmode="require",
-            cursor_factory=RealDictCursor
-        )
-        cur = conn.cursor()
-        
-        # Load real data
-        query = """
-            SELECT id, property_type as type, city, locality, price, 
-                   area_size, area_unit, bedrooms, bathrooms, description
-            FROM properties_property 
-            WHERE status = 'published' AND is_active = true
-        """
-        cur.execute(query)
-        rows = cur.fetchall()
-        
-        cur.close()
-        conn.close()
-        
-        properties = []
-        for row in rows:
-            properties.append({
-                "id": row['id'],
-                "type": row['type'],
-                "city": row['city'],
-                "locality": row['locality'],
-                "price_range": f"{row['price']} INR",
-                "area_size": f"{row['area_size']} {row['area_unit']}",
-                "amenities": [f"{row['bedrooms']} BHK"] if row['bedrooms'] else []
-            })
-            
-        if properties:
-            print(f" Success: Found {len(properties)} properties. Re-indexing...")
-            docs = [property_to_document(p) for p in properties]
-            embeddings = get_embeddings()
-            app.state.vector_store = create_vector_store(docs, embeddings)
-            app.state.last_error = "None - Indexing successful"
-            app.state.last_sync = datetime.now().isoformat()
-            print(" AI Index is currently SYNCED and READY.")
-            return len(properties)
-        else:
+        conn = get_db_connection()
+        try:
+            vector_store, stats = app.state.indexer.sync(
+                conn, app.state.vector_store, get_embeddings(), property_ids
+            )
+        finally:
+            conn.close()
+
+        # Swap in the updated copy; queries never see a half-updated index
+        changed = vector_store is not app.state.vector_store
+        app.state.vector_store = vector_store
+        if changed:
+            app.state.index_version += 1
+        app.state.last_sync = datetime.now().isoformat()
+
+        if vector_store is None:
             print(" No properties found. AI context cleared.")
-            app.state.vector_store = None
             app.state.last_error = "None - Zero properties found in DB"
             return 0
 
+        if changed or app.state.snapshot_version is None:
+            try:
+                app.state.snapshot_version = save_snapshot(
+                    vector_store, app.state.indexer, EMBEDDING_MODEL
+                )
+                print(f" Saved index snapshot {app.state.snapshot_version}.")
+            except Exception as e:
+                # The in-memory index is fine; the next sync tries again
+                print(f" Failed to save index snapshot: {e}")
+
+        print(
+            f" Success: embedded {stats['embedded']}, removed {stats['removed']}, "
+            f"{stats['total']} properties indexed."
+        )
+        app.state.last_error = "None - Indexing successful"
+        print(" AI Index is currently SYNCED and READY.")
+        return stats['total']
+
     except Exception as e:
         app.state.last_error = f"REBUILD ERROR: {str(e)}"
         print(f"REBUILD ERROR: {e}")
         # Don't raise in thread, just log
-    finally:
-        app.state.is_indexing = False
+
+app.state.sync_coordinator = SyncCoordinator(rebuild_index)
+
+def load_latest_snapshot():
+    """
+    Serve from the latest saved index right away; the background sync that
+    follows only has to apply what changed since the snapshot was taken.
+    """
+    started = time.perf_counter()
+    try:
+        snapshot = load_snapshot(get_embeddings(), EMBEDDING_MODEL)
+    except Exception as e:
+        print(f" Failed to load index snapshot, doing a full sync: {e}")
+        return
+    if snapshot is None:
+        print(" No index snapshot found, doing a full sync.")
+        return
+
+    vector_store, state, manifest = snapshot
+    app.state.indexer.restore(state)
+    app.state.vector_store = vector_store
+    app.state.index_version += 1
+    app.state.snapshot_version = manifest["version"]
+    app.state.last_error = "None - Serving from snapshot, catching up"
+    print(
+        f" Loaded index snapshot {manifest['version']} ({manifest['count']} properties) "
+        f"in {(time.perf_counter() - started) * 1000:.0f} ms."
+    )
 
 @app.on_event("startup")
 def startup_event():
     print(" AI SERVICE STARTING (Asynchronous Mode)...")
+    load_latest_snapshot()
     # Start indexing in background so health check passes immediately
-    thread = threading.Thread(target=rebuild_index)
-    thread.daemon = True
-    thread.start()
+    app.state.sync_coordinator.request()
+
+class PropertyChange(BaseModel):
+    id: int
+    op: str = "upsert"
+
+class SyncRequest(BaseModel):
+    changes: List[PropertyChange] = []
 
 @app.post("/ai/sync")
-def sync_data():
+def sync_data(payload: Optional[SyncRequest] = None):
     """
-    Manual trigger to refresh property data
+    Refresh property data. The backend sends the changed property ids in
+    batches; a request without changes (manual trigger) syncs everything.
     """
-    # Start in background if not already running
-    if not app.state.is_indexing:
-        thread = threading.Thread(target=rebuild_index)
-        thread.daemon = True
-        thread.start()
-        return {"status": "sync_started"}
-    return {"status": "sync_in_progress"}
+    property_ids = None
+    if payload and payload.changes:
+        property_ids = {change.id for change in payload.changes}
+    # Starts a sync, or queues one follow-up if a sync is already running
+    return {"status": app.state.sync_coordinator.request(property_ids)}
 
 @app.get("/health")
 def health():
     return {
         "status": "up", 
         "rag_ready": app.state.vector_store is not None,
-        "is_indexing": app.state.is_indexing,
+        "is_indexing": app.state.sync_coordinator.is_running,
         "last_sync": app.state.last_sync,
+        "snapshot_version": app.state.snapshot_version,
+        "analytics_cache": analytics_cache.stats(),
+        "answer_cache": app.state.answer_cache.stats(),
         "last_error": app.state.last_error
     }
 
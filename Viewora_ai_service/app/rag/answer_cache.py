@@ -0,0 +1,113 @@
+"""
+Semantic Answer Cache Module
+----------------------------
+This file lets near-identical questions ("3bhk in Palakkad price?" and
+"3 BHK in palakkad, price") reuse an answer instead of calling Gemini again.
+It is responsible for:
+1. Normalizing questions before they are embedded.
+2. Keeping recent question embeddings in a small FAISS inner-product index.
+3. Serving a cached answer only when the question is similar enough AND the same
+   properties were retrieved from the same index version, so any index change
+   invalidates the cache.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import faiss
+import numpy as np
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace."""
+    question = re.sub(r"[^\w\s]", " ", question.lower())
+    return " ".join(question.split())
+
+
+class SemanticAnswerCache:
+    def __init__(self, threshold: float, max_entries: int, ttl: float):
+        # Minimum cosine similarity between the new and the cached question
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._index = None
+        self._version = None
+        # faiss id -> entry dict, oldest first
+        self._entries = OrderedDict()
+        self._next_id = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _unit(self, vector) -> np.ndarray:
+        vector = np.asarray(vector, dtype="float32").reshape(1, -1)
+        faiss.normalize_L2(vector)
+        return vector
+
+    def _reset(self, version):
+        self._index = None
+        self._entries.clear()
+        self._version = version
+
+    def lookup(self, vector, version, property_ids):
+        """Returns the cached {"answer", "sources"} or None."""
+        key = tuple(sorted(property_ids))
+        with self._lock:
+            if version != self._version:
+                # The index changed; every cached answer may be out of date
+                self._reset(version)
+            if self._index is None or self._index.ntotal == 0:
+                self.misses += 1
+                return None
+
+            scores, ids = self._index.search(self._unit(vector), min(8, self._index.ntotal))
+            now = time.monotonic()
+            for score, entry_id in zip(scores[0], ids[0]):
+                if score < self.threshold:
+                    break
+                entry = self._entries.get(int(entry_id))
+                if entry is None or entry["key"] != key:
+                    continue
+                if entry["expires_at"] <= now:
+                    self._remove(int(entry_id))
+                    continue
+                self.hits += 1
+                return {"answer": entry["answer"], "sources": entry["sources"]}
+
+            self.misses += 1
+            return None
+
+    def store(self, vector, version, property_ids, answer, sources):
+        vector = self._unit(vector)
+        with self._lock:
+            if version != self._version:
+                self._reset(version)
+            if self._index is None:
+                self._index = faiss.IndexIDMap2(faiss.IndexFlatIP(vector.shape[1]))
+
+            entry_id = self._next_id
+            self._next_id += 1
+            self._index.add_with_ids(vector, np.array([entry_id], dtype="int64"))
+            self._entries[entry_id] = {
+                "key": tuple(sorted(property_ids)),
+                "answer": answer,
+                "sources": sources,
+                "expires_at": time.monotonic() + self.ttl,
+            }
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, entry_id: int):
+        self._entries.pop(entry_id, None)
+        self._index.remove_ids(np.array([entry_id], dtype="int64"))
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            }
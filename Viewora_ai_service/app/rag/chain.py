@@ -6,11 +6,31 @@ It is responsible for:
 1. Converting retrieved 'Document' objects into a single context string.
 2. Passing the Context, Analytics, and User Question to the Generator.
 3. Orchestrating the flow of data from retrieval to final answer generation.
+
+The analytics arrive as an awaitable (usually a task started by the route). It
+is awaited right after the context string is assembled, since the prompt needs
+both. The Gemini call is recorded as the "llm" stage of the given StageTimings.
 """
-from app.rag.generator import generate_ai_answer
+from app.rag.generator import generate_ai_answer, stream_ai_answer
+from app.rag.timings import StageTimings
+
+
+def build_context(docs) -> str:
+    return "\n\n".join(doc.page_content for doc in docs)
+
+
+async def run_rag_chain(docs, analytics, question: str, timings: StageTimings = None) -> str:
+    context = build_context(docs)
+    analytics = await analytics
+    with (timings or StageTimings()).stage("llm"):
+        return await generate_ai_answer(context, analytics, question)
 
 
-def run_rag_chain(docs, analytics: str, question: str) -> str:
-    context = "\n\n".join(doc.page_content for doc in docs)
-    return generate_ai_answer(context, analytics, question)
+async def stream_rag_chain(docs, analytics, question: str, timings: StageTimings = None):
+    """Same as run_rag_chain, yielding the answer in chunks as it is generated."""
+    context = build_context(docs)
+    analytics = await analytics
+    with (timings or StageTimings()).stage("llm"):
+        async for chunk in stream_ai_answer(context, analytics, question):
+            yield chunk
 
@@ -0,0 +1,65 @@
+"""
+Index Sync Coordinator Module
+-----------------------------
+This file decides when the index sync actually runs.
+It is responsible for:
+1. Running at most one sync at a time, on a background thread.
+2. Coalescing every request that arrives during a sync into exactly one follow-up run.
+3. Merging the property ids of coalesced requests, so the follow-up only touches those.
+
+A burst of property edits therefore causes at most two syncs: the one already
+running and a single follow-up that picks up everything that changed meanwhile.
+"""
+import threading
+
+
+class SyncCoordinator:
+    def __init__(self, sync_fn):
+        self._sync_fn = sync_fn
+        self._lock = threading.Lock()
+        self._running = False
+        self._pending = False
+        # None in _pending_ids means a full sync was requested
+        self._pending_ids = set()
+        self.runs = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    def request(self, property_ids=None) -> str:
+        """Sync the given property ids, or everything when None."""
+        with self._lock:
+            if property_ids is None or self._pending_ids is None:
+                self._pending_ids = None
+            else:
+                self._pending_ids.update(property_ids)
+            self._pending = True
+
+            if self._running:
+                return "sync_queued"
+            self._running = True
+
+        thread = threading.Thread(target=self._run_until_idle)
+        thread.daemon = True
+        thread.start()
+        return "sync_started"
+
+    def _run_until_idle(self):
+        while True:
+            # Everything requested so far is handled by this run
+            with self._lock:
+                property_ids = self._pending_ids
+                self._pending_ids = set()
+                self._pending = False
+
+            self.runs += 1
+            try:
+                self._sync_fn(property_ids)
+            except Exception as e:
+                print(f" Index sync failed: {e}")
+
+            with self._lock:
+                if not self._pending:
+                    self._running = False
+                    return
@@ -0,0 +1,98 @@
+"""
+Embedding Backend Benchmark
+---------------------------
+This file compares the embedding backends of app/rag/embeddings.py.
+It is responsible for:
+1. Building synthetic property documents in the same format the indexer embeds.
+2. Timing indexing throughput: documents embedded per second, in the batches the backend uses.
+3. Timing query latency: one user question embedded at a time, as /ai/area-insights does.
+
+The embedding cache is bypassed, so every document is really embedded.
+
+Run with:  python -m app.rag.embedding_benchmark --backends local fake
+Add gemini to the list to compare against the API (needs GOOGLE_API_KEY and uses quota).
+"""
+import argparse
+import random
+import statistics
+import time
+
+from app.rag.documents import property_to_document
+from app.rag.embeddings import build_backend, embedding_model_name
+
+QUESTIONS = [
+    "3bhk flat in Kochi under 90 lakhs",
+    "Is a villa in Palakkad a good investment?",
+    "plots near Kakkanad with road access",
+    "affordable 2bhk apartments in Thrissur",
+    "independent house in Kozhikode with parking",
+]
+
+
+def synthetic_documents(count: int) -> list:
+    rng = random.Random(7)
+    cities = {
+        "Kochi": ["Kakkanad", "Edappally", "Vyttila"],
+        "Palakkad": ["Olavakkode", "Chandranagar"],
+        "Thrissur": ["Punkunnam", "Ayyanthole"],
+        "Kozhikode": ["Nadakkavu", "Mavoor Road"],
+    }
+    documents = []
+    for n in range(count):
+        city = rng.choice(list(cities))
+        price = rng.randrange(20, 300) * 100000
+        documents.append(property_to_document({
+            "id": n,
+            "type": rng.choice(["flat", "villa", "plot", "independent house"]),
+            "city": city,
+            "locality": rng.choice(cities[city]),
+            "price_range": f"{price}-{price + 500000}",
+            "area_size": rng.randrange(600, 4000),
+            "amenities": rng.sample(["parking", "lift", "gym", "pool", "security"], 2),
+        }))
+    return [doc.page_content for doc in documents]
+
+
+def measure(backend: str, texts: list, queries: int):
+    print(f"{backend} ({embedding_model_name(backend)})")
+    started = time.perf_counter()
+    embeddings = build_backend(backend)
+    embeddings.embed_query("warm up")  # loads a local model, opens API connections
+    print(f"  load       {(time.perf_counter() - started) * 1000:8.0f} ms")
+
+    started = time.perf_counter()
+    vectors = embeddings.embed_documents(texts)
+    elapsed = time.perf_counter() - started
+    print(
+        f"  indexing   {len(texts) / elapsed:8.1f} docs/s  "
+        f"({len(texts)} docs in {elapsed:.2f} s, {len(vectors[0])} dims)"
+    )
+
+    latencies = []
+    for n in range(queries):
+        started = time.perf_counter()
+        embeddings.embed_query(QUESTIONS[n % len(QUESTIONS)])
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(f"  query      p50 {statistics.median(latencies):6.1f} ms, p95 {p95:6.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backends", nargs="+", default=["local", "fake"],
+                        choices=["gemini", "local", "fake"])
+    parser.add_argument("--documents", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    texts = synthetic_documents(args.documents)
+    for backend in args.backends:
+        try:
+            measure(backend, texts, args.queries)
+        except Exception as e:
+            print(f"  failed: {e}")
+
+
+if __name__ == "__main__":
+    main()
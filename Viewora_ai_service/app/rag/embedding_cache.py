@@ -0,0 +1,95 @@
+"""
+Embedding Cache Module
+----------------------
+This file keeps document embeddings on disk so each one is computed only once.
+It is responsible for:
+1. Keying every vector by a hash of the embedding model name and the document text.
+2. Storing the vectors as float32 blobs in a SQLite file that survives restarts.
+3. Wrapping an embeddings client so only texts missing from the cache reach the API.
+
+Rebuilds and restarts therefore make zero embedding calls for unchanged documents.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+# SQLite allows at most 999 bound parameters per statement on older builds
+LOOKUP_BATCH = 500
+
+
+class EmbeddingCache:
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # WAL lets several workers sharing the file read while one writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get_many(self, keys: list) -> dict:
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), LOOKUP_BATCH):
+                batch = keys[start:start + LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    batch,
+                )
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, vectors: dict):
+        rows = [
+            (key, np.asarray(vector, dtype=np.float32).tobytes())
+            for key, vector in vectors.items()
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows
+            )
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Document embeddings go through the cache; queries are embedded directly
+    because they are rarely repeated word for word.
+    """
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache, model_name: str):
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model_name = model_name
+
+    def cache_key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode()).hexdigest()
+
+    def embed_documents(self, texts: list) -> list:
+        keys = [self.cache_key(text) for text in texts]
+        vectors = self.cache.get_many(list(set(keys)))
+
+        # Identical documents are embedded once
+        missing = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        if missing:
+            fresh = dict(zip(missing, self.embeddings.embed_documents(list(missing.values()))))
+            self.cache.put_many(fresh)
+            vectors.update(
+                {key: np.asarray(vector, dtype=np.float32) for key, vector in fresh.items()}
+            )
+
+        print(f" Embedding cache: {len(texts) - len(missing)} reused, {len(missing)} embedded.")
+        return [vectors[key].tolist() for key in keys]
+
+    def embed_query(self, text: str) -> list:
+        return self.embeddings.embed_query(text)
+
+    async def aembed_query(self, text: str) -> list:
+        return await self.embeddings.aembed_query(text)
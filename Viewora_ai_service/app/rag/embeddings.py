@@ -3,23 +3,88 @@ Embedding Generation Module
 ---------------------------
 This file handles the "Translation" phase of the RAG pipeline.
 It is responsible for:
-1. Loading the pre-trained sentence-transformer model (all-MiniLM-L6-v2).
+1. Choosing the embedding backend from EMBEDDING_BACKEND:
+   - "gemini" (default): Google's gemini-embedding-001 API.
+   - "local": a quantized ONNX model (LOCAL_EMBEDDING_MODEL, default BAAI/bge-small-en-v1.5)
+     run in batches on the CPU through fastembed; no network call per question.
+     fastembed is optional: requirements-local-embeddings.txt.
+   - "fake": deterministic hash-based vectors for offline runs and load tests.
 2. Converting the text "Documents" into numerical vectors (embeddings).
+3. Reusing vectors from the on-disk embedding cache for documents seen before.
 
 These embeddings allow the system to perform semantic similarity searches (e.g., matching "cozy home" to a property description).
+The backends produce different vectors, so EMBEDDING_MODEL (which keys the embedding
+cache and the index snapshots) names the backend's model; switching backends re-embeds.
 """
 
 
 import os
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
+from functools import lru_cache
 
+from langchain_core.embeddings import Embeddings
 
+from app.rag.embedding_cache import CachedEmbeddings, EmbeddingCache
+
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "gemini").lower()
+
+GEMINI_EMBEDDING_MODEL = "models/gemini-embedding-001"
+LOCAL_EMBEDDING_MODEL = os.getenv("LOCAL_EMBEDDING_MODEL", "BAAI/bge-small-en-v1.5")
+FAKE_EMBEDDING_SIZE = 384
+
+
+def embedding_model_name(backend: str) -> str:
+    if backend == "local":
+        return f"fastembed/{LOCAL_EMBEDDING_MODEL}"
+    if backend == "fake":
+        return f"fake-{FAKE_EMBEDDING_SIZE}"
+    return GEMINI_EMBEDDING_MODEL
+
+
+EMBEDDING_MODEL = embedding_model_name(EMBEDDING_BACKEND)
+
+
+def build_backend(backend: str) -> Embeddings:
+    """Returns the embeddings client of one backend, without the cache."""
+    if backend == "gemini":
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+        return GoogleGenerativeAIEmbeddings(
+            model=GEMINI_EMBEDDING_MODEL,
+            google_api_key=os.getenv("GOOGLE_API_KEY")
+        )
+    if backend == "local":
+        # Optional dependency, so the other backends don't ship onnxruntime
+        try:
+            import fastembed  # noqa: F401
+        except ImportError:
+            raise RuntimeError(
+                "EMBEDDING_BACKEND=local needs fastembed: "
+                "pip install -r requirements-local-embeddings.txt"
+            )
+        from langchain_community.embeddings import FastEmbedEmbeddings
+
+        threads = os.getenv("LOCAL_EMBEDDING_THREADS")
+        return FastEmbedEmbeddings(
+            model_name=LOCAL_EMBEDDING_MODEL,
+            batch_size=int(os.getenv("LOCAL_EMBEDDING_BATCH_SIZE", "64")),
+            threads=int(threads) if threads else None,
+            cache_dir=os.getenv("LOCAL_EMBEDDING_CACHE_DIR", "data/models"),
+        )
+    if backend == "fake":
+        from langchain_core.embeddings import DeterministicFakeEmbedding
+
+        return DeterministicFakeEmbedding(size=FAKE_EMBEDDING_SIZE)
+    raise ValueError(f"Unknown EMBEDDING_BACKEND {backend!r}; use gemini, local or fake")
+
+
+@lru_cache(maxsize=None)
 def get_embeddings():
     """
-    Returns high-speed cloud-based embeddings using Google Gemini.
-    This replaces local torch-based embeddings to save CPU and RAM.
+    Returns the configured embeddings, wrapped in the on-disk document cache.
+    One instance per process, so the cache file is opened (and a local model
+    loaded) once.
     """
-    return GoogleGenerativeAIEmbeddings(
-        model="models/gemini-embedding-001",
-        google_api_key=os.getenv("GOOGLE_API_KEY")
-    )
+    print(f" Embedding backend: {EMBEDDING_BACKEND} ({EMBEDDING_MODEL})")
+    embeddings = build_backend(EMBEDDING_BACKEND)
+    cache = EmbeddingCache(os.getenv("EMBEDDING_CACHE_PATH", "data/embedding_cache.sqlite3"))
+    return CachedEmbeddings(embeddings, cache, EMBEDDING_MODEL)
@@ -7,9 +7,16 @@ It is responsible for:
 1. Connecting to the Google Gemini API (LLM).
 2. Defining the system persona ("Real Estate Advisor") and safety rules.
 3. Constructing the final prompt that combines User Query + Retrieved Properties + Analytics.
-4. Returning the natural language answer to the user.
+4. Returning the natural language answer to the user, whole or streamed chunk by chunk.
+
+Gemini is called through the client's async API (client.aio), so a request
+waiting for its answer holds no thread.
+
+When Gemini gives no answer (daily limit, API errors), AnswerUnavailable carries
+the message to show instead, so callers never cache it as a real answer.
 """
 import os
+import re
 from dotenv import load_dotenv
 from google import genai #gemini
 from google.genai import errors
@@ -20,8 +27,18 @@ client = genai.Client(
     api_key=os.getenv("GOOGLE_API_KEY")
 )
 
-def generate_ai_answer(context: str, analytics: str, question: str) -> str:
-    prompt = f"""
+GEMINI_MODEL = "models/gemini-flash-latest"
+
+# Trailer the prompt asks for, e.g. "REFERENCES: [12, 40]"
+REFERENCES_MARKER = "REFERENCES:"
+REFERENCES_PATTERN = re.compile(r"REFERENCES:\s*\[(.*?)\]")
+
+class AnswerUnavailable(Exception):
+    """str(e) is the message to show the user in place of an answer."""
+
+
+def build_prompt(context: str, analytics: str, question: str) -> str:
+    return f"""
 You are a highly professional and helpful real estate advisor for Viewora. Your goal is to interact with potential buyers, answering their doubts and providing realistic market insights.
 
 Persona:
@@ -48,15 +65,58 @@ STRICT OPERATIONAL RULES:
 Focus on building trust and helping the client navigate their real estate journey.
 """
 
+
+def answer_unavailable(e: Exception) -> AnswerUnavailable:
+    if isinstance(e, errors.ClientError):
+        if "429" in str(e):
+            return AnswerUnavailable("I'm sorry, I've reached my daily limit for real-time insights. Please try again in a little while, or contact our support for urgent inquiries.")
+        return AnswerUnavailable(f"I'm having trouble accessing my knowledge base: {str(e)}")
+    return AnswerUnavailable("I encountered an unexpected glitch while researching your request. Please try again in a moment.")
+
+
+NO_ANSWER = "The AI advisor is currently pondering. Please try a different question."
+
+
+async def generate_ai_answer(context: str, analytics: str, question: str) -> str:
     try:
-        response = client.models.generate_content(
-            model="models/gemini-flash-latest",
-            contents=prompt
+        response = await client.aio.models.generate_content(
+            model=GEMINI_MODEL,
+            contents=build_prompt(context, analytics, question)
         )
-        return response.text.strip() if response.text else "The AI advisor is currently pondering. Please try a different question."
-    except errors.ClientError as e:
-        if "429" in str(e):
-            return "I'm sorry, I've reached my daily limit for real-time insights. Please try again in a little while, or contact our support for urgent inquiries."
-        return f"I'm having trouble accessing my knowledge base: {str(e)}"
+        text = response.text
+    except Exception as e:
+        raise answer_unavailable(e)
+
+    if not text:
+        raise AnswerUnavailable(NO_ANSWER)
+    return text.strip()
+
+
+async def stream_ai_answer(context: str, analytics: str, question: str):
+    """Yields the answer text as Gemini generates it."""
+    produced = False
+    try:
+        async for chunk in await client.aio.models.generate_content_stream(
+            model=GEMINI_MODEL,
+            contents=build_prompt(context, analytics, question)
+        ):
+            if chunk.text:
+                produced = True
+                yield chunk.text
     except Exception as e:
-        return "I encountered an unexpected glitch while researching your request. Please try again in a moment."
+        raise answer_unavailable(e)
+
+    if not produced:
+        raise AnswerUnavailable(NO_ANSWER)
+
+
+def split_references(text: str):
+    """
+    Separates the REFERENCES trailer from an answer.
+    Returns (answer without the trailer, [referenced property ids]).
+    """
+    match = REFERENCES_PATTERN.search(text)
+    if match is None:
+        return text.strip(), []
+    ids = [int(ref) for ref in re.findall(r"\d+", match.group(1))]
+    return text[:match.start()].strip(), ids
@@ -0,0 +1,161 @@
+"""
+Incremental Indexing Module
+---------------------------
+This file keeps the FAISS index in step with Postgres without rebuilding it.
+It is responsible for:
+1. Tracking an updated_at watermark and a content hash for every indexed property.
+2. Embedding only the properties that are new or whose document text changed.
+3. Removing unpublished, archived or deleted properties from the index by id.
+
+An edit to one listing therefore costs one embedding call instead of one per property.
+"""
+import hashlib
+from datetime import datetime, timedelta
+
+from app.rag.documents import property_to_document
+from app.rag.vector_store import copy_vector_store, create_vector_store
+
+# Rows are re-read this far behind the watermark, so a transaction that
+# committed late with an older updated_at is not missed. Re-reading an
+# unchanged row costs no embedding call because its hash still matches.
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+PUBLISHED = "status = 'published' AND is_active = true"
+
+# Only what row_to_property uses: Property.AI_INDEXED_FIELDS in the backend
+# lists these columns, and a save changing none of them skips the sync
+PROPERTY_COLUMNS = """
+    id, property_type as type, city, locality, price,
+    area_size, area_unit, bedrooms, updated_at
+"""
+
+
+def row_to_property(row: dict) -> dict:
+    return {
+        "id": row['id'],
+        "type": row['type'],
+        "city": row['city'],
+        "locality": row['locality'],
+        "price_range": f"{row['price']} INR",
+        "area_size": f"{row['area_size']} {row['area_unit']}",
+        "amenities": [f"{row['bedrooms']} BHK"] if row['bedrooms'] else []
+    }
+
+
+def document_hash(doc) -> str:
+    content = doc.page_content + repr(sorted(doc.metadata.items()))
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+class IncrementalIndexer:
+    def __init__(self):
+        # Newest updated_at seen so far
+        self.watermark = None
+        # property id -> hash of the document currently in the index
+        self.hashes = {}
+
+    def restore(self, state: dict):
+        """Resume from the state saved with an index snapshot."""
+        watermark = state.get("watermark")
+        self.watermark = datetime.fromisoformat(watermark) if watermark else None
+        self.hashes = {int(pid): digest for pid, digest in state.get("hashes", {}).items()}
+
+    def fetch_changes(self, conn, property_ids=None):
+        cur = conn.cursor()
+
+        if property_ids is not None:
+            # The backend told us exactly which properties changed: read only
+            # those; any of them that is no longer published gets removed
+            ids = list(property_ids)
+            cur.execute(
+                f"SELECT {PROPERTY_COLUMNS} FROM properties_property "
+                f"WHERE {PUBLISHED} AND id = ANY(%s)",
+                (ids,),
+            )
+            rows = cur.fetchall()
+            cur.close()
+            live_ids = (self.hashes.keys() - set(ids)) | {row['id'] for row in rows}
+            return live_ids, rows
+
+        cur.execute(f"SELECT id FROM properties_property WHERE {PUBLISHED}")
+        live_ids = {row['id'] for row in cur.fetchall()}
+
+        if self.watermark is None:
+            cur.execute(
+                f"SELECT {PROPERTY_COLUMNS} FROM properties_property WHERE {PUBLISHED}"
+            )
+        else:
+            # Listings re-published by an archive toggle keep their old
+            # updated_at, so anything live but not indexed is read by id
+            missing = list(live_ids - self.hashes.keys())
+            cur.execute(
+                f"""
+                SELECT {PROPERTY_COLUMNS} FROM properties_property
+                WHERE {PUBLISHED} AND (updated_at >= %s OR id = ANY(%s))
+                """,
+                (self.watermark - WATERMARK_OVERLAP, missing),
+            )
+        rows = cur.fetchall()
+        cur.close()
+        return live_ids, rows
+
+    def sync(self, conn, vector_store, embeddings, property_ids=None):
+        """
+        Bring the index up to date with Postgres: everything changed since
+        the watermark, or only property_ids when the caller knows them.
+
+        Returns (vector store, stats). The store passed in is never modified,
+        so it keeps serving queries until the caller swaps in the result.
+        """
+        if vector_store is None:
+            self.watermark = None
+            self.hashes = {}
+            property_ids = None
+
+        live_ids, rows = self.fetch_changes(conn, property_ids)
+
+        changed = {}
+        for row in rows:
+            doc = property_to_document(row_to_property(row))
+            digest = document_hash(doc)
+            if self.hashes.get(row['id']) != digest:
+                changed[row['id']] = (doc, digest)
+
+        removed = [pid for pid in self.hashes if pid not in live_ids]
+        # Indexed properties whose text changed: the old vector goes first
+        replaced = [pid for pid in changed if pid in self.hashes]
+
+        # Only a full read proves nothing older than the watermark is missing
+        watermark = self.watermark
+        if property_ids is None:
+            watermark = max((row['updated_at'] for row in rows), default=None)
+            if self.watermark is not None and (watermark is None or watermark < self.watermark):
+                watermark = self.watermark
+
+        hashes = {pid: h for pid, h in self.hashes.items() if pid in live_ids}
+        hashes.update({pid: digest for pid, (_, digest) in changed.items()})
+
+        stats = {"embedded": len(changed), "removed": len(removed), "total": len(hashes)}
+
+        if not changed and not removed:
+            self.watermark = watermark
+            return vector_store, stats
+
+        ids = [str(pid) for pid in changed]
+        docs = [doc for doc, _ in changed.values()]
+
+        if not hashes:
+            new_store = None
+        elif vector_store is None:
+            new_store = create_vector_store(docs, embeddings, ids=ids)
+        else:
+            new_store = copy_vector_store(vector_store)
+            stale = [str(pid) for pid in removed + replaced]
+            if stale:
+                new_store.delete(ids=stale)
+            if docs:
+                new_store.add_documents(docs, ids=ids)
+
+        self.watermark = watermark
+        self.hashes = hashes
+        return new_store, stats
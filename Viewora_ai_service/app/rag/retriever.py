@@ -5,6 +5,7 @@ This file defines how the system finds relevant information.
 It is responsible for:
 1. Configuring the retriever interface for the vector store.
 2. Setting search parameters (e.g., k=5) to determine how many relevant properties to fetch for each user query.
+3. Searching with a question embedding that was already computed, so the answer cache can reuse it.
 """
 
 def get_retriever(vector_store, k: int = 5):
@@ -12,3 +13,8 @@ def get_retriever(vector_store, k: int = 5):
         search_type="similarity",
         search_kwargs={"k": k},
     )
+
+
+def retrieve_by_vector(vector_store, vector, k: int = 5):
+    """Same search as get_retriever, for a question that is already embedded."""
+    return vector_store.similarity_search_by_vector(vector, k=k)
@@ -0,0 +1,96 @@
+"""
+Index Snapshot Module
+---------------------
+This file persists the FAISS index so a new process can answer queries at once.
+It is responsible for:
+1. Saving the vector store and the indexer state after each sync that changed the index.
+2. Publishing snapshots through a version manifest that is replaced atomically.
+3. Loading the latest snapshot at startup and pruning old versions.
+
+A new pod (or an HPA-scaled replica) loads the snapshot in well under a second
+and then catches up with Postgres incrementally.
+"""
+import json
+import os
+import shutil
+import uuid
+from datetime import datetime, timezone
+
+from langchain_community.vectorstores import FAISS
+
+MANIFEST = "manifest.json"
+INDEXER_STATE = "indexer.json"
+# Older versions are kept briefly in case another pod is still loading one
+KEEP_SNAPSHOTS = 3
+
+
+def snapshot_root() -> str:
+    return os.getenv("FAISS_SNAPSHOT_DIR", "data/faiss_index")
+
+
+def save_snapshot(vector_store, indexer, model_name: str) -> str:
+    root = snapshot_root()
+    # Sortable by time; the suffix keeps versions from different pods apart
+    version = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+    path = os.path.join(root, version)
+
+    vector_store.save_local(path)
+    with open(os.path.join(path, INDEXER_STATE), "w") as f:
+        json.dump(
+            {
+                "watermark": indexer.watermark.isoformat() if indexer.watermark else None,
+                "hashes": {str(pid): digest for pid, digest in indexer.hashes.items()},
+            },
+            f,
+        )
+
+    manifest = {
+        "version": version,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "embedding_model": model_name,
+        "count": vector_store.index.ntotal,
+    }
+    # Readers only ever see a complete manifest pointing at a complete snapshot
+    tmp_path = os.path.join(root, f".{MANIFEST}.{version}")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, os.path.join(root, MANIFEST))
+
+    prune_snapshots(root, current=version)
+    return version
+
+
+def prune_snapshots(root: str, current: str):
+    versions = sorted(
+        name for name in os.listdir(root)
+        if name != current and os.path.isdir(os.path.join(root, name))
+    )
+    for name in versions[:-(KEEP_SNAPSHOTS - 1)]:
+        shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+
+def load_snapshot(embeddings, model_name: str):
+    """
+    Returns (vector_store, indexer_state, manifest) for the latest snapshot,
+    or None when there is no usable one.
+    """
+    root = snapshot_root()
+    try:
+        with open(os.path.join(root, MANIFEST)) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+
+    if manifest.get("embedding_model") != model_name:
+        print(f" Snapshot {manifest.get('version')} uses another embedding model, ignoring it.")
+        return None
+
+    path = os.path.join(root, manifest["version"])
+    # The pickle is written by save_snapshot above, never by users
+    vector_store = FAISS.load_local(
+        path, embeddings, allow_dangerous_deserialization=True
+    )
+    with open(os.path.join(path, INDEXER_STATE)) as f:
+        state = json.load(f)
+
+    return vector_store, state, manifest
@@ -0,0 +1,43 @@
+"""
+Stage Timing Module
+-------------------
+This file measures where the time of one question goes.
+It is responsible for:
+1. Timing each pipeline stage (embed, search, analytics, llm) in milliseconds.
+2. Timing stages that run as tasks, such as the analytics lookup.
+3. Formatting the result for the response body and the Server-Timing header,
+   which browser dev tools show next to the request.
+"""
+import time
+from contextlib import contextmanager
+
+
+class StageTimings:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.ms = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.ms[f"{name}_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    async def timed(self, name: str, awaitable):
+        """Awaits `awaitable` as stage `name`; wrap it in a task to overlap other work."""
+        with self.stage(name):
+            return await awaitable
+
+    def mark(self, name: str):
+        """Records the time since the question arrived, e.g. the first streamed token."""
+        self.ms.setdefault(f"{name}_ms", round((time.perf_counter() - self.started) * 1000, 1))
+
+    def as_dict(self) -> dict:
+        return {**self.ms, "total_ms": round((time.perf_counter() - self.started) * 1000, 1)}
+
+    def server_timing(self) -> str:
+        return ", ".join(
+            f"{name[:-3]};dur={ms}" for name, ms in self.as_dict().items()
+        )
@@ -5,13 +5,32 @@ This file manages the "Memory" of the AI system.
 It is responsible for:
 1. Initializing the FAISS (Facebook AI Similarity Search) index.
 2. Storing the generated document embeddings for fast retrieval.
+3. Copying a live index so it can be updated without disturbing queries.
 
 This allows the application to search through thousands of properties in milliseconds.
 """
 
 
+import faiss
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
 
 
-def create_vector_store(documents, embeddings):
-    return FAISS.from_documents(documents, embeddings)
+def create_vector_store(documents, embeddings, ids=None):
+    return FAISS.from_documents(documents, embeddings, ids=ids)
+
+
+def copy_vector_store(vector_store):
+    """
+    Independent copy of a FAISS store. The copy can be modified (add/delete)
+    while the original keeps answering queries, then swapped in.
+    """
+    return FAISS(
+        embedding_function=vector_store.embedding_function,
+        index=faiss.clone_index(vector_store.index),
+        docstore=InMemoryDocstore(dict(vector_store.docstore._dict)),
+        index_to_docstore_id=dict(vector_store.index_to_docstore_id),
+        relevance_score_fn=vector_store.override_relevance_score_fn,
+        normalize_L2=vector_store._normalize_L2,
+        distance_strategy=vector_store.distance_strategy,
+    )
@@ -0,0 +1,89 @@
+"""
+Shared test setup: the fake embedding backend, so no test calls Google,
+and an in-memory stand-in for the properties_property table.
+"""
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+# Read when app modules are imported, so set before any of them are
+os.environ.setdefault("GOOGLE_API_KEY", "test")
+os.environ["EMBEDDING_BACKEND"] = "fake"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.rag.embeddings import build_backend  # noqa: E402
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.rows = []
+
+    def execute(self, sql, params=()):
+        self.db.queries.append(sql)
+        published = [row for row in self.db.rows.values() if row["published"]]
+        if sql.startswith("SELECT id FROM"):
+            self.rows = [{"id": row["id"]} for row in published]
+        elif "updated_at >= %s" in sql:
+            since, ids = params
+            self.rows = [r for r in published if r["updated_at"] >= since or r["id"] in ids]
+        elif "id = ANY(%s)" in sql:
+            (ids,) = params
+            self.rows = [r for r in published if r["id"] in ids]
+        else:
+            self.rows = published
+
+    def fetchall(self):
+        return [dict(row) for row in self.rows]
+
+    def close(self):
+        pass
+
+
+class FakeDatabase:
+    """The rows the indexer reads, with the cursor interface it uses."""
+
+    def __init__(self):
+        self.rows = {}
+        self.queries = []
+        self.clock = START
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def save(self, pid, published=True, **fields):
+        self.clock += timedelta(minutes=10)
+        row = self.rows.get(pid) or {
+            "id": pid,
+            "type": "flat",
+            "city": "Kochi",
+            "locality": "Kakkanad",
+            "price": 5000000,
+            "area_size": 1200,
+            "area_unit": "sqft",
+            "bedrooms": 2,
+        }
+        row.update(fields, published=published, updated_at=self.clock)
+        self.rows[pid] = row
+        return row
+
+
+@pytest.fixture
+def db():
+    return FakeDatabase()
+
+
+@pytest.fixture
+def embeddings():
+    return build_backend("fake")
+
+
+@pytest.fixture(autouse=True)
+def isolated_data(tmp_path, monkeypatch):
+    """Keep snapshots and the embedding cache out of the real data/ dir."""
+    monkeypatch.setenv("FAISS_SNAPSHOT_DIR", str(tmp_path / "faiss_index"))
+    monkeypatch.setenv("EMBEDDING_CACHE_PATH", str(tmp_path / "embedding_cache.sqlite3"))
@@ -0,0 +1,102 @@
+import uuid
+
+import pytest
+
+from app.analytics.cache import TTLCache
+
+LOCAL_REDIS = "redis://localhost:6379/15"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = TTLCache(ttl=60, maxsize=2, clock=clock)
+    cache.set_many({"1": [1, 0], "2": [2, 0]})
+    # Reading 1 makes 2 the least recently used
+    assert cache.get_many(["1"]) == {"1": [1, 0]}
+    cache.set_many({"3": [3, 0]})
+
+    assert cache.get_many(["1", "2", "3"]) == {"1": [1, 0], "3": [3, 0]}
+    assert cache.stats()["size"] == 2
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TTLCache(ttl=60, maxsize=10, clock=clock)
+    cache.set_many({"1": [1, 0]})
+
+    clock.now += 59
+    assert cache.get_many(["1"]) == {"1": [1, 0]}
+    clock.now += 1
+    assert cache.get_many(["1"]) == {}
+    assert cache.stats()["size"] == 0
+
+
+def test_zero_ttl_stores_nothing(clock):
+    cache = TTLCache(ttl=0, maxsize=10, clock=clock)
+    cache.set_many({"1": [1, 0]})
+    assert cache.get_many(["1"]) == {}
+
+
+def test_stats_count_hits_and_misses(clock):
+    cache = TTLCache(ttl=60, maxsize=10, clock=clock)
+    assert cache.stats()["hit_rate"] is None
+
+    cache.get_many(["1", "2"])
+    cache.set_many({"1": [1, 0]})
+    cache.get_many(["1", "2"])
+
+    assert cache.stats() == {
+        "size": 1,
+        "hits": 1,
+        "redis_hits": 0,
+        "misses": 3,
+        "hit_rate": 0.25,
+        "shared": False,
+    }
+
+
+def test_unreachable_redis_falls_back_to_local_entries(clock, capsys):
+    # Nothing listens on port 1
+    cache = TTLCache(ttl=60, maxsize=10, redis_url="redis://127.0.0.1:1/0", clock=clock)
+    cache.set_many({"1": [1, 0]})
+
+    assert cache.get_many(["1", "2"]) == {"1": [1, 0]}
+    assert cache.stats()["misses"] == 1
+    assert "Redis" in capsys.readouterr().out
+
+
+@pytest.fixture
+def redis_url():
+    redis = pytest.importorskip("redis")
+    client = redis.Redis.from_url(LOCAL_REDIS)
+    try:
+        client.ping()
+    except redis.ConnectionError:
+        pytest.skip("no local Redis")
+    yield LOCAL_REDIS
+    client.close()
+
+
+def test_entries_are_shared_through_redis(redis_url, clock):
+    prefix = f"test:{uuid.uuid4().hex}:"
+    first = TTLCache(ttl=60, maxsize=10, redis_url=redis_url, prefix=prefix, clock=clock)
+    second = TTLCache(ttl=60, maxsize=10, redis_url=redis_url, prefix=prefix, clock=clock)
+    first.set_many({"1": [4, 1]})
+
+    assert second.get_many(["1"]) == {"1": [4, 1]}
+    # The shared hit is now also a local entry
+    assert second.get_many(["1"]) == {"1": [4, 1]}
+    assert second.stats()["redis_hits"] == 1
+    assert second.stats()["hits"] == 1
+    first._redis.delete(prefix + "1")
@@ -0,0 +1,72 @@
+import pytest
+
+from app.rag.answer_cache import SemanticAnswerCache, normalize_question
+
+ANSWER = {"answer": "The Kakkanad flat is popular.", "sources": [{"property_id": 1}]}
+
+
+@pytest.fixture
+def cache():
+    return SemanticAnswerCache(threshold=0.95, max_entries=10, ttl=60)
+
+
+def embed(embeddings, question):
+    return embeddings.embed_query(normalize_question(question))
+
+
+def test_rephrased_question_is_answered_from_cache(cache, embeddings):
+    cache.store(embed(embeddings, "3BHK in Palakkad, price?"), "v1", [2, 1], **ANSWER)
+    assert cache.lookup(embed(embeddings, "3bhk in palakkad price"), "v1", [1, 2]) == ANSWER
+    assert cache.stats()["hits"] == 1
+
+
+def at_similarity(cosine):
+    """A unit vector whose cosine with [1, 0, 0] is `cosine`."""
+    return [cosine, (1 - cosine**2) ** 0.5, 0.0]
+
+
+BASE = [1.0, 0.0, 0.0]
+
+
+def test_miss_after_index_version_change(cache):
+    cache.store(BASE, 1, [1, 2], **ANSWER)
+    assert cache.lookup(BASE, 1, [1, 2]) == ANSWER
+
+    assert cache.lookup(BASE, 2, [1, 2]) is None
+    # The old answers are dropped, not kept for the old version
+    assert cache.stats()["size"] == 0
+    assert cache.lookup(BASE, 1, [1, 2]) is None
+
+
+def test_similarity_threshold(cache):
+    cache.store(BASE, 1, [1], **ANSWER)
+    assert cache.lookup(at_similarity(0.96), 1, [1]) == ANSWER
+    assert cache.lookup(at_similarity(0.94), 1, [1]) is None
+    # Only the direction counts, not the length
+    assert cache.lookup([3.0, 0.0, 0.0], 1, [1]) == ANSWER
+
+
+def test_different_sources_miss(cache):
+    cache.store(BASE, 1, [1, 2], **ANSWER)
+    assert cache.lookup(BASE, 1, [1, 3]) is None
+    assert cache.lookup(BASE, 1, [1]) is None
+
+
+def test_expired_answer_is_removed(cache, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.rag.answer_cache.time.monotonic", lambda: now[0])
+    cache.store(BASE, 1, [1], **ANSWER)
+    now[0] += 61
+
+    assert cache.lookup(BASE, 1, [1]) is None
+    assert cache.stats()["size"] == 0
+
+
+def test_oldest_answer_is_evicted():
+    cache = SemanticAnswerCache(threshold=0.95, max_entries=2, ttl=60)
+    for pid in (1, 2, 3):
+        cache.store(BASE, 1, [pid], answer=f"answer {pid}", sources=[])
+
+    assert cache.lookup(BASE, 1, [1]) is None
+    assert cache.lookup(BASE, 1, [3])["answer"] == "answer 3"
+    assert cache.stats() == {"size": 2, "hits": 1, "misses": 1, "hit_rate": 0.5}
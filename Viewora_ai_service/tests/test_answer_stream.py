@@ -0,0 +1,110 @@
+import asyncio
+import json
+
+import pytest
+
+from fastapi import Response
+
+from app.api.v1 import area_insights
+from app.api.v1.area_insights import answer_events, with_timings
+from app.rag.generator import AnswerUnavailable
+from app.rag.timings import StageTimings
+
+SOURCES = [{"property_id": 1}, {"property_id": 2}]
+
+
+async def stream(*chunks, error=None):
+    for chunk in chunks:
+        yield chunk
+    if error is not None:
+        raise error
+
+
+def run(chunks, **kwargs):
+    async def collect():
+        return [event async for event in answer_events(chunks, SOURCES, StageTimings(), **kwargs)]
+
+    events = []
+    for raw in asyncio.run(collect()):
+        name, data = raw.strip().split("\n")
+        events.append((name.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+def streamed_text(events):
+    return "".join(data["text"] for name, data in events if name == "token")
+
+
+@pytest.mark.parametrize("chunks", [
+    # The marker split across chunks at every position
+    ("The Kakkanad flat is popular.\nREF", "ERENCES: [1, 2]"),
+    ("The Kakkanad flat is popular.\nR", "EFERENCES:", " [1,", " 2]"),
+    ("The Kakkanad flat is popular.\nREFERENCES", ": [1, 2]"),
+    ("The Kakkanad ", "flat is popular.", "\n", "REFERENCES: [", "1, 2", "]\n"),
+    tuple("The Kakkanad flat is popular.\nREFERENCES: [1, 2]"),
+])
+def test_references_trailer_is_held_back_and_parsed(chunks):
+    completed = []
+    events = run(stream(*chunks), on_complete=completed.append)
+
+    assert streamed_text(events) == "The Kakkanad flat is popular."
+    assert all("REF" not in data["text"] for name, data in events if name == "token")
+    name, done = events[-1]
+    assert name == "done"
+    assert done["answer"] == "The Kakkanad flat is popular."
+    assert done["references"] == [1, 2]
+    assert done["sources"] == SOURCES
+    # The cache stores the full text, trailer included
+    assert completed == ["".join(chunks)]
+
+
+def test_leading_whitespace_is_not_streamed():
+    events = run(stream("\n\n", "The Kakkanad flat is popular and ", "well priced."))
+
+    assert streamed_text(events) == "The Kakkanad flat is popular and well priced."
+    assert events[-1][1]["answer"] == streamed_text(events)
+
+
+def test_text_resembling_the_marker_is_released():
+    events = run(stream("Ask about REF", "UNDS before you pay."))
+
+    assert streamed_text(events) == "Ask about REFUNDS before you pay."
+    assert events[-1][1]["references"] == []
+
+
+def test_unavailable_before_any_text_replaces_the_answer():
+    completed = []
+    events = run(stream(error=AnswerUnavailable("The AI Advisor is busy.")), on_complete=completed.append)
+
+    assert streamed_text(events) == "The AI Advisor is busy."
+    assert events[-1][1]["answer"] == "The AI Advisor is busy."
+    assert completed == []
+
+
+def test_failure_after_text_ends_with_an_error_event():
+    events = run(stream("The Kakkanad flat is popular and ", error=RuntimeError("reset")))
+
+    assert events[-1] == ("error", {"error": "AI Service unable to finish the answer"})
+    assert not any(name == "done" for name, _ in events)
+
+
+def test_timings_are_hidden_by_default():
+    response = Response()
+    timings = StageTimings()
+
+    assert with_timings({"answer": "Yes"}, response, timings) == {"answer": "Yes"}
+    assert "Server-Timing" not in response.headers
+    assert "timings" not in run(stream("Yes"))[-1][1]
+
+
+def test_timings_are_sent_when_exposed(monkeypatch):
+    monkeypatch.setattr(area_insights, "EXPOSE_TIMINGS", True)
+    response = Response()
+    timings = StageTimings()
+    with timings.stage("embed"):
+        pass
+
+    body = with_timings({"answer": "Yes"}, response, timings)
+    assert "embed_ms" in body["timings"]
+    assert "embed;dur=" in response.headers["Server-Timing"]
+    assert "first_token_ms" in run(stream("Yes"))[-1][1]["timings"]
@@ -0,0 +1,120 @@
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.rag.coordinator import SyncCoordinator
+
+
+def wait_idle(coordinator):
+    for _ in range(500):
+        if not coordinator.is_running:
+            return
+        time.sleep(0.01)
+    pytest.fail("sync did not finish")
+
+
+class BlockingSync:
+    """A sync_fn that holds every run until released."""
+
+    def __init__(self):
+        self.calls = []
+        self.started = threading.Semaphore(0)
+        self.release = threading.Event()
+
+    def __call__(self, property_ids):
+        self.calls.append(property_ids)
+        self.started.release()
+        self.release.wait(5)
+
+    def wait_started(self):
+        assert self.started.acquire(timeout=5), "sync did not start"
+
+    def finish(self, coordinator):
+        self.release.set()
+        wait_idle(coordinator)
+
+
+@pytest.fixture
+def sync():
+    sync = BlockingSync()
+    yield sync
+    sync.release.set()
+
+
+def test_requests_during_a_sync_coalesce_into_one_follow_up(sync):
+    coordinator = SyncCoordinator(sync)
+    assert coordinator.request({1}) == "sync_started"
+    sync.wait_started()
+
+    assert coordinator.request({2}) == "sync_queued"
+    assert coordinator.request({3, 4}) == "sync_queued"
+    sync.finish(coordinator)
+
+    assert sync.calls == [{1}, {2, 3, 4}]
+    assert coordinator.runs == 2
+
+
+def test_full_sync_request_absorbs_queued_ids(sync):
+    coordinator = SyncCoordinator(sync)
+    coordinator.request({1})
+    sync.wait_started()
+    coordinator.request({2})
+    coordinator.request()
+    coordinator.request({3})
+    sync.finish(coordinator)
+
+    assert sync.calls == [{1}, None]
+
+
+def test_failed_sync_does_not_stop_the_follow_up():
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def failing_sync(property_ids):
+        calls.append(property_ids)
+        if len(calls) == 1:
+            started.set()
+            release.wait(5)
+            raise RuntimeError("database went away")
+
+    coordinator = SyncCoordinator(failing_sync)
+    coordinator.request({1})
+    assert started.wait(5)
+    coordinator.request({2})
+    release.set()
+    wait_idle(coordinator)
+
+    assert calls == [{1}, {2}]
+
+
+def test_concurrent_sync_calls_run_one_rebuild_at_a_time(sync, monkeypatch):
+    from app.main import app
+
+    coordinator = SyncCoordinator(sync)
+    monkeypatch.setattr(app.state, "sync_coordinator", coordinator)
+    client = TestClient(app)
+
+    first = client.post("/ai/sync", json={"changes": [{"id": 1}]})
+    sync.wait_started()
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda pid: results.append(
+                client.post("/ai/sync", json={"changes": [{"id": pid}]}).json()
+            ),
+            args=(pid,),
+        )
+        for pid in (2, 3)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    sync.finish(coordinator)
+
+    assert first.json() == {"status": "sync_started"}
+    assert results == [{"status": "sync_queued"}] * 2
+    assert sync.calls == [{1}, {2, 3}]
@@ -0,0 +1,141 @@
+import boto3
+import pytest
+from moto import mock_aws
+
+from app.analytics import dynamo
+from app.analytics.cache import TTLCache
+
+
+@pytest.fixture
+def tables(monkeypatch):
+    """Both analytics tables in moto, swapped in for the module's resource."""
+    for name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"):
+        monkeypatch.setenv(name, "testing")
+    with mock_aws():
+        resource = boto3.resource("dynamodb", region_name="us-east-1")
+        for table, sort_key in ((dynamo.VIEW_TABLE, "date"), (dynamo.INTEREST_TABLE, "interested_at")):
+            resource.create_table(
+                TableName=table,
+                KeySchema=[
+                    {"AttributeName": "property_id", "KeyType": "HASH"},
+                    {"AttributeName": sort_key, "KeyType": "RANGE"},
+                ],
+                AttributeDefinitions=[
+                    {"AttributeName": "property_id", "AttributeType": "S"},
+                    {"AttributeName": sort_key, "AttributeType": "S"},
+                ],
+                BillingMode="PAY_PER_REQUEST",
+            )
+        monkeypatch.setattr(dynamo, "dynamodb", resource)
+        monkeypatch.setattr(dynamo, "client", boto3.client("dynamodb", region_name="us-east-1"))
+        monkeypatch.setattr(dynamo, "analytics_cache", TTLCache(ttl=60, maxsize=100))
+        yield resource
+
+
+@pytest.fixture
+def batch_calls(tables, monkeypatch):
+    """Records the RequestItems of every batch_get_item call."""
+    client = dynamo.client
+    real = client.batch_get_item
+    calls = []
+
+    def batch_get_item(RequestItems):
+        calls.append(RequestItems)
+        return real(RequestItems=RequestItems)
+
+    monkeypatch.setattr(client, "batch_get_item", batch_get_item)
+    return calls
+
+
+def add_totals(tables, pid, views, interests):
+    tables.Table(dynamo.VIEW_TABLE).put_item(
+        Item={"property_id": pid, "date": "total", "view_count": views}
+    )
+    tables.Table(dynamo.INTEREST_TABLE).put_item(
+        Item={"property_id": pid, "interested_at": "total", "interest_count": interests}
+    )
+
+
+def add_events(tables, pid, daily_views, interests):
+    for n, views in enumerate(daily_views):
+        tables.Table(dynamo.VIEW_TABLE).put_item(
+            Item={"property_id": pid, "date": f"2026-01-0{n + 1}", "view_count": views}
+        )
+    for n in range(interests):
+        tables.Table(dynamo.INTEREST_TABLE).put_item(
+            Item={"property_id": pid, "interested_at": f"2026-01-01T00:00:0{n}"}
+        )
+
+
+def test_totals_and_event_fallback_in_one_batch_call(tables, batch_calls):
+    add_totals(tables, "1", 25, 3)
+    add_totals(tables, "2", 0, 0)
+    # No total items yet: counted from its events
+    add_events(tables, "3", [4, 5], 2)
+
+    counts = dynamo.fetch_analytics(["1", "2", "3", "4"])
+
+    assert counts == {"1": [25, 3], "2": [0, 0], "3": [9, 2], "4": [0, 0]}
+    assert len(batch_calls) == 1
+    assert dynamo.analytics_cache.get_many(["1", "3"]) == {"1": [25, 3], "3": [9, 2]}
+
+
+def test_batches_are_split_at_the_key_limit(tables, batch_calls):
+    ids = [str(pid) for pid in range(1, 121)]
+    for pid in ids:
+        add_totals(tables, pid, int(pid), 1)
+
+    views, interests = dynamo.fetch_counters(ids)
+
+    assert [len(call[dynamo.VIEW_TABLE]["Keys"]) for call in batch_calls] == [50, 50, 20]
+    assert views == {pid: int(pid) for pid in ids}
+    assert interests == {pid: 1 for pid in ids}
+
+
+def test_unprocessed_keys_are_requested_again(tables, monkeypatch):
+    add_totals(tables, "1", 7, 2)
+    add_totals(tables, "2", 8, 0)
+    client = dynamo.client
+    real = client.batch_get_item
+    calls = []
+
+    def throttled(RequestItems):
+        calls.append(RequestItems)
+        if len(calls) > 1:
+            return real(RequestItems=RequestItems)
+        # DynamoDB throttled the interest table: its keys come back unprocessed
+        response = real(RequestItems={dynamo.VIEW_TABLE: RequestItems[dynamo.VIEW_TABLE]})
+        response["UnprocessedKeys"] = {dynamo.INTEREST_TABLE: RequestItems[dynamo.INTEREST_TABLE]}
+        return response
+
+    monkeypatch.setattr(client, "batch_get_item", throttled)
+
+    assert dynamo.fetch_counters(["1", "2"]) == ({"1": 7, "2": 8}, {"1": 2, "2": 0})
+    assert list(calls[1]) == [dynamo.INTEREST_TABLE]
+
+
+def test_failed_batch_falls_back_to_events_and_is_not_cached(tables, monkeypatch):
+    add_events(tables, "5", [3], 1)
+
+    def unavailable(RequestItems):
+        raise RuntimeError("throttled")
+
+    monkeypatch.setattr(dynamo.client, "batch_get_item", unavailable)
+    assert dynamo.fetch_analytics(["5"]) == {"5": [3, 1]}
+
+    monkeypatch.setattr(dynamo, "count_views", lambda pid: 1 / 0)
+    assert dynamo.fetch_analytics(["6"]) == {}
+    assert dynamo.analytics_cache.get_many(["6"]) == {}
+
+
+def test_summary_uses_cached_counts(tables, batch_calls):
+    add_totals(tables, "1", 25, 0)
+    properties = [{"property_id": 1}, {"property_id": 1}]
+
+    first = dynamo.get_property_analytics(properties)
+    second = dynamo.get_property_analytics(properties)
+
+    assert first == second == (
+        "Market Analytics:\nProperty 1: 25 views, 0 expressions of interest (High demand)"
+    )
+    assert len(batch_calls) == 1
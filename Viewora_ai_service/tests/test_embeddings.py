@@ -0,0 +1,59 @@
+import sys
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from app.rag.embedding_cache import CachedEmbeddings, EmbeddingCache
+from app.rag.embeddings import EMBEDDING_MODEL, build_backend, get_embeddings
+
+
+def test_fake_backend_is_deterministic(embeddings):
+    first = embeddings.embed_query("3bhk flat in Kochi")
+    assert first == build_backend("fake").embed_query("3bhk flat in Kochi")
+    assert first != embeddings.embed_query("villa in Palakkad")
+    assert len(first) == 384
+
+
+def test_configured_backend_is_fake_and_cached():
+    assert EMBEDDING_MODEL == "fake-384"
+    assert isinstance(get_embeddings(), CachedEmbeddings)
+
+
+def test_local_backend_without_fastembed_fails_clearly(monkeypatch):
+    # A None entry makes `import fastembed` raise ImportError
+    monkeypatch.setitem(sys.modules, "fastembed", None)
+    with pytest.raises(RuntimeError, match="requirements-local-embeddings.txt"):
+        build_backend("local")
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError, match="gemini, local or fake"):
+        build_backend("word2vec")
+
+
+class CountingEmbeddings(Embeddings):
+    def __init__(self, embeddings):
+        self.embeddings = embeddings
+        self.embedded = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text):
+        return self.embeddings.embed_query(text)
+
+
+def test_cached_documents_are_not_embedded_again(embeddings, tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    backend = CountingEmbeddings(embeddings)
+    vectors = CachedEmbeddings(backend, EmbeddingCache(path), "fake-384").embed_documents(
+        ["flat in Kochi", "villa in Palakkad", "flat in Kochi"]
+    )
+    assert backend.embedded == ["flat in Kochi", "villa in Palakkad"]
+
+    # A restarted process reads them back from the file
+    backend.embedded.clear()
+    reopened = CachedEmbeddings(backend, EmbeddingCache(path), "fake-384")
+    assert reopened.embed_documents(["villa in Palakkad", "flat in Kochi"]) == vectors[1::-1]
+    assert backend.embedded == []
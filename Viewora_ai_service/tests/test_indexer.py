@@ -0,0 +1,137 @@
+import re
+
+import pytest
+
+from app.rag.documents import property_to_document
+from app.rag.indexer import PROPERTY_COLUMNS, IncrementalIndexer, document_hash, row_to_property
+
+
+@pytest.fixture
+def indexed(db, embeddings):
+    """Three published properties, fully indexed."""
+    for pid in (1, 2, 3):
+        db.save(pid)
+    indexer = IncrementalIndexer()
+    store, stats = indexer.sync(db, None, embeddings)
+    assert stats == {"embedded": 3, "removed": 0, "total": 3}
+    return indexer, store
+
+
+def indexed_ids(store):
+    return sorted(doc.metadata["property_id"] for doc in store.docstore._dict.values())
+
+
+def document(store, pid):
+    (doc,) = [d for d in store.docstore._dict.values() if d.metadata["property_id"] == pid]
+    return doc
+
+
+def test_unchanged_sync_embeds_nothing(db, embeddings, indexed):
+    indexer, store = indexed
+    new_store, stats = indexer.sync(db, store, embeddings)
+    assert new_store is store
+    assert stats == {"embedded": 0, "removed": 0, "total": 3}
+
+
+def test_incremental_sync_updates_and_deletes(db, embeddings, indexed):
+    indexer, store = indexed
+    db.save(2, price=7500000)
+    db.save(3, published=False)
+    db.save(4, city="Thrissur")
+
+    new_store, stats = indexer.sync(db, store, embeddings)
+
+    assert stats == {"embedded": 2, "removed": 1, "total": 3}
+    assert indexed_ids(new_store) == [1, 2, 4]
+    assert new_store.index.ntotal == 3
+    assert "7500000 INR" in document(new_store, 2).page_content
+    # The updated document replaced the old vector and is what search finds
+    hit = new_store.similarity_search(document(new_store, 2).page_content, k=1)[0]
+    assert hit.metadata["property_id"] == 2
+    assert indexer.watermark == db.rows[4]["updated_at"]
+
+
+def test_sync_never_modifies_the_live_store(db, embeddings, indexed):
+    indexer, store = indexed
+    db.save(1, published=False)
+    db.save(2, price=7500000)
+
+    new_store, _ = indexer.sync(db, store, embeddings)
+
+    assert new_store is not store
+    assert indexed_ids(store) == [1, 2, 3]
+    assert store.index.ntotal == 3
+    assert "5000000 INR" in document(store, 2).page_content
+
+
+def test_edit_that_does_not_change_the_document_is_not_embedded(db, embeddings, indexed):
+    indexer, store = indexed
+    # Saved again with the same values, e.g. by an edit the backend ignores
+    db.save(1)
+
+    new_store, stats = indexer.sync(db, store, embeddings)
+
+    assert new_store is store
+    assert stats["embedded"] == 0
+    assert indexer.watermark == db.rows[1]["updated_at"]
+
+
+def test_sync_by_property_ids_reads_only_those(db, embeddings, indexed):
+    indexer, store = indexed
+    watermark = indexer.watermark
+    db.save(1, price=6000000)
+    db.save(2, published=False)
+    db.save(3, price=9000000)
+    db.queries.clear()
+
+    new_store, stats = indexer.sync(db, store, embeddings, property_ids={1, 2})
+
+    assert stats == {"embedded": 1, "removed": 1, "total": 2}
+    assert indexed_ids(new_store) == [1, 3]
+    assert "5000000 INR" in document(new_store, 3).page_content
+    assert len(db.queries) == 1 and "id = ANY(%s)" in db.queries[0]
+    # Property 3 was not read, so the watermark must not move past it
+    assert indexer.watermark == watermark
+
+    # The next watermark sync still picks property 3 up
+    _, stats = indexer.sync(db, new_store, embeddings)
+    assert stats == {"embedded": 1, "removed": 0, "total": 2}
+
+
+def test_republished_property_with_old_updated_at_is_indexed(db, embeddings, indexed):
+    indexer, store = indexed
+    db.save(3, published=False)
+    store, _ = indexer.sync(db, store, embeddings)
+    db.save(1, price=6000000)
+    store, _ = indexer.sync(db, store, embeddings)
+
+    # Archive toggles publish again without touching updated_at
+    db.rows[3]["published"] = True
+    store, stats = indexer.sync(db, store, embeddings)
+
+    assert stats == {"embedded": 1, "removed": 0, "total": 3}
+    assert indexed_ids(store) == [1, 2, 3]
+
+
+def test_removing_every_property_empties_the_index(db, embeddings, indexed):
+    indexer, store = indexed
+    for pid in (1, 2, 3):
+        db.save(pid, published=False)
+
+    new_store, stats = indexer.sync(db, store, embeddings)
+
+    assert new_store is None
+    assert stats == {"embedded": 0, "removed": 3, "total": 0}
+
+
+def test_every_selected_column_is_part_of_the_document(db):
+    """The backend only syncs saves that change these columns."""
+    columns = [re.split(r"\s+as\s+", c.strip())[-1] for c in PROPERTY_COLUMNS.split(",")]
+    row = db.save(1)
+
+    def digest(row):
+        return document_hash(property_to_document(row_to_property(row)))
+
+    for column in set(columns) - {"id", "updated_at"}:
+        changed = {**row, column: f"{row[column]}0"}
+        assert digest(changed) != digest(row), column
@@ -0,0 +1,42 @@
+from app.rag.indexer import IncrementalIndexer
+from app.rag.snapshots import load_snapshot, save_snapshot
+
+
+def build_index(db, embeddings):
+    for pid in (1, 2, 3):
+        db.save(pid, city=["Kochi", "Palakkad", "Thrissur"][pid - 1])
+    indexer = IncrementalIndexer()
+    store, _ = indexer.sync(db, None, embeddings)
+    return indexer, store
+
+
+def test_snapshot_round_trip(db, embeddings):
+    indexer, store = build_index(db, embeddings)
+    version = save_snapshot(store, indexer, "fake-384")
+
+    loaded, state, manifest = load_snapshot(embeddings, "fake-384")
+    assert manifest["version"] == version
+    assert manifest["count"] == 3
+
+    query = "Property Type: flat\nCity: Palakkad"
+    expected = [doc.metadata["property_id"] for doc in store.similarity_search(query, k=3)]
+    assert [doc.metadata["property_id"] for doc in loaded.similarity_search(query, k=3)] == expected
+
+    # A restored indexer catches up without embedding anything again
+    restored = IncrementalIndexer()
+    restored.restore(state)
+    assert restored.watermark == indexer.watermark
+    assert restored.hashes == indexer.hashes
+    same_store, stats = restored.sync(db, loaded, embeddings)
+    assert same_store is loaded
+    assert stats == {"embedded": 0, "removed": 0, "total": 3}
+
+
+def test_snapshot_of_another_model_is_ignored(db, embeddings):
+    indexer, store = build_index(db, embeddings)
+    save_snapshot(store, indexer, "fake-384")
+    assert load_snapshot(embeddings, "models/gemini-embedding-001") is None
+
+
+def test_no_snapshot(embeddings):
+    assert load_snapshot(embeddings, "fake-384") is None
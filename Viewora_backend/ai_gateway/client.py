@@ -0,0 +1,152 @@
+"""
+Non-blocking access to the AI service for the gateway views.
+
+Every call goes through send(), which
+- reuses one pooled httpx.AsyncClient per event loop, so requests travel over
+  kept-alive connections instead of a new TCP connection each;
+- allows at most AI_MAX_CONNECTIONS calls in flight per worker, so slow AI
+  answers cannot take every connection the worker has;
+- retries connection failures (DNS not ready while the containers start) with
+  asyncio.sleep backoff, which leaves the worker free to serve other requests;
+- stops calling the AI service for AI_BREAKER_RESET_SECONDS after
+  AI_BREAKER_FAILURES failures in a row, answering 503 straight away instead of
+  letting every request wait for the same timeout.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import weakref
+
+import httpx
+
+logger = logging.getLogger("viewora")
+
+AI_TIMEOUT = httpx.Timeout(connect=5.0, read=150.0, write=10.0, pool=5.0)
+AI_MAX_CONNECTIONS = int(os.getenv("AI_GATEWAY_MAX_CONNECTIONS", "20"))
+AI_CONNECT_RETRIES = 3
+AI_RETRY_BACKOFF = 0.5  # seconds, doubled after every attempt
+AI_BREAKER_FAILURES = 5
+AI_BREAKER_RESET_SECONDS = 30
+
+CIRCUIT_OPEN_ERROR = (
+    "AI Advisor is temporarily unavailable. Please try again in a moment."
+)
+BUSY_ERROR = (
+    "AI Advisor is busy answering other questions. Please try again in a moment."
+)
+
+
+class AIServiceUnavailable(Exception):
+    """The call was not sent: the circuit is open or every connection is busy."""
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` failures in a row. Once `reset_timeout`
+    has passed requests are let through again; the first success closes the
+    circuit and the first failure opens it for another `reset_timeout`.
+    """
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+
+    def allow(self):
+        return (
+            self.opened_at is None
+            or time.monotonic() - self.opened_at >= self.reset_timeout
+        )
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning(
+                    f"AI service failed {self.failures} times in a row; "
+                    f"pausing calls for {self.reset_timeout}s"
+                )
+            self.opened_at = time.monotonic()
+
+
+breaker = CircuitBreaker(AI_BREAKER_FAILURES, AI_BREAKER_RESET_SECONDS)
+
+# event loop -> client; connections cannot be shared between loops
+_clients = weakref.WeakKeyDictionary()
+
+
+def ai_service_url():
+    return os.getenv("AI_SERVICE_URL", "http://aiadvisor:8001")
+
+
+def build_client():
+    return httpx.AsyncClient(
+        timeout=AI_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=AI_MAX_CONNECTIONS,
+            max_keepalive_connections=AI_MAX_CONNECTIONS,
+        ),
+    )
+
+
+def get_client():
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _clients[loop] = build_client()
+    return client
+
+
+def reset():
+    """Forget the shared clients and close the circuit (used by tests)."""
+    _clients.clear()
+    breaker.record_success()
+
+
+async def send(method, path, json=None, timeout=None, stream=False):
+    """
+    Send a request to the AI service and return the httpx response.
+
+    Raises AIServiceUnavailable without contacting the service when the
+    circuit is open or no connection frees up in time, and httpx errors
+    when the call itself fails. A streamed response must be closed by the
+    caller.
+    """
+    if not breaker.allow():
+        raise AIServiceUnavailable(CIRCUIT_OPEN_ERROR)
+
+    client = get_client()
+    request = client.build_request(
+        method, f"{ai_service_url()}{path}", json=json, timeout=timeout or AI_TIMEOUT
+    )
+    for attempt in range(AI_CONNECT_RETRIES):
+        try:
+            response = await client.send(request, stream=stream)
+            break
+        except httpx.PoolTimeout:
+            # Our own limit, not an AI service failure
+            raise AIServiceUnavailable(BUSY_ERROR)
+        except httpx.ConnectError as e:
+            # Nothing was sent yet, so retrying is safe
+            if attempt + 1 == AI_CONNECT_RETRIES:
+                breaker.record_failure()
+                raise
+            logger.warning(f"AI service connect attempt {attempt + 1} failed: {e}")
+            await asyncio.sleep(AI_RETRY_BACKOFF * 2**attempt)
+        except httpx.HTTPError:
+            breaker.record_failure()
+            raise
+
+    # 503 means the index is still loading, which a working service reports
+    if response.status_code >= 500 and response.status_code != 503:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    return response
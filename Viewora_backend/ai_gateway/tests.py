@@ -1 +1,205 @@
+import json
+from unittest import mock
+
+import httpx
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ai_gateway import client as ai_client
+from ai_gateway.views import WARMING_UP_ERROR
+
+User = get_user_model()
+
+EVENTS = (
+    b'event: token\ndata: {"text": "Nice flat"}\n\n'
+    b'event: done\ndata: {"answer": "Nice flat", "references": [1]}\n\n'
+)
+
+
+async def stream_events():
+    half = len(EVENTS) // 2
+    yield EVENTS[:half]
+    yield EVENTS[half:]
+
+
+def mock_client(handler):
+    return mock.patch(
+        "ai_gateway.client.build_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+
+class GatewayTestCase(TestCase):
+    def setUp(self):
+        ai_client.reset()
+        self.user = User.objects.create_user(username="buyer", password="pass123")
+        self.auth = {"Authorization": f"Bearer {AccessToken.for_user(self.user)}"}
+
+    async def post(self, headers=None):
+        return await self.async_client.post(
+            self.url,
+            {"question": "3bhk in Palakkad?"},
+            content_type="application/json",
+            headers=headers,
+        )
+
+
+class AreaInsightsStreamTest(GatewayTestCase):
+    url = "/api/ai/area-insights/stream/"
+
+    async def test_requires_authentication(self):
+        response = await self.post()
+        self.assertEqual(response.status_code, 401)
+
+    async def test_relays_event_stream(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(
+                200,
+                headers={"content-type": "text/event-stream"},
+                content=stream_events(),
+            )
+
+        with mock_client(handler):
+            response = await self.post(self.auth)
+            body = b"".join([chunk async for chunk in response.streaming_content])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertEqual(body, EVENTS)
+        self.assertTrue(requests[0].url.path.endswith("/ai/area-insights/stream"))
+        self.assertEqual(
+            json.loads(requests[0].content), {"question": "3bhk in Palakkad?"}
+        )
+
+    async def test_index_not_ready(self):
+        def handler(request):
+            return httpx.Response(
+                503, json={"error": "RAG vector store not initialized"}
+            )
+
+        with mock_client(handler):
+            response = await self.post(self.auth)
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(json.loads(response.content), {"error": WARMING_UP_ERROR})
+
+    async def test_ai_service_unreachable(self):
+        def handler(request):
+            raise httpx.ConnectError("connection refused")
+
+        with mock_client(handler):
+            response = await self.post(self.auth)
+
+        self.assertEqual(response.status_code, 503)
+
+
+class AreaInsightsTest(GatewayTestCase):
+    url = "/api/ai/area-insights/"
+
+    async def test_requires_authentication(self):
+        response = await self.post()
+        self.assertEqual(response.status_code, 401)
+
+    async def test_reuses_one_pooled_client(self):
+        clients = []
+
+        def build_client():
+            clients.append(
+                httpx.AsyncClient(
+                    transport=httpx.MockTransport(
+                        lambda request: httpx.Response(200, json={"answer": "Yes"})
+                    )
+                )
+            )
+            return clients[-1]
+
+        with mock.patch("ai_gateway.client.build_client", build_client):
+            first = await self.post(self.auth)
+            second = await self.post(self.auth)
+
+        self.assertEqual(json.loads(first.content), {"answer": "Yes"})
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(len(clients), 1)
+
+    @mock.patch("ai_gateway.client.AI_RETRY_BACKOFF", 0)
+    async def test_retries_connection_errors(self):
+        attempts = []
+
+        def handler(request):
+            attempts.append(request)
+            if len(attempts) < 3:
+                raise httpx.ConnectError("Temporary failure in name resolution")
+            return httpx.Response(200, json={"answer": "Yes"})
+
+        with mock_client(handler):
+            response = await self.post(self.auth)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(attempts), 3)
+
+    async def test_timeout(self):
+        def handler(request):
+            raise httpx.ReadTimeout("timed out")
+
+        with mock_client(handler):
+            response = await self.post(self.auth)
+
+        self.assertEqual(response.status_code, 504)
+
+    async def test_circuit_opens_after_repeated_failures(self):
+        attempts = []
+
+        def handler(request):
+            attempts.append(request)
+            return httpx.Response(500, json={"error": "boom"})
+
+        with mock_client(handler):
+            for _ in range(ai_client.AI_BREAKER_FAILURES):
+                response = await self.post(self.auth)
+                self.assertEqual(response.status_code, 500)
+            response = await self.post(self.auth)
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(
+            json.loads(response.content), {"error": ai_client.CIRCUIT_OPEN_ERROR}
+        )
+        self.assertEqual(len(attempts), ai_client.AI_BREAKER_FAILURES)
+
+    async def test_circuit_closes_after_successful_trial(self):
+        for _ in range(ai_client.AI_BREAKER_FAILURES):
+            ai_client.breaker.record_failure()
+        ai_client.breaker.opened_at -= ai_client.AI_BREAKER_RESET_SECONDS
+
+        with mock_client(lambda request: httpx.Response(200, json={"answer": "Yes"})):
+            response = await self.post(self.auth)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(ai_client.breaker.opened_at)
+        self.assertEqual(ai_client.breaker.failures, 0)
+
+    async def test_index_not_ready_does_not_trip_circuit(self):
+        with mock_client(lambda request: httpx.Response(503, json={})):
+            for _ in range(ai_client.AI_BREAKER_FAILURES + 1):
+                response = await self.post(self.auth)
+                self.assertEqual(
+                    json.loads(response.content), {"error": WARMING_UP_ERROR}
+                )
+
+
+class SyncAIGatewayTest(GatewayTestCase):
+    async def test_triggers_sync(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={"status": "sync started"})
+
+        with mock_client(handler):
+            response = await self.async_client.post("/api/ai/sync/", headers=self.auth)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(requests[0].url.path.endswith("/ai/sync"))
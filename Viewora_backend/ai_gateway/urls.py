@@ -1,9 +1,10 @@
 from django.urls import path
 
-from .views import AreaInsightsGateway, PropertiesForRAG, SyncAIGateway
+from .views import PropertiesForRAG, area_insights, area_insights_stream, sync_ai
 
 urlpatterns = [
-    path("area-insights/", AreaInsightsGateway.as_view()),
+    path("area-insights/", area_insights),
+    path("area-insights/stream/", area_insights_stream),
     path("properties/", PropertiesForRAG.as_view()),
-    path("sync/", SyncAIGateway.as_view()),
+    path("sync/", sync_ai),
 ]
@@ -1,85 +1,178 @@
-import os
+import json
+import logging
 
-import requests
+import httpx
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from authentication.authentication import CookieJWTAuthentication
 from properties.models import Property
 
-#Provides AI-powered area insights to users
-class AreaInsightsGateway(APIView):
-    permission_classes = [IsAuthenticated]
-
-    def post(self, request):
+from . import client as ai_client
+
+logger = logging.getLogger("viewora")
+
+WARMING_UP_ERROR = "AI Advisor is currently warming up and indexing property data. This takes about 60 seconds on the first run. Please try your search again in a moment."
+COLD_START_ERROR = "AI engine is cold-starting. This usually takes 60-120s for the first run. Please try again in a moment."
+
+# While streaming, read is the longest gap allowed between two events, not
+# the time for the whole answer
+AI_STREAM_TIMEOUT = httpx.Timeout(connect=5.0, read=60.0, write=10.0, pool=5.0)
+AI_SYNC_TIMEOUT = httpx.Timeout(30.0, pool=5.0)
+
+
+def authenticate_user(request):
+    try:
+        result = CookieJWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return None
+    return result[0] if result else None
+
+
+async def require_user(request):
+    """Returns a 401 response unless the request carries a valid JWT."""
+    user = await sync_to_async(authenticate_user)(request)
+    if user is None or not user.is_authenticated:
+        return JsonResponse(
+            {"error": "Authentication credentials were not provided."},
+            status=status.HTTP_401_UNAUTHORIZED,
+        )
+    return None
+
+
+def read_json(request):
+    try:
+        return json.loads(request.body or b"{}")
+    except ValueError:
+        return None
+
+
+def invalid_json():
+    return JsonResponse(
+        {"error": "Invalid JSON body"}, status=status.HTTP_400_BAD_REQUEST
+    )
+
+
+def ai_call_failed(e):
+    """Maps an exception from ai_client.send() to the gateway's error response."""
+    if isinstance(e, ai_client.AIServiceUnavailable):
+        return JsonResponse(
+            {"error": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+    if isinstance(e, httpx.TimeoutException):
+        logger.warning("AI service timed out")
+        return JsonResponse(
+            {"error": COLD_START_ERROR}, status=status.HTTP_504_GATEWAY_TIMEOUT
+        )
+    logger.error(f"AI service connection failed: {e}")
+    return JsonResponse(
+        {
+            "error": "AI service unavailable",
+            "detail": str(e),
+            "target_url": ai_client.ai_service_url(),
+        },
+        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
+
+
+def upstream_error(response):
+    """Relays a non-200 AI service response whose body has been read."""
+    if response.status_code == 503:
+        return JsonResponse(
+            {"error": WARMING_UP_ERROR}, status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+    logger.error(f"AI service error {response.status_code}: {response.text}")
+    try:
+        error_data = response.json()
+    except ValueError:
+        error_data = {
+            "error": f"AI Service error ({response.status_code})",
+            "detail": response.text,
+        }
+    return JsonResponse(error_data, status=response.status_code, safe=False)
+
+
+def sse_error(message):
+    return f"event: error\ndata: {json.dumps({'error': message})}\n\n".encode()
+
+
+# Provides AI-powered area insights to users. Async, so the worker keeps
+# serving other requests while Gemini writes the answer.
+@csrf_exempt
+@require_POST
+async def area_insights(request):
+    unauthorized = await require_user(request)
+    if unauthorized:
+        return unauthorized
+
+    payload = read_json(request)
+    if payload is None:
+        return invalid_json()
+
+    try:
+        response = await ai_client.send("POST", "/ai/area-insights", json=payload)
+    except (ai_client.AIServiceUnavailable, httpx.HTTPError) as e:
+        return ai_call_failed(e)
+
+    if response.status_code != 200:
+        return upstream_error(response)
+    return JsonResponse(response.json(), safe=False)
+
+
+# Streams AI area insights as Server-Sent Events. Async, so a long answer
+# holds no worker thread while tokens are relayed.
+@csrf_exempt
+@require_POST
+async def area_insights_stream(request):
+    unauthorized = await require_user(request)
+    if unauthorized:
+        return unauthorized
+
+    payload = read_json(request)
+    if payload is None:
+        return invalid_json()
+
+    try:
+        upstream = await ai_client.send(
+            "POST",
+            "/ai/area-insights/stream",
+            json=payload,
+            timeout=AI_STREAM_TIMEOUT,
+            stream=True,
+        )
+    except (ai_client.AIServiceUnavailable, httpx.HTTPError) as e:
+        return ai_call_failed(e)
+
+    if upstream.status_code != 200:
+        await upstream.aread()
+        await upstream.aclose()
+        return upstream_error(upstream)
+
+    async def relay():
         try:
-            # Using service name 'aiadvisor' defined in docker-compose.prod.yml
-            # This is automatically resolved by Docker's internal DNS
-            ai_service_url = os.getenv("AI_SERVICE_URL", "http://aiadvisor:8001")
-
-            # Increased timeout to 20s for GenAI latency
-            # Added basic retry for DNS/Startup race conditions
-            max_retries = 3
-            last_err = None
-            for attempt in range(max_retries):
-                try:
-                    response = requests.post(
-                        f"{ai_service_url}/ai/area-insights", json=request.data, timeout=180
-                    )
-                    break 
-                except requests.exceptions.RequestException as e:
-                    last_err = e
-                    if "NameResolutionError" in str(e) or "Temporary failure in name resolution" in str(e):
-                        import time
-                        print(f"DNS Resolution Attempt {attempt+1} failed, retrying...")
-                        time.sleep(2)
-                        continue
-                    raise e
-            else:
-                raise last_err
-
-            # Check if upstream returned an error
-            if response.status_code == 503:
-                 return Response(
-                    {"error": "AI Advisor is currently warming up and indexing property data. This takes about 60 seconds on the first run. Please try your search again in a moment."},
-                    status=status.HTTP_503_SERVICE_UNAVAILABLE
-                )
-
-            if response.status_code != 200:
-                print(f"AI Service Error: {response.text}")
-                try:
-                    error_data = response.json()
-                    return Response(error_data, status=response.status_code)
-                except:
-                    return Response(
-                        {"error": f"AI Service error ({response.status_code})", "detail": response.text},
-                        status=response.status_code,
-                    )
-
-            return Response(response.json(), status=response.status_code)
-
-        except requests.exceptions.Timeout:
-            print("AI Service Timeout")
-            return Response(
-                {"error": "AI engine is cold-starting. This usually takes 60-120s for the first run. Please try again in a moment."},
-                status=status.HTTP_504_GATEWAY_TIMEOUT,
-            )
-        except requests.exceptions.RequestException as e:
-            print(f"AI Connection Error: {e}")
-            return Response(
-                {
-                    "error": "AI service unavailable",
-                    "detail": str(e),
-                    "target_url": ai_service_url,
-                    "check": "v1.17-dynamodb-analytics: Is the 'aiadvisor' container running on the server?"
-                },
-                status=status.HTTP_503_SERVICE_UNAVAILABLE,
-            )
-
-
-#The AI service calls this endpoint to fetch property data and build/update its RAG index for answering property-related queries
+            async for chunk in upstream.aiter_bytes():
+                yield chunk
+        except httpx.HTTPError as e:
+            logger.exception(f"AI answer stream interrupted: {e}")
+            yield sse_error("The AI answer was interrupted. Please try again.")
+        finally:
+            # Returns the connection to the shared pool
+            await upstream.aclose()
+
+    response = StreamingHttpResponse(relay(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+# The AI service calls this endpoint to fetch property data and build/update its RAG index for answering property-related queries
 class PropertiesForRAG(APIView):
     """
     Internal API: provides property data to AI service
@@ -107,28 +200,28 @@ class PropertiesForRAG(APIView):
         return Response(data)
 
 
-#When new properties are added or updated, an admin can trigger this to ensure the AI has the latest data
-class SyncAIGateway(APIView):
+# When new properties are added or updated, an admin can trigger this to ensure the AI has the latest data
+@csrf_exempt
+@require_POST
+async def sync_ai(request):
     """
     Gateway to trigger a RAG index refresh in the AI service
     """
-
-    permission_classes = [IsAuthenticated]
-
-    def post(self, request):
-        try:
-            ai_service_url = os.getenv("AI_SERVICE_URL", "http://aiadvisor:8001")
-            response = requests.post(f"{ai_service_url}/ai/sync", timeout=30)
-
-            if response.status_code != 200:
-                return Response(
-                    {"error": "Failed to sync AI service"}, status=response.status_code
-                )
-
-            return Response(response.json(), status=200)
-
-        except Exception as e:
-            return Response(
-                {"error": f"Could not reach AI service: {e}"},
-                status=status.HTTP_503_SERVICE_UNAVAILABLE,
-            )
+    unauthorized = await require_user(request)
+    if unauthorized:
+        return unauthorized
+
+    try:
+        response = await ai_client.send("POST", "/ai/sync", timeout=AI_SYNC_TIMEOUT)
+    except (ai_client.AIServiceUnavailable, httpx.HTTPError) as e:
+        return JsonResponse(
+            {"error": f"Could not reach AI service: {e}"},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+
+    if response.status_code != 200:
+        return JsonResponse(
+            {"error": "Failed to sync AI service"}, status=response.status_code
+        )
+
+    return JsonResponse(response.json(), safe=False)
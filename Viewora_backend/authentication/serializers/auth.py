@@ -6,6 +6,7 @@ from rest_framework import serializers
 
 from authentication.utils.firebase_auth import verify_firebase_token
 from properties.models import Property
+from properties.serializers import CoverImageMixin
 
 from ..models import BrokerDetails, Profile, SellerDetails,BrokerEmailVerificationOTP
 
@@ -177,9 +178,11 @@ class AdminUserSerializer(serializers.ModelSerializer):
         ]
 
 
-class AdminPropertySerializer(serializers.ModelSerializer):
+class AdminPropertySerializer(CoverImageMixin, serializers.ModelSerializer):
     seller_username = serializers.CharField(source="seller.username", read_only=True)
     cover_image = serializers.SerializerMethodField()
+    cover_thumbnail = serializers.SerializerMethodField()
+    cover_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = Property
@@ -197,10 +200,12 @@ class AdminPropertySerializer(serializers.ModelSerializer):
             "created_at",
             "seller_username",
             "cover_image",
+            "cover_thumbnail",
+            "cover_srcset",
         ]
 
     def get_cover_image(self, obj):
-        image = obj.images.first()
+        image = self.get_cover(obj)
         if not image:
             return None
         request = self.context.get("request")
@@ -17,6 +17,7 @@ from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from properties.models import Property
+from properties.serializers import cover_images_prefetch
 
 from .models import (
     AdminLoginOTP,
@@ -735,7 +736,10 @@ class AdminPropertyListView(APIView):
     def get(self, request):
         search = request.query_params.get("search")
         queryset = (
-            Property.objects.all().select_related("seller").order_by("-created_at")
+            Property.objects.all()
+            .select_related("seller")
+            .prefetch_related(cover_images_prefetch())
+            .order_by("-created_at")
         )
 
         if search:
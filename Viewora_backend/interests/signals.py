@@ -44,7 +44,10 @@ def on_interest_created(sender, instance, created, **kwargs):
     )
     # DynamoDB analytics (non-blocking)
     try:
-        record_property_interest(instance.property.id, instance.client)
+        property_obj.refresh_from_db(fields=["interest_count"])
+        record_property_interest(
+            property_obj.id, instance.client, property_obj.interest_count
+        )
     except Exception as e:
 
         logger.exception(" DynamoDB interest analytics failed")
@@ -0,0 +1,120 @@
+"""
+Debounced change notices for the AI service's property index.
+
+Property writes only record "<id> changed" in Redis. The first change in a
+quiet period schedules send_ai_sync_task AI_SYNC_DEBOUNCE_SECONDS later, and
+that task ships every change collected meanwhile to /ai/sync in one request,
+so a burst of edits becomes one HTTP call carrying exactly the changed ids.
+No property write ever waits on the AI service.
+
+A failed send keeps its changes pending and the task retries with an
+exponential backoff (capped at AI_SYNC_MAX_BACKOFF). Once the retries run out,
+the changes wait for the next property write, and the AI service's own full
+sync picks them up meanwhile.
+
+Without Redis (local development) each change is sent by its own task.
+"""
+
+import logging
+import os
+
+import requests
+from django.conf import settings
+from redis.exceptions import ResponseError
+
+from utils.redis_client import get_redis
+
+from .tasks import send_ai_sync_task
+
+logger = logging.getLogger("viewora")
+
+AI_SYNC_DEBOUNCE_SECONDS = 10
+AI_SYNC_TIMEOUT = 10
+# retries wait 10s, 20s, 40s, ... up to 5 minutes, about 15 minutes in all
+AI_SYNC_MAX_RETRIES = 6
+AI_SYNC_MAX_BACKOFF = 300
+
+# field "<property_id>" -> "upsert" | "delete" (the latest operation wins)
+PENDING_KEY = "ai_sync:pending"
+# the pending hash is renamed here while a batch is being sent
+SENDING_KEY = "ai_sync:sending"
+# set while a send_ai_sync_task is scheduled or waiting to retry
+SCHEDULED_KEY = "ai_sync:scheduled"
+
+
+def queue_ai_sync(property_id, operation):
+    try:
+        if not settings.USE_REDIS:
+            send_ai_sync_task.delay({str(property_id): operation})
+            return
+
+        client = get_redis()
+        client.hset(PENDING_KEY, property_id, operation)
+        schedule_send(client)
+    except Exception as e:
+        # The AI service also catches up on its next full sync
+        logger.error(f"Failed to queue AI sync for property {property_id}: {e}")
+
+
+def schedule_send(client):
+    # Only the first change in a window schedules the task
+    if client.set(SCHEDULED_KEY, 1, nx=True, ex=AI_SYNC_DEBOUNCE_SECONDS * 6):
+        send_ai_sync_task.apply_async(countdown=AI_SYNC_DEBOUNCE_SECONDS)
+
+
+def retry_countdown(retries):
+    return min(AI_SYNC_DEBOUNCE_SECONDS * 2**retries, AI_SYNC_MAX_BACKOFF)
+
+
+def post_changes(changes):
+    ai_service_url = os.getenv("AI_SERVICE_URL", "http://ai_service:8001")
+    response = requests.post(
+        f"{ai_service_url}/ai/sync",
+        json={
+            "changes": [
+                {"id": int(property_id), "op": operation}
+                for property_id, operation in changes.items()
+            ]
+        },
+        timeout=AI_SYNC_TIMEOUT,
+    )
+    response.raise_for_status()
+
+
+def send_pending_changes():
+    """
+    Send every change collected in Redis to the AI service.
+    Returns the number of properties sent. If the send fails, the changes are
+    kept pending and the error is raised for the task to retry.
+    """
+    client = get_redis()
+    # Changes arriving from now on schedule the next batch
+    client.delete(SCHEDULED_KEY)
+
+    # A batch left behind by a failed send goes out first
+    if not client.exists(SENDING_KEY):
+        try:
+            client.renamenx(PENDING_KEY, SENDING_KEY)
+        except ResponseError:
+            # nothing changed since the last batch
+            return 0
+
+    changes = client.hgetall(SENDING_KEY)
+    try:
+        post_changes(changes)
+    except Exception:
+        # Newer operations recorded meanwhile win over the failed batch
+        pipe = client.pipeline()
+        for property_id, operation in changes.items():
+            pipe.hsetnx(PENDING_KEY, property_id, operation)
+        pipe.delete(SENDING_KEY)
+        # The retry sends them; new changes must not schedule extra sends meanwhile
+        pipe.set(SCHEDULED_KEY, 1, ex=AI_SYNC_MAX_BACKOFF + AI_SYNC_DEBOUNCE_SECONDS)
+        pipe.execute()
+        raise
+
+    client.delete(SENDING_KEY)
+    if client.exists(PENDING_KEY):
+        # Only the leftover batch went out; the newer changes still need a send
+        schedule_send(client)
+    return len(changes)
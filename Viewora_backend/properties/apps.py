@@ -7,3 +7,7 @@ class PropertiesConfig(AppConfig):
 
     def ready(self):
         import properties.signals
+
+        from .scheduler import setup_periodic_tasks
+
+        setup_periodic_tasks()
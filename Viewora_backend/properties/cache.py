@@ -0,0 +1,46 @@
+"""
+Shared cache of the user-independent part of the property detail payload.
+
+Entries are dropped by the post_save/post_delete receivers in signals.py
+whenever a Property, PropertyImage or PropertyVideo changes.
+"""
+
+from django.core.cache import cache
+
+from .models import Property
+from .serializers import PropertyDetailCacheSerializer
+
+PROPERTY_DETAIL_CACHE_TIMEOUT = 300
+
+
+def property_detail_cache_key(property_id):
+    return f"property_detail:{property_id}"
+
+
+def get_property_detail_payload(property_id):
+    """
+    Cached detail payload for a property, or None if it does not exist.
+    Contains `video_key` instead of a signed video URL.
+    """
+    key = property_detail_cache_key(property_id)
+    payload = cache.get(key)
+    if payload is not None:
+        return payload
+
+    property_obj = (
+        Property.objects.filter(id=property_id)
+        .defer("search_vector")
+        .select_related("video")
+        .prefetch_related("images")
+        .first()
+    )
+    if property_obj is None:
+        return None
+
+    payload = dict(PropertyDetailCacheSerializer(property_obj).data)
+    cache.set(key, payload, PROPERTY_DETAIL_CACHE_TIMEOUT)
+    return payload
+
+
+def invalidate_property_detail(property_id):
+    cache.delete(property_detail_cache_key(property_id))
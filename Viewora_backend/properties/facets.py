@@ -0,0 +1,102 @@
+"""
+Facet counts for the property list (?facets=true).
+
+All four facets come from one grouped query over the filtered queryset:
+rows are grouped by (city, property_type, bedrooms, price bucket) and the
+per-facet totals are summed in Python. Results are cached briefly per
+filter combination.
+"""
+
+import hashlib
+from collections import Counter
+
+from django.core.cache import cache
+from django.db.models import Case, CharField, Count, Q, Value, When
+
+FACETS_CACHE_TIMEOUT = 60
+
+# (label, lower bound inclusive, upper bound exclusive) in INR
+PRICE_BUCKETS = [
+    ("0-25L", 0, 2_500_000),
+    ("25L-50L", 2_500_000, 5_000_000),
+    ("50L-1Cr", 5_000_000, 10_000_000),
+    ("1Cr-2Cr", 10_000_000, 20_000_000),
+    ("2Cr+", 20_000_000, None),
+]
+
+# Query params that change paging or presentation but not the result set
+NON_FILTER_PARAMS = {"page", "page_size", "cursor", "pagination", "ordering", "facets"}
+
+
+def price_bucket_expression():
+    whens = []
+    for label, lower, upper in PRICE_BUCKETS:
+        condition = Q(price__gte=lower)
+        if upper is not None:
+            condition &= Q(price__lt=upper)
+        whens.append(When(condition, then=Value(label)))
+    return Case(*whens, output_field=CharField())
+
+
+def facets_cache_key(request):
+    filters = sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        if key not in NON_FILTER_PARAMS
+        for value in values
+    )
+    digest = hashlib.md5(repr((request.path, filters)).encode()).hexdigest()
+    return f"property_facets:{digest}"
+
+
+def compute_facets(queryset):
+    rows = (
+        queryset.order_by()
+        .prefetch_related(None)
+        .annotate(price_bucket=price_bucket_expression())
+        .values("city", "property_type", "bedrooms", "price_bucket")
+        .annotate(count=Count("pk"))
+    )
+
+    counters = {
+        "city": Counter(),
+        "property_type": Counter(),
+        "bedrooms": Counter(),
+        "price": Counter(),
+    }
+    for row in rows:
+        counters["city"][row["city"]] += row["count"]
+        counters["property_type"][row["property_type"]] += row["count"]
+        if row["bedrooms"] is not None:
+            counters["bedrooms"][row["bedrooms"]] += row["count"]
+        counters["price"][row["price_bucket"]] += row["count"]
+
+    price_order = [label for label, _, _ in PRICE_BUCKETS]
+    return {
+        "city": [
+            {"value": value, "count": count}
+            for value, count in counters["city"].most_common()
+        ],
+        "property_type": [
+            {"value": value, "count": count}
+            for value, count in sorted(counters["property_type"].items())
+        ],
+        "bedrooms": [
+            {"value": value, "count": count}
+            for value, count in sorted(counters["bedrooms"].items())
+        ],
+        "price": [
+            {"value": label, "count": counters["price"][label]}
+            for label in price_order
+            if counters["price"][label]
+        ],
+    }
+
+
+def get_facets(queryset, request):
+    key = facets_cache_key(request)
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facets(queryset)
+        cache.set(key, facets, FACETS_CACHE_TIMEOUT)
+    return facets
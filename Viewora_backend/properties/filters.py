@@ -0,0 +1,81 @@
+import re
+
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    TrigramWordSimilarity,
+)
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+from rest_framework import filters
+
+SEARCH_CONFIG = "english"
+
+# Fields matched by trigram similarity when the full-text query misses
+FUZZY_FIELDS = ["title", "city", "locality"]
+
+
+def build_prefix_query(terms):
+    """
+    Turn raw search terms into a tsquery where every term is a prefix match,
+    e.g. ["3bhk", "kakka"] -> "3bhk:* & kakka:*".
+    """
+    words = [re.sub(r"[^\w]", "", term) for term in terms]
+    words = [word for word in words if word]
+    if not words:
+        return None
+
+    return SearchQuery(
+        " & ".join(f"{word}:*" for word in words),
+        search_type="raw",
+        config=SEARCH_CONFIG,
+    )
+
+
+class PropertySearchFilter(filters.SearchFilter):
+    """
+    Full-text search over Property.search_vector (GIN indexed) with prefix
+    matching. When nothing matches, falls back to trigram similarity on
+    title/city/locality so misspelt terms ("Palakad") still find listings.
+    Results are annotated with search_rank.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        query = build_prefix_query(terms)
+        if query is None:
+            return queryset
+
+        matches = queryset.filter(search_vector=query)
+        if matches.exists():
+            return matches.annotate(search_rank=SearchRank(F("search_vector"), query))
+
+        # Every term has to be close to a word in one of the fuzzy fields
+        fuzzy = Q()
+        for term in terms:
+            term_match = Q()
+            for field in FUZZY_FIELDS:
+                term_match |= Q(**{f"{field}__trigram_word_similar": term})
+            fuzzy &= term_match
+
+        text = " ".join(terms)
+        return queryset.filter(fuzzy).annotate(
+            search_rank=Greatest(
+                *[TrigramWordSimilarity(text, field) for field in FUZZY_FIELDS]
+            )
+        )
+
+
+class PropertyOrderingFilter(filters.OrderingFilter):
+    """
+    Order search results by relevance unless the client asked for an
+    explicit ordering.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        if (
+            not request.query_params.get(self.ordering_param)
+            and "search_rank" in queryset.query.annotations
+        ):
+            return ["-search_rank", "-created_at"]
+        return super().get_ordering(request, queryset, view)
@@ -0,0 +1,89 @@
+"""
+Grid-cell helpers for nearby property search.
+
+Property.geo_cell buckets latitude/longitude into 0.1 x 0.1 degree cells
+(about 11 km at the equator). A radius or bounding-box query first
+narrows rows to the covering cells through the B-tree index on geo_cell and
+then computes the exact haversine distance only for those candidates.
+"""
+
+import math
+
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import (
+    ASin,
+    Cast,
+    Cos,
+    Floor,
+    Least,
+    Power,
+    Radians,
+    Sin,
+    Sqrt,
+)
+
+EARTH_RADIUS_KM = 6371.0
+
+CELLS_PER_DEGREE = 10
+# Longitude cells per latitude row, (180 + 180) * CELLS_PER_DEGREE rounded up
+CELL_ROW_WIDTH = 4000
+
+# Upper bound on the cell list sent to the database
+MAX_CELLS = 2500
+
+
+def geo_cell_expression():
+    return Floor((F("latitude") + 90) * CELLS_PER_DEGREE) * CELL_ROW_WIDTH + Floor(
+        (F("longitude") + 180) * CELLS_PER_DEGREE
+    )
+
+
+def cell_index(latitude, longitude):
+    row = math.floor((latitude + 90) * CELLS_PER_DEGREE)
+    col = math.floor((longitude + 180) * CELLS_PER_DEGREE)
+    return row, col
+
+
+def cells_for_bbox(min_lat, max_lat, min_lng, max_lng):
+    """
+    Every geo_cell value that overlaps the bounding box, or None when the box
+    is too large for a cell lookup to help.
+    """
+    min_row, min_col = cell_index(max(min_lat, -90), max(min_lng, -180))
+    max_row, max_col = cell_index(min(max_lat, 90), min(max_lng, 180))
+
+    if (max_row - min_row + 1) * (max_col - min_col + 1) > MAX_CELLS:
+        return None
+
+    return [
+        row * CELL_ROW_WIDTH + col
+        for row in range(min_row, max_row + 1)
+        for col in range(min_col, max_col + 1)
+    ]
+
+
+def bbox_around(latitude, longitude, radius_km):
+    """Bounding box (min_lat, max_lat, min_lng, max_lng) enclosing the circle."""
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = max(math.cos(math.radians(latitude)), 1e-6)
+    lng_delta = math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat))
+    return (
+        latitude - lat_delta,
+        latitude + lat_delta,
+        longitude - lng_delta,
+        longitude + lng_delta,
+    )
+
+
+def distance_km_expression(latitude, longitude):
+    """Haversine distance in km from the given point to each row."""
+    lat1 = Radians(Value(latitude, output_field=FloatField()))
+    lng1 = Radians(Value(longitude, output_field=FloatField()))
+    lat2 = Radians(Cast("latitude", FloatField()))
+    lng2 = Radians(Cast("longitude", FloatField()))
+
+    a = Power(Sin((lat2 - lat1) / 2), 2) + Cos(lat1) * Cos(lat2) * Power(
+        Sin((lng2 - lng1) / 2), 2
+    )
+    # Least() guards asin() against rounding pushing the argument past 1
+    return 2 * EARTH_RADIUS_KM * ASin(Least(Sqrt(a), Value(1.0)))
@@ -0,0 +1,173 @@
+"""
+Property image ingestion.
+
+Multipart uploads are pushed to storage on a small thread pool and inserted
+with one bulk_create, so a listing with many photos waits for its slowest
+upload instead of the sum of all of them. Clients can also upload straight
+to S3 with presigned URLs and attach the keys afterwards, which keeps image
+bytes out of Django altogether.
+
+Every attached image then gets WebP/AVIF copies at a few widths from
+generate_image_variants_task, so list pages can load a thumbnail through
+srcset instead of the original upload.
+"""
+
+import io
+import logging
+import os
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image, ImageOps, features
+
+from .cache import invalidate_property_detail
+from .models import PropertyImage
+from .tasks import generate_image_variants_task
+
+logger = logging.getLogger("viewora")
+
+# S3 uploads are network bound, so a few threads per request are enough
+IMAGE_UPLOAD_WORKERS = 8
+MAX_IMAGES_PER_REQUEST = 20
+# Presigned uploads bypass Django's request size limits, so attach checks this
+MAX_IMAGE_BYTES = 20 * 1024 * 1024
+IMAGE_KEY_PREFIX = "property_images/{property_id}/"
+
+# Card thumbnails, two-column layouts and the detail gallery
+VARIANT_WIDTHS = (320, 640, 1280)
+VARIANT_FORMATS = {
+    "webp": {"quality": 80, "method": 4},
+    "avif": {"quality": 55, "speed": 8},
+}
+VARIANT_KEY = "property_images/variants/{image_id}/{width}.{fmt}"
+
+
+def image_key_prefix(property_id):
+    return IMAGE_KEY_PREFIX.format(property_id=property_id)
+
+
+def new_image_key(property_id, file_name):
+    # Random names, so presigned uploads never overwrite an existing image
+    extension = os.path.splitext(file_name)[1].lower()[:10]
+    return f"{image_key_prefix(property_id)}{uuid.uuid4().hex}{extension}"
+
+
+def attach_property_images(property_obj, names):
+    """Create PropertyImage rows for files already in storage, in one INSERT."""
+    images = PropertyImage.objects.bulk_create(
+        [PropertyImage(property=property_obj, image=name) for name in names]
+    )
+    # bulk_create sends no post_save, which normally clears the cached detail
+    invalidate_property_detail(property_obj.id)
+
+    image_ids = [image.id for image in images]
+    transaction.on_commit(lambda: enqueue_image_variants(image_ids))
+    return images
+
+
+def stored_image_sizes(names):
+    """
+    {name: size in bytes, or None when nothing was uploaded under it}.
+    Each check is a HEAD request on S3, so they run concurrently.
+    """
+    storage = PropertyImage._meta.get_field("image").storage
+
+    def size(name):
+        return storage.size(name) if storage.exists(name) else None
+
+    if not names:
+        return {}
+    workers = min(IMAGE_UPLOAD_WORKERS, len(names))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(names, pool.map(size, names)))
+
+
+def save_property_images(property_obj, uploads):
+    """
+    Upload files from a multipart request concurrently, then attach them.
+    """
+    if not uploads:
+        return []
+
+    field = PropertyImage._meta.get_field("image")
+    instance = PropertyImage(property=property_obj)
+
+    def store(upload):
+        name = field.generate_filename(instance, upload.name)
+        return field.storage.save(name, upload, max_length=field.max_length)
+
+    # S3Boto3Storage keeps one connection per thread, so saves can overlap
+    workers = min(IMAGE_UPLOAD_WORKERS, len(uploads))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        names = list(pool.map(store, uploads))
+
+    return attach_property_images(property_obj, names)
+
+
+def enqueue_image_variants(image_ids):
+    for image_id in image_ids:
+        try:
+            generate_image_variants_task.delay(image_id)
+        except Exception as e:
+            # The original image still works; variants can be backfilled
+            logger.error(f"Failed to queue variants for image {image_id}: {e}")
+
+
+def build_image_variants(fp):
+    """
+    Resize an image file to VARIANT_WIDTHS (never upscaling) and encode each
+    size in every supported VARIANT_FORMATS entry.
+    Returns a list of (format, width, bytes).
+    """
+    formats = {
+        fmt: options for fmt, options in VARIANT_FORMATS.items() if features.check(fmt)
+    }
+
+    with Image.open(fp) as original:
+        # JPEGs can be decoded at 1/2, 1/4 or 1/8 scale, which is much
+        # faster than decoding a full camera photo only to shrink it
+        largest = max(VARIANT_WIDTHS)
+        original.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGB")
+
+        widths = [width for width in VARIANT_WIDTHS if width < image.width]
+        widths = widths or [image.width]
+
+        variants = []
+        for width in widths:
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize(
+                (width, height), Image.Resampling.LANCZOS, reducing_gap=2.0
+            )
+            for fmt, options in formats.items():
+                buffer = io.BytesIO()
+                resized.save(buffer, format=fmt.upper(), **options)
+                variants.append((fmt, width, buffer.getvalue()))
+        return variants
+
+
+def generate_image_variants(image_id):
+    """Build, store and record the variants of one PropertyImage."""
+    image = PropertyImage.objects.filter(id=image_id).first()
+    if image is None:
+        return {}
+
+    with image.image.open("rb") as fp:
+        built = build_image_variants(fp)
+
+    storage = image.image.storage
+    variants = defaultdict(dict)
+    for fmt, width, data in built:
+        content = ContentFile(data)
+        content.content_type = f"image/{fmt}"
+        name = VARIANT_KEY.format(image_id=image.id, width=width, fmt=fmt)
+        variants[fmt][str(width)] = storage.save(name, content)
+
+    PropertyImage.objects.filter(id=image.id).update(variants=variants)
+    invalidate_property_detail(image.property_id)
+    return variants
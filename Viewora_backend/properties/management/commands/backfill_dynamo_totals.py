@@ -0,0 +1,44 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from properties.models import Property
+from utils.dynamodb import set_view_total
+from utils.dynamodb_interest import set_interest_total
+
+# Each write is one DynamoDB round trip
+BACKFILL_WORKERS = 8
+
+
+class Command(BaseCommand):
+    help = (
+        "Writes the all-time view and interest totals of published properties "
+        "to DynamoDB, so the AI service reads them with one batch_get_item "
+        "instead of counting event items"
+    )
+
+    def handle(self, *args, **options):
+        rows = list(
+            Property.objects.filter(status="published", is_active=True)
+            .order_by("pk")
+            .values_list("id", "view_count", "interest_count")
+        )
+
+        def backfill(row):
+            property_id, views, interests = row
+            # Totals already raised by live traffic are left alone
+            return (
+                set_view_total(property_id, views),
+                set_interest_total(property_id, interests),
+            )
+
+        written = [0, 0]
+        with ThreadPoolExecutor(max_workers=BACKFILL_WORKERS) as pool:
+            for views_written, interests_written in pool.map(backfill, rows):
+                written[0] += views_written
+                written[1] += interests_written
+
+        self.stdout.write(
+            f"Backfilled {len(rows)} properties: {written[0]} view totals and "
+            f"{written[1]} interest totals written"
+        )
@@ -0,0 +1,76 @@
+import io
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from properties.images import VARIANT_WIDTHS, build_image_variants
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp"}
+
+# Listing photos shipped with the frontend, used when no paths are given
+SAMPLE_IMAGES = (
+    settings.BASE_DIR.parent / "Viewora_frontend" / "viewora-project" / "public"
+) / "images"
+
+
+class Command(BaseCommand):
+    help = (
+        "Builds the image variants for sample photos and compares their size "
+        "with the original uploads"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "paths", nargs="*", help="Image files or directories of images"
+        )
+
+    def handle(self, *args, **options):
+        paths = [Path(path) for path in options["paths"]] or [SAMPLE_IMAGES]
+
+        files = []
+        for path in paths:
+            if not path.exists():
+                raise CommandError(f"{path} does not exist")
+            files += sorted(path.iterdir()) if path.is_dir() else [path]
+        originals = [
+            f.read_bytes() for f in files if f.suffix.lower() in IMAGE_SUFFIXES
+        ]
+        if not originals:
+            raise CommandError("No images found")
+
+        # (format, width) -> [variant bytes, original bytes, images]
+        totals = {}
+        start = time.perf_counter()
+        for data in originals:
+            for fmt, width, encoded in build_image_variants(io.BytesIO(data)):
+                total = totals.setdefault((fmt, width), [0, 0, 0])
+                total[0] += len(encoded)
+                total[1] += len(data)
+                total[2] += 1
+        elapsed_ms = (time.perf_counter() - start) * 1000 / len(originals)
+
+        original_kib = sum(map(len, originals)) / len(originals) / 1024
+        self.stdout.write(
+            f"{len(originals)} images, {original_kib:.0f} KiB on average, "
+            f"{elapsed_ms:.0f} ms per image to build every variant"
+        )
+        for (fmt, width), (size, original, count) in sorted(totals.items()):
+            self.stdout.write(
+                f"  {fmt:<4} {width:>4}w  {size / count / 1024:>6.1f} KiB  "
+                f"{original / size:>5.1f}x smaller  ({count} images)"
+            )
+
+        # Images narrower than the smallest width keep their own width
+        thumbnails = [
+            total
+            for (fmt, width), total in totals.items()
+            if fmt == "webp" and width <= min(VARIANT_WIDTHS)
+        ]
+        if thumbnails:
+            thumb_kib = sum(t[0] for t in thumbnails) / len(originals) / 1024
+            self.stdout.write(
+                f"A list page of 10 cards: {original_kib * 10:.0f} KiB of "
+                f"originals vs {thumb_kib * 10:.0f} KiB of WebP thumbnails"
+            )
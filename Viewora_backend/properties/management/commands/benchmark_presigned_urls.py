@@ -0,0 +1,54 @@
+import time
+
+import boto3
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from utils.s3 import generate_presigned_get_url
+
+# Signing happens locally, so this needs no S3 endpoint or real credentials
+
+
+def legacy_presigned_get_url(key, expires=3600):
+    """The previous implementation: a brand-new client on every call."""
+    s3 = boto3.client(
+        "s3",
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID or "benchmark",
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY or "benchmark",
+        region_name=settings.AWS_REGION or "us-east-1",
+    )
+    return s3.generate_presigned_url(
+        "get_object",
+        Params={"Bucket": settings.AWS_S3_BUCKET or "benchmark", "Key": key},
+        ExpiresIn=expires,
+    )
+
+
+class Command(BaseCommand):
+    help = "Compares per-call boto3 clients with the shared client + URL cache"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--keys", type=int, default=10)
+
+    def handle(self, *args, **options):
+        keys = [f"property_videos/{i}/tour.mp4" for i in range(options["keys"])]
+        total = options["requests"]
+
+        start = time.perf_counter()
+        for i in range(total):
+            legacy_presigned_get_url(keys[i % len(keys)])
+        legacy_ms = (time.perf_counter() - start) * 1000 / total
+
+        cache.clear()
+        start = time.perf_counter()
+        for i in range(total):
+            generate_presigned_get_url(keys[i % len(keys)])
+        pooled_ms = (time.perf_counter() - start) * 1000 / total
+
+        self.stdout.write(
+            f"{total} requests over {len(keys)} keys: "
+            f"new client per call {legacy_ms:.2f} ms/request, "
+            f"shared client + cache {pooled_ms:.3f} ms/request"
+        )
@@ -0,0 +1,117 @@
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from properties.filters import PropertySearchFilter
+from properties.models import Property
+
+User = get_user_model()
+
+SYLLABLES = ["ka", "la", "pa", "ma", "na", "ra", "vi", "tu", "ko", "de", "mu", "sh"]
+
+
+def make_words(rng, count, syllables):
+    return sorted({"".join(rng.choices(SYLLABLES, k=syllables)) for _ in range(count)})
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the legacy icontains search with PropertySearchFilter on "
+        "synthetic listings. All generated rows are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=100_000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.seed(options["count"])
+                self.run(options["repeat"])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def seed(self, count):
+        rng = random.Random(42)
+        words = make_words(rng, 5000, 4)
+        places = make_words(rng, 500, 3)
+        seller = User.objects.create_user(username="search-benchmark-seller")
+        batch = []
+        for i in range(count):
+            batch.append(
+                Property(
+                    seller=seller,
+                    title=" ".join(rng.sample(words, 3)).title(),
+                    description=" ".join(rng.choices(words, k=30)),
+                    property_type="house",
+                    price=rng.randint(1_000_000, 20_000_000),
+                    area_size=rng.randint(500, 4000),
+                    city=rng.choice(places[:20]).title(),
+                    locality=rng.choice(places).title(),
+                    address=f"House {i}",
+                )
+            )
+            if len(batch) == 5000:
+                Property.objects.bulk_create(batch)
+                batch = []
+        Property.objects.bulk_create(batch)
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Property._meta.db_table}")
+        self.stdout.write(f"Seeded {count} properties")
+
+        # exact word, two-word query, prefix, and a locality with a typo
+        place = places[7]
+        self.terms = [
+            words[10],
+            f"{words[20]} {words[30]}",
+            words[40][:5],
+            place[:3] + place[4:],
+        ]
+
+    def run(self, repeat):
+        base = Property.objects.filter(status="published", is_active=True)
+        factory = APIRequestFactory()
+        search = PropertySearchFilter()
+
+        for term in self.terms:
+            legacy = base
+            for word in term.split():
+                legacy = legacy.filter(
+                    Q(title__icontains=word)
+                    | Q(description__icontains=word)
+                    | Q(city__icontains=word)
+                    | Q(locality__icontains=word)
+                )
+
+            request = Request(factory.get("/", {"search": term}))
+            fts = search.filter_queryset(request, base, view=None).order_by(
+                "-search_rank"
+            )
+
+            legacy_ms, legacy_hits = self.time(legacy.order_by("-created_at"), repeat)
+            fts_ms, fts_hits = self.time(fts, repeat)
+            self.stdout.write(
+                f"{term!r:16} icontains {legacy_ms:8.1f} ms ({legacy_hits} hits) | "
+                f"full-text {fts_ms:8.1f} ms ({fts_hits} hits)"
+            )
+
+    def time(self, queryset, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            hits = queryset.count()
+            list(queryset[:10])
+            timings.append((time.perf_counter() - start) * 1000)
+        return min(timings), hits
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from properties.images import enqueue_image_variants, generate_image_variants
+from properties.models import PropertyImage
+
+
+class Command(BaseCommand):
+    help = "Queues WebP/AVIF variants for property images that have none yet"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sync",
+            action="store_true",
+            help="Build the variants in this process instead of queueing tasks",
+        )
+        parser.add_argument("--limit", type=int, default=None)
+
+    def handle(self, *args, **options):
+        image_ids = list(
+            PropertyImage.objects.filter(variants={})
+            .order_by("pk")
+            .values_list("id", flat=True)[: options["limit"]]
+        )
+
+        if not options["sync"]:
+            enqueue_image_variants(image_ids)
+            self.stdout.write(f"Queued variants for {len(image_ids)} images")
+            return
+
+        for image_id in image_ids:
+            try:
+                generate_image_variants(image_id)
+            except Exception as e:
+                self.stderr.write(f"Image {image_id}: {e}")
+        self.stdout.write(f"Built variants for {len(image_ids)} images")
@@ -0,0 +1,129 @@
+import math
+import random
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from properties.models import Property
+from properties.view_counter import flush_views, record_view, unique_viewers
+
+User = get_user_model()
+
+# DynamoDB BatchWriteItem accepts at most 25 items per request
+DYNAMO_BATCH_SIZE = 25
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulates detail page views against the Redis view buffer and reports "
+        "the writes needed compared to one task per view. Needs USE_REDIS; "
+        "generated properties are rolled back and DynamoDB is not called."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--views", type=int, default=20_000)
+        parser.add_argument("--properties", type=int, default=200)
+        parser.add_argument("--flushes", type=int, default=4)
+        parser.add_argument(
+            "--viewers",
+            type=int,
+            default=2_000,
+            help="Distinct users behind the views; repeats are not counted",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.USE_REDIS:
+            raise CommandError("Set USE_REDIS=true to use the view buffer")
+
+        try:
+            with transaction.atomic():
+                self.run(
+                    options["views"],
+                    options["properties"],
+                    options["flushes"],
+                    options["viewers"],
+                )
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def run(self, views, properties, flushes, viewers):
+        seller = User.objects.create_user(username="view-loadtest-seller")
+        ids = [
+            prop.id
+            for prop in Property.objects.bulk_create(
+                Property(
+                    seller=seller,
+                    title=f"Load test {i}",
+                    description="Load test",
+                    property_type="flat",
+                    price=1_000_000,
+                    area_size=1000,
+                    city="Kochi",
+                    locality="Kaloor",
+                    address="Load test",
+                )
+                for i in range(properties)
+            )
+        ]
+
+        # Popular listings get most of the traffic
+        rng = random.Random(7)
+        weights = [1 / (rank + 1) for rank in range(properties)]
+        stream = rng.choices(ids, weights=weights, k=views)
+        viewer_ids = [rng.randrange(viewers) for _ in range(views)]
+
+        sql_writes = 0
+        dynamo_requests = 0
+        counted_views = 0
+        record_seconds = 0.0
+        chunk = math.ceil(views / flushes)
+
+        for start in range(0, views, chunk):
+            begin = time.perf_counter()
+            for property_id, viewer_id in zip(
+                stream[start : start + chunk], viewer_ids[start : start + chunk]
+            ):
+                counted_views += record_view(property_id, "Kochi", "Kaloor", viewer_id)
+            record_seconds += time.perf_counter() - begin
+
+            with CaptureQueriesContext(connection) as ctx:
+                _, distinct, _ = flush_views(write_dynamo=False)
+            sql_writes += sum(
+                1 for query in ctx.captured_queries if query["sql"].startswith("UPDATE")
+            )
+            # a daily item and an all-time total per property
+            dynamo_requests += math.ceil(2 * distinct / DYNAMO_BATCH_SIZE)
+
+        counted = sum(
+            Property.objects.filter(id__in=ids).values_list("view_count", flat=True)
+        )
+
+        self.stdout.write(
+            f"{views} views by {viewers} users over {properties} properties, "
+            f"{flushes} flushes"
+        )
+        self.stdout.write(
+            f"  one task per view: {views} broker messages, {views} Postgres "
+            f"UPDATEs, {views} DynamoDB update_item calls"
+        )
+        self.stdout.write(
+            f"  repeat views dropped: {views - counted_views}, "
+            f"counted: {counted_views}"
+        )
+        self.stdout.write(
+            f"  buffered: 0 broker messages, {sql_writes} Postgres UPDATEs, "
+            f"{dynamo_requests} DynamoDB batch requests "
+            f"({record_seconds * 1e6 / views:.0f} us per view in Redis)"
+        )
+        self.stdout.write(f"  view_count total after flushes: {counted}")
+        top_total, _ = unique_viewers(ids[0], days=1)
+        self.stdout.write(f"  unique viewers of the busiest listing: ~{top_total}")
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.9 on 2026-10-18 09:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0003_propertyvideo"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                fields=["status", "is_active", "-created_at"],
+                name="property_pub_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                fields=["status", "is_active", "price"], name="property_pub_price_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                fields=["status", "is_active", "-view_count"],
+                name="property_pub_views_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                fields=["status", "is_active", "-interest_count"],
+                name="property_pub_interest_idx",
+            ),
+        ),
+    ]
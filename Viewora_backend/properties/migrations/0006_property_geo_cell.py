@@ -0,0 +1,54 @@
+# Generated by Django 5.2.9 on 2026-10-18 09:13
+
+import django.db.models.expressions
+import django.db.models.functions.math
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0005_property_search"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="property",
+            name="geo_cell",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.expressions.CombinedExpression(
+                    django.db.models.expressions.CombinedExpression(
+                        django.db.models.functions.math.Floor(
+                            django.db.models.expressions.CombinedExpression(
+                                django.db.models.expressions.CombinedExpression(
+                                    models.F("latitude"), "+", models.Value(90)
+                                ),
+                                "*",
+                                models.Value(10),
+                            )
+                        ),
+                        "*",
+                        models.Value(4000),
+                    ),
+                    "+",
+                    django.db.models.functions.math.Floor(
+                        django.db.models.expressions.CombinedExpression(
+                            django.db.models.expressions.CombinedExpression(
+                                models.F("longitude"), "+", models.Value(180)
+                            ),
+                            "*",
+                            models.Value(10),
+                        )
+                    ),
+                ),
+                output_field=models.BigIntegerField(null=True),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(fields=["geo_cell"], name="property_geo_cell_idx"),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-18 09:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0006_property_geo_cell"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="propertyimage",
+            name="variants",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
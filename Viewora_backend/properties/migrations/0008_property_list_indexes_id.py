@@ -0,0 +1,59 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0007_propertyimage_variants"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="property",
+            name="property_pub_created_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="property",
+            name="property_pub_price_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="property",
+            name="property_pub_views_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="property",
+            name="property_pub_interest_idx",
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                fields=["status", "is_active", "-created_at", "-id"],
+                name="property_pub_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                fields=["status", "is_active", "price", "id"],
+                name="property_pub_price_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                fields=["status", "is_active", "-view_count", "-id"],
+                name="property_pub_views_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="property",
+            index=models.Index(
+                fields=["status", "is_active", "-interest_count", "-id"],
+                name="property_pub_interest_idx",
+            ),
+        ),
+    ]
@@ -1,6 +1,10 @@
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
 
+from .geo import geo_cell_expression
+
 User = (
     settings.AUTH_USER_MODEL
 )  # Django’s configured user model,Safe for future custom user models
@@ -62,6 +66,12 @@ class Property(models.Model):
     longitude = models.DecimalField(
         max_digits=9, decimal_places=6, null=True, blank=True
     )
+    # Grid bucket of latitude/longitude for nearby search, see properties/geo.py
+    geo_cell = models.GeneratedField(
+        expression=geo_cell_expression(),
+        output_field=models.BigIntegerField(null=True),
+        db_persist=True,
+    )
 
     #  Nearby facilities (,used json field for flexibility,No schema migration needed later, AI-friendly in later
 
@@ -88,20 +98,152 @@ class Property(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Weighted full-text document for PropertySearchFilter, maintained by Postgres
+    search_vector = models.GeneratedField(
+        expression=SearchVector("title", weight="A", config="english")
+        + SearchVector("city", "locality", weight="B", config="english")
+        + SearchVector("description", weight="C", config="english"),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    class Meta:
+        # Match PropertyListView's published filter + each ordering and the id
+        # tiebreaker, so (field, id) cursor pages are served by an index range scan
+        indexes = [
+            models.Index(
+                fields=["status", "is_active", "-created_at", "-id"],
+                name="property_pub_created_idx",
+            ),
+            models.Index(
+                fields=["status", "is_active", "price", "id"],
+                name="property_pub_price_idx",
+            ),
+            models.Index(
+                fields=["status", "is_active", "-view_count", "-id"],
+                name="property_pub_views_idx",
+            ),
+            models.Index(
+                fields=["status", "is_active", "-interest_count", "-id"],
+                name="property_pub_interest_idx",
+            ),
+            models.Index(fields=["geo_cell"], name="property_geo_cell_idx"),
+            GinIndex(fields=["search_vector"], name="property_search_vector_idx"),
+            # Trigram indexes give typo-tolerant matching on the short fields
+            GinIndex(
+                OpClass("title", name="gin_trgm_ops"), name="property_title_trgm_idx"
+            ),
+            GinIndex(
+                OpClass("city", name="gin_trgm_ops"), name="property_city_trgm_idx"
+            ),
+            GinIndex(
+                OpClass("locality", name="gin_trgm_ops"),
+                name="property_locality_trgm_idx",
+            ),
+        ]
+
+    # Fields the AI service builds a property's search document from, plus
+    # the ones deciding whether it is indexed at all: PROPERTY_COLUMNS and
+    # PUBLISHED in Viewora_ai_service/app/rag/indexer.py, kept in step by
+    # PropertyAIIndexedFieldsTest. Saves touching none of them, like
+    # interest_count or description updates, don't reindex the property.
+    AI_INDEXED_FIELDS = (
+        "property_type",
+        "city",
+        "locality",
+        "price",
+        "area_size",
+        "area_unit",
+        "bedrooms",
+        "status",
+        "is_active",
+    )
+
     def __str__(self):
         return f"{self.title} - {self.city}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_ai_indexed_values()
+        return instance
+
+    def ai_indexed_values(self):
+        # Deferred fields are left out instead of being loaded
+        return {
+            name: self.__dict__[name]
+            for name in self.AI_INDEXED_FIELDS
+            if name in self.__dict__
+        }
+
+    def remember_ai_indexed_values(self, update_fields=None):
+        """
+        Record the values now in the database. After save(update_fields=...)
+        only those fields were written; other attributes may hold unsaved
+        edits and keep their remembered values.
+        """
+        values = self.ai_indexed_values()
+        if update_fields is not None:
+            saved = dict(getattr(self, "_saved_ai_indexed_values", None) or {})
+            saved.update(
+                {name: values[name] for name in update_fields if name in values}
+            )
+            values = saved
+        self._saved_ai_indexed_values = values
+
+    def ai_index_changed(self, update_fields=None):
+        """Whether a save may have changed what the AI service indexes."""
+        if update_fields is not None and not set(update_fields) & set(
+            self.AI_INDEXED_FIELDS
+        ):
+            return False
+        saved = getattr(self, "_saved_ai_indexed_values", None)
+        if saved is None:
+            # New, or not loaded from the database
+            return True
+        values = self.ai_indexed_values()
+        if update_fields is not None:
+            # Only these fields were written
+            values = {
+                name: value for name, value in values.items() if name in update_fields
+            }
+        return any(
+            name not in saved or saved[name] != value for name, value in values.items()
+        )
+
 
 class PropertyImage(models.Model):
     property = models.ForeignKey(
         Property, related_name="images", on_delete=models.CASCADE
     )
     image = models.ImageField(upload_to="property_images/")
+    # {"webp": {"320": "<storage name>", ...}, "avif": {...}}, filled in by
+    # generate_image_variants_task after upload
+    variants = models.JSONField(default=dict, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return f"Image for {self.property.title}"
 
+    def srcset(self):
+        """{format: "url 320w, url 640w, ..."} for the generated variants."""
+        storage = self.image.storage
+        return {
+            fmt: ", ".join(
+                f"{storage.url(name)} {width}w"
+                for width, name in sorted(names.items(), key=lambda i: int(i[0]))
+            )
+            for fmt, names in self.variants.items()
+        }
+
+    def thumbnail_url(self):
+        """Smallest WebP variant, or the original until variants exist."""
+        names = self.variants.get("webp")
+        if not names:
+            return self.image.url
+        smallest = min(names, key=int)
+        return self.image.storage.url(names[smallest])
+
 
 class PropertyVideo(models.Model):
     property = models.OneToOneField(
@@ -110,3 +252,14 @@ class PropertyVideo(models.Model):
     s3_key = models.CharField(max_length=500)
     video_url = models.URLField()
     created_at = models.DateTimeField(auto_now_add=True)
+
+
+class PropertyViewFlush(models.Model):
+    """
+    A batch of buffered views already added to Property.view_count. Written
+    in the same transaction as the UPDATE, so a flush that crashes before
+    clearing its Redis batch cannot apply it a second time.
+    """
+
+    batch_id = models.CharField(max_length=32, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
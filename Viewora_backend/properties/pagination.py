@@ -1,7 +1,113 @@
-from rest_framework.pagination import PageNumberPagination
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 
 
 class PropertyPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 50
+
+
+class PropertyCursorPagination(CursorPagination):
+    """
+    Keyset pagination for deep scrolling. The position is taken from the
+    active ordering (see PropertyListView.ordering_fields) plus the id, so
+    every page is a `WHERE (<field>, id) < (<last value>, <last id>)` on an
+    index instead of OFFSET + COUNT(*). No total count is returned.
+
+    DRF's CursorPagination keys on the first ordering field alone and walks
+    ties with an offset capped at offset_cutoff, which loops forever once
+    more than that many listings share a value (e.g. 0 views). The id makes
+    every position unique, so the offset is never needed.
+    """
+
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 50
+    ordering = "-created_at"
+
+    def get_ordering(self, request, queryset, view):
+        field = super().get_ordering(request, queryset, view)[0]
+        tiebreaker = "-id" if field.startswith("-") else "id"
+        return (field, tiebreaker)
+
+    def _get_position_from_instance(self, instance, ordering):
+        value = super()._get_position_from_instance(instance, ordering)
+        pk = instance["id"] if isinstance(instance, dict) else instance.pk
+        return f"{pk}:{value}"
+
+    def keyset_filter(self, position, reverse):
+        """`(field, id)` strictly after (or, walking back, before) position."""
+        try:
+            pk, value = position.split(":", 1)
+            pk = int(pk)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+
+        field = self.ordering[0].lstrip("-")
+        lookup = "lt" if reverse != self.ordering[0].startswith("-") else "gt"
+        return Q(**{f"{field}__{lookup}": value}) | Q(
+            **{field: value, f"id__{lookup}": pk}
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # CursorPagination.paginate_queryset with the keyset filter above in
+        # place of its single-field one
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            offset, reverse, current_position = (0, False, None)
+        else:
+            offset, reverse, current_position = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(
+                *[f[1:] if f.startswith("-") else f"-{f}" for f in self.ordering]
+            )
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            try:
+                queryset = queryset.filter(
+                    self.keyset_filter(current_position, reverse)
+                )
+            except (ValueError, ValidationError):
+                # A position that doesn't fit the ordering field
+                raise NotFound(self.invalid_cursor_message)
+
+        results = list(queryset[offset : offset + self.page_size + 1])
+        self.page = results[: self.page_size]
+
+        if len(results) > len(self.page):
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+        else:
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = current_position is not None or offset > 0
+            self.has_previous = following_position is not None
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next = following_position is not None
+            self.has_previous = current_position is not None or offset > 0
+            self.next_position = following_position
+            self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
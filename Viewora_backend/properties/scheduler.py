@@ -0,0 +1,21 @@
+from django.db.utils import OperationalError, ProgrammingError
+from django_celery_beat.models import IntervalSchedule, PeriodicTask
+
+
+def setup_periodic_tasks():
+    try:
+        if PeriodicTask.objects.filter(name="Flush Property View Counts").exists():
+            return
+
+        schedule, _ = IntervalSchedule.objects.get_or_create(
+            every=60,
+            period=IntervalSchedule.SECONDS,
+        )
+
+        PeriodicTask.objects.create(
+            name="Flush Property View Counts",
+            task="properties.tasks.flush_property_views_task",
+            interval=schedule,
+        )
+    except (OperationalError, ProgrammingError):
+        pass
@@ -1,3 +1,4 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
 
 from interests.models import PropertyInterest
@@ -5,6 +6,44 @@ from interests.models import PropertyInterest
 from .models import Property, PropertyImage
 
 
+def cover_images_prefetch():
+    """Prefetch only the first image of each property, for CoverImageMixin."""
+    return Prefetch(
+        "images",
+        queryset=PropertyImage.objects.order_by("pk")[:1],
+        to_attr="cover_images",
+    )
+
+
+class CoverImageMixin:
+    """
+    cover_image, cover_thumbnail and cover_srcset for list serializers.
+    Uses the cover_images prefetch when the view provides one, otherwise
+    loads the first image once per property.
+    """
+
+    def get_cover(self, obj):
+        if not hasattr(obj, "cover_images"):
+            image = obj.images.first()
+            obj.cover_images = [image] if image else []
+        return obj.cover_images[0] if obj.cover_images else None
+
+    def get_cover_image(self, obj):
+        image = self.get_cover(obj)
+        if image:
+            # S3 storage already returns full URL, no need for build_absolute_uri
+            return image.image.url
+        return None
+
+    def get_cover_thumbnail(self, obj):
+        image = self.get_cover(obj)
+        return image.thumbnail_url() if image else None
+
+    def get_cover_srcset(self, obj):
+        image = self.get_cover(obj)
+        return image.srcset() if image else {}
+
+
 class PropertyCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Property
@@ -16,6 +55,8 @@ class PropertyCreateSerializer(serializers.ModelSerializer):
             "interest_count",
             "created_at",
             "updated_at",
+            "search_vector",
+            "geo_cell",
         )
 
     def create(self, validated_data):
@@ -26,10 +67,12 @@ class PropertyCreateSerializer(serializers.ModelSerializer):
         return property_obj
 
 
-class PropertyListSerializer(serializers.ModelSerializer):
+class PropertyListSerializer(CoverImageMixin, serializers.ModelSerializer):
     seller = serializers.StringRelatedField()
     is_interested = serializers.SerializerMethodField()
     cover_image = serializers.SerializerMethodField()
+    cover_thumbnail = serializers.SerializerMethodField()
+    cover_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = Property
@@ -52,9 +95,15 @@ class PropertyListSerializer(serializers.ModelSerializer):
             "is_active",
             "status",
             "cover_image",
+            "cover_thumbnail",
+            "cover_srcset",
         ]
 
     def get_is_interested(self, obj):
+        # PropertyListView annotates this flag with an Exists() subquery
+        if hasattr(obj, "user_interested"):
+            return obj.user_interested
+
         request = self.context.get("request")
 
         if not request or not request.user.is_authenticated:
@@ -64,25 +113,33 @@ class PropertyListSerializer(serializers.ModelSerializer):
             property=obj, client=request.user
         ).exists()
 
-    def get_cover_image(self, obj):
-        image = obj.images.first()
-        if image:
-            # S3 storage already returns full URL, no need for build_absolute_uri
-            return image.image.url
-        return None
+
+class PropertyNearbySerializer(PropertyListSerializer):
+    distance_km = serializers.FloatField(read_only=True)
+
+    class Meta(PropertyListSerializer.Meta):
+        fields = PropertyListSerializer.Meta.fields + [
+            "latitude",
+            "longitude",
+            "distance_km",
+        ]
 
 
 class PropertyImageSerializer(serializers.ModelSerializer):
     image = serializers.SerializerMethodField()
+    srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = PropertyImage
-        fields = ["id", "image"]
+        fields = ["id", "image", "srcset"]
 
     def get_image(self, obj):
         # S3 storage already returns full URL, no need for build_absolute_uri
         return obj.image.url
 
+    def get_srcset(self, obj):
+        return obj.srcset()
+
 
 class PropertyDetailSerializer(serializers.ModelSerializer):
     is_interested = serializers.SerializerMethodField()
@@ -92,7 +149,7 @@ class PropertyDetailSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Property
-        fields = "__all__"
+        exclude = ["search_vector", "geo_cell"]
 
     def get_is_interested(self, obj):
         user = self.context["request"].user
@@ -107,8 +164,25 @@ class PropertyDetailSerializer(serializers.ModelSerializer):
         return obj.video.video_url if hasattr(obj, "video") else None
 
 
-class SellerPropertyListSerializer(serializers.ModelSerializer):
+class PropertyDetailCacheSerializer(PropertyDetailSerializer):
+    """
+    User-independent detail payload shared through the cache. The view adds
+    is_interested/active_interest_id and signs video_key per request.
+    """
+
+    is_interested = None
+    active_interest_id = None
+    video_url = None
+    video_key = serializers.SerializerMethodField()
+
+    def get_video_key(self, obj):
+        return obj.video.s3_key if hasattr(obj, "video") else None
+
+
+class SellerPropertyListSerializer(CoverImageMixin, serializers.ModelSerializer):
     cover_image = serializers.SerializerMethodField()
+    cover_thumbnail = serializers.SerializerMethodField()
+    cover_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = Property
@@ -121,17 +195,11 @@ class SellerPropertyListSerializer(serializers.ModelSerializer):
             "status",
             "is_active",
             "cover_image",
+            "cover_thumbnail",
+            "cover_srcset",
             "created_at",
         ]
 
-    def get_cover_image(self, obj):
-        image = obj.images.first()
-        if not image:
-            return None
-
-        # S3 storage already returns full URL, no need for build_absolute_uri
-        return image.image.url
-
 
 class PropertyUpdateSerializer(serializers.ModelSerializer):
     images = serializers.ListField(
@@ -140,14 +208,16 @@ class PropertyUpdateSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Property
-        exclude = ["seller", "created_at", "updated_at"]
+        exclude = ["seller", "created_at", "updated_at", "search_vector", "geo_cell"]
 
     def update(self, instance, validated_data):
         images = validated_data.pop("images", [])
 
         instance = super().update(instance, validated_data)
 
-        for img in images:
-            PropertyImage.objects.create(property=instance, image=img)
+        # Imported here because images -> cache -> serializers
+        from .images import save_property_images
+
+        save_property_images(instance, images)
 
         return instance
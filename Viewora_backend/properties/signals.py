@@ -1,27 +1,48 @@
-import os
-
-import requests
+from django.db import transaction
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from .models import Property
+from .ai_sync import queue_ai_sync
+from .cache import invalidate_property_detail
+from .images import enqueue_image_variants
+from .models import Property, PropertyImage, PropertyVideo
 
 
 @receiver(post_save, sender=Property)
 @receiver(post_delete, sender=Property)
-def trigger_ai_sync(sender, instance, **kwargs):
+def trigger_ai_sync(sender, instance, signal, update_fields=None, **kwargs):
     """
-    Automatically trigger a sync of the AI RAG index when a property is changed
+    Tell the AI service which property changed, once the write is committed.
+    Only a change notice is queued here; send_ai_sync_task ships them in
+    batches, so saving a property never waits on the AI service. Saves that
+    leave every AI_INDEXED_FIELDS value as it was are skipped.
     """
-    try:
-        # We call the gateway endpoint directly if possible, or the internal AI service
-        # It's safer to call the internal AI service URL directly from the backend
-        ai_service_url = os.getenv("AI_SERVICE_URL", "http://ai_service:8001")
-        print(f" AI Sync Triggered by {instance.id}")
-
-        # We don't want to block the request, so we should ideally use a task (Celery)
-        # But for now, we'll do a simple request with a short timeout
-        requests.post(f"{ai_service_url}/ai/sync", timeout=5)
-
-    except Exception as e:
-        print(f" Failed to trigger AI sync: {e}")
+    if signal is post_save:
+        if not instance.ai_index_changed(update_fields):
+            return
+        instance.remember_ai_indexed_values(update_fields)
+
+    property_id = instance.id
+    operation = "delete" if signal is post_delete else "upsert"
+    transaction.on_commit(lambda: queue_ai_sync(property_id, operation))
+
+
+@receiver(post_save, sender=Property)
+@receiver(post_delete, sender=Property)
+def invalidate_property_cache(sender, instance, **kwargs):
+    invalidate_property_detail(instance.id)
+
+
+@receiver(post_save, sender=PropertyImage)
+@receiver(post_delete, sender=PropertyImage)
+@receiver(post_save, sender=PropertyVideo)
+@receiver(post_delete, sender=PropertyVideo)
+def invalidate_property_media_cache(sender, instance, **kwargs):
+    invalidate_property_detail(instance.property_id)
+
+
+@receiver(post_save, sender=PropertyImage)
+def queue_image_variants(sender, instance, created, **kwargs):
+    # Bulk uploads queue their own variants in attach_property_images
+    if created:
+        transaction.on_commit(lambda: enqueue_image_variants([instance.id]))
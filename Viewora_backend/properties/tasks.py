@@ -2,7 +2,6 @@
 import logging
 
 from celery import shared_task
-from django.db.models import F
 
 from utils.dynamodb import record_property_view  # dynamodb
 
@@ -13,13 +12,78 @@ logger = logging.getLogger("viewora")
 
 @shared_task
 def record_property_view_task(property_id, city, locality):
-    #  Record in DynamoDB (Existing)
-    record_property_view(property_id, city, locality)
+    # Imported here because view_counter falls back to this task
+    from .view_counter import increment_view_counts
 
-    #  Increment in PostgreSQL (New)
+    #  Increment in PostgreSQL first; the new count seeds the DynamoDB total
+    view_count = None
     try:
-        Property.objects.filter(id=property_id).update(view_count=F("view_count") + 1)
+        view_count = increment_view_counts({int(property_id): 1}).get(int(property_id))
     except Exception as e:
         logger.error(
             f"[CELERY] Failed to increment view_count for property {property_id}: {e}"
         )
+
+    #  Record in DynamoDB (the total item is left alone if Postgres failed)
+    record_property_view(property_id, city, locality, total_views=view_count)
+
+
+@shared_task
+def flush_property_views_task():
+    # Imported here because view_counter falls back to the task above
+    from .view_counter import flush_views
+
+    views, properties, items = flush_views()
+    if views:
+        logger.info(
+            f"[CELERY BEAT] Flushed {views} views for {properties} properties "
+            f"({items} DynamoDB items)"
+        )
+
+
+@shared_task
+def generate_image_variants_task(image_id):
+    # Imported here because images queues this task
+    from .images import generate_image_variants
+
+    try:
+        generate_image_variants(image_id)
+    except Exception as e:
+        logger.error(f"[CELERY] Failed to build variants for image {image_id}: {e}")
+
+
+@shared_task(bind=True)
+def send_ai_sync_task(self, changes=None):
+    """
+    Ship property change notices to the AI service: the given
+    {property_id: operation} changes, or everything collected in Redis.
+    Failed sends are retried with an exponential backoff.
+    """
+    # Imported here because ai_sync queues this task
+    from .ai_sync import (
+        AI_SYNC_MAX_RETRIES,
+        post_changes,
+        retry_countdown,
+        send_pending_changes,
+    )
+
+    try:
+        if changes is not None:
+            post_changes(changes)
+            sent = len(changes)
+        else:
+            sent = send_pending_changes()
+    except Exception as e:
+        retries = self.request.retries
+        if retries >= AI_SYNC_MAX_RETRIES:
+            # The changes stay pending for the next property write
+            logger.error(f"[CELERY] Giving up on AI sync after {retries} retries: {e}")
+            return
+        countdown = retry_countdown(retries)
+        logger.warning(
+            f"[CELERY] Failed to send AI sync, retrying in {countdown}s: {e}"
+        )
+        raise self.retry(countdown=countdown, max_retries=AI_SYNC_MAX_RETRIES)
+
+    if sent:
+        logger.info(f"[CELERY] Sent {sent} property changes to the AI service")
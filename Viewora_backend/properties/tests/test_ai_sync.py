@@ -0,0 +1,226 @@
+import re
+from pathlib import Path
+from unittest import mock, skipUnless
+
+from celery.exceptions import Retry
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from properties.ai_sync import (
+    AI_SYNC_MAX_BACKOFF,
+    AI_SYNC_MAX_RETRIES,
+    PENDING_KEY,
+    SCHEDULED_KEY,
+    SENDING_KEY,
+    queue_ai_sync,
+    send_pending_changes,
+)
+from properties.models import Property
+from properties.tasks import send_ai_sync_task
+from utils.redis_client import get_redis
+
+User = get_user_model()
+
+
+@skipUnless(settings.USE_REDIS, "debounced AI sync needs Redis")
+@mock.patch("properties.ai_sync.send_ai_sync_task")
+class DebouncedAISyncTest(TestCase):
+
+    def setUp(self):
+        self.clear_redis()
+
+    def tearDown(self):
+        self.clear_redis()
+
+    def clear_redis(self):
+        get_redis().delete(PENDING_KEY, SENDING_KEY, SCHEDULED_KEY)
+
+    @mock.patch("properties.ai_sync.post_changes")
+    def test_burst_of_changes_is_sent_once(self, post_changes, sync_task):
+        queue_ai_sync(1, "upsert")
+        queue_ai_sync(2, "upsert")
+        queue_ai_sync(1, "delete")
+
+        sync_task.apply_async.assert_called_once()
+        self.assertEqual(send_pending_changes(), 2)
+        post_changes.assert_called_once_with({"1": "delete", "2": "upsert"})
+
+        self.assertEqual(send_pending_changes(), 0)
+        post_changes.assert_called_once()
+
+    @mock.patch("properties.ai_sync.post_changes")
+    def test_failed_send_is_queued_again(self, post_changes, sync_task):
+        queue_ai_sync(1, "upsert")
+        queue_ai_sync(2, "upsert")
+
+        def fail(changes):
+            # property 2 is deleted while the batch is in flight
+            queue_ai_sync(2, "delete")
+            raise ConnectionError
+
+        post_changes.side_effect = fail
+        with self.assertRaises(ConnectionError):
+            send_pending_changes()
+
+        client = get_redis()
+        self.assertEqual(client.hgetall(PENDING_KEY), {"1": "upsert", "2": "delete"})
+        self.assertFalse(client.exists(SENDING_KEY))
+        # The task's retry sends them, so a change made during the backoff
+        # does not schedule another send
+        self.assertEqual(sync_task.apply_async.call_count, 2)
+        self.assertTrue(client.exists(SCHEDULED_KEY))
+        queue_ai_sync(3, "upsert")
+        self.assertEqual(sync_task.apply_async.call_count, 2)
+
+    @mock.patch("properties.ai_sync.post_changes")
+    def test_changes_after_leftover_batch_are_rescheduled(
+        self, post_changes, sync_task
+    ):
+        queue_ai_sync(1, "upsert")
+        get_redis().rename(PENDING_KEY, SENDING_KEY)
+        queue_ai_sync(2, "upsert")
+
+        self.assertEqual(send_pending_changes(), 1)
+        post_changes.assert_called_once_with({"1": "upsert"})
+        self.assertEqual(sync_task.apply_async.call_count, 2)
+
+
+class AISyncSignalTest(TestCase):
+
+    def setUp(self):
+        seller = User.objects.create_user(username="seller", password="pass123")
+        self.property = Property.objects.create(
+            seller=seller,
+            title="A",
+            description="Nice",
+            property_type="house",
+            price=1000000,
+            area_size=1000,
+            city="Kochi",
+            locality="Kaloor",
+            address="Some address",
+        )
+
+    @mock.patch("properties.signals.queue_ai_sync")
+    def test_sync_is_queued_after_commit(self, queue):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.property.price = 2000000
+            self.property.save()
+            queue.assert_not_called()
+        queue.assert_called_once_with(self.property.id, "upsert")
+
+        property_id = self.property.id
+        with self.captureOnCommitCallbacks(execute=True):
+            self.property.delete()
+        queue.assert_called_with(property_id, "delete")
+
+    @mock.patch("properties.signals.queue_ai_sync")
+    def test_only_indexed_field_changes_are_queued(self, queue):
+        prop = Property.objects.get(id=self.property.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            prop.interest_count = 3
+            prop.save(update_fields=["interest_count"])
+            prop.title = "Renamed"
+            prop.save()
+            prop.is_active = True
+            prop.save(update_fields=["is_active"])
+        queue.assert_not_called()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            prop.locality = "Edappally"
+            prop.save()
+            # the same values saved again are not sent twice
+            prop.save()
+        queue.assert_called_once_with(prop.id, "upsert")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            prop.status = "archived"
+            prop.is_active = False
+            prop.save(update_fields=["is_active", "status"])
+        self.assertEqual(queue.call_count, 2)
+
+    @mock.patch("properties.signals.queue_ai_sync")
+    def test_deferred_fields_are_compared_when_assigned(self, queue):
+        prop = Property.objects.only("id", "title").get(id=self.property.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            prop.title = "Renamed"
+            prop.save()
+        queue.assert_not_called()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            prop.city = "Thrissur"
+            prop.save()
+        queue.assert_called_once_with(prop.id, "upsert")
+
+    @mock.patch("properties.signals.queue_ai_sync")
+    def test_partial_save_keeps_unsaved_edits_pending(self, queue):
+        prop = Property.objects.get(id=self.property.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            prop.city = "Thrissur"
+            prop.price = 2000000
+            prop.save(update_fields=["price"])
+        queue.assert_called_once_with(prop.id, "upsert")
+
+        # city was not written above, so saving it now is still a change
+        with self.captureOnCommitCallbacks(execute=True):
+            prop.save(update_fields=["city"])
+        self.assertEqual(queue.call_count, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            prop.save()
+        self.assertEqual(queue.call_count, 2)
+
+    @override_settings(USE_REDIS=False)
+    @mock.patch("properties.ai_sync.send_ai_sync_task")
+    def test_falls_back_to_task_per_change(self, sync_task):
+        queue_ai_sync(5, "upsert")
+        sync_task.delay.assert_called_once_with({"5": "upsert"})
+
+
+@mock.patch("properties.ai_sync.post_changes", side_effect=ConnectionError)
+class AISyncRetryTest(SimpleTestCase):
+
+    def send(self, retries):
+        send_ai_sync_task.push_request(retries=retries)
+        try:
+            return send_ai_sync_task.run({"1": "upsert"})
+        finally:
+            send_ai_sync_task.pop_request()
+
+    @mock.patch.object(send_ai_sync_task, "retry", side_effect=Retry)
+    def test_failed_send_backs_off_exponentially(self, retry, post_changes):
+        countdowns = []
+        for retries in range(AI_SYNC_MAX_RETRIES):
+            with self.assertRaises(Retry):
+                self.send(retries)
+            countdowns.append(retry.call_args.kwargs["countdown"])
+
+        self.assertEqual(countdowns, [10, 20, 40, 80, 160, AI_SYNC_MAX_BACKOFF])
+        retry.assert_called_with(
+            countdown=AI_SYNC_MAX_BACKOFF, max_retries=AI_SYNC_MAX_RETRIES
+        )
+
+    @mock.patch.object(send_ai_sync_task, "retry", side_effect=Retry)
+    def test_gives_up_after_the_last_retry(self, retry, post_changes):
+        self.assertIsNone(self.send(AI_SYNC_MAX_RETRIES))
+        retry.assert_not_called()
+
+
+AI_INDEXER = (
+    Path(settings.BASE_DIR).parent / "Viewora_ai_service" / "app" / "rag" / "indexer.py"
+)
+
+
+@skipUnless(AI_INDEXER.exists(), "needs the AI service source next to the backend")
+class PropertyAIIndexedFieldsTest(SimpleTestCase):
+
+    def test_matches_the_columns_the_ai_service_reads(self):
+        source = AI_INDEXER.read_text()
+        columns = re.search(r'PROPERTY_COLUMNS = """(.*?)"""', source, re.S).group(1)
+        published = re.search(r'PUBLISHED = "(.*?)"', source).group(1)
+
+        # "property_type as type" reads the property_type field
+        read = {column.split()[0] for column in columns.split(",")}
+        read |= set(re.findall(r"(\w+) =", published))
+        self.assertEqual(read - {"id", "updated_at"}, set(Property.AI_INDEXED_FIELDS))
@@ -0,0 +1,267 @@
+import io
+from datetime import date, timedelta
+from unittest import mock, skipUnless
+
+from botocore.exceptions import ClientError
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from properties.models import Property
+from properties.tasks import record_property_view_task
+from properties.view_counter import (
+    DAILY_KEY,
+    FLUSH_LOCK_KEY,
+    FLUSHING_KEY,
+    PENDING_KEY,
+    SEEN_KEY,
+    VIEWERS_KEY,
+    flush_views,
+    record_view,
+    unique_viewers,
+)
+from utils.dynamodb import set_total
+from utils.redis_client import get_redis
+
+User = get_user_model()
+
+
+@skipUnless(settings.USE_REDIS, "view buffering needs Redis")
+class BufferedViewCounterTest(TestCase):
+
+    def setUp(self):
+        self.daily_key = DAILY_KEY.format(date=date.today().isoformat())
+        self.clear_redis()
+
+        seller = User.objects.create_user(username="seller", password="pass123")
+        defaults = {
+            "description": "Nice",
+            "property_type": "house",
+            "price": 1000000,
+            "area_size": 1000,
+            "city": "Kochi",
+            "locality": "Kaloor",
+            "address": "Some address",
+        }
+        self.first = Property.objects.create(seller=seller, title="A", **defaults)
+        self.second = Property.objects.create(seller=seller, title="B", **defaults)
+
+    def tearDown(self):
+        self.clear_redis()
+
+    def clear_redis(self):
+        client = get_redis()
+        client.delete(PENDING_KEY, FLUSHING_KEY, FLUSH_LOCK_KEY, self.daily_key)
+        for pattern in (SEEN_KEY, VIEWERS_KEY):
+            for key in client.scan_iter(pattern.format(property_id="*", date="*")):
+                client.delete(key)
+
+    def test_flush_writes_aggregated_counts(self):
+        for viewer_id in range(3):
+            record_view(self.first.id, "Kochi", "Kaloor", viewer_id)
+        record_view(self.second.id, "Kochi", "Kaloor", 0)
+
+        self.assertEqual(flush_views(write_dynamo=False), (4, 2, 0))
+        self.assertEqual(flush_views(write_dynamo=False), (0, 0, 0))
+
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual(self.first.view_count, 3)
+        self.assertEqual(self.second.view_count, 1)
+
+    @mock.patch("properties.view_counter.record_property_view_totals")
+    def test_dynamo_receives_daily_totals(self, record_totals):
+        record_view(self.first.id, "Kochi", "Kaloor", 1)
+        flush_views()
+        record_view(self.first.id, "Kochi", "Kaloor", 2)
+        flush_views()
+
+        items = record_totals.call_args.args[0]
+        self.assertEqual(
+            items,
+            [
+                {
+                    "property_id": self.first.id,
+                    "date": date.today().isoformat(),
+                    "view_count": 2,
+                    "city": "Kochi",
+                    "locality": "Kaloor",
+                }
+            ],
+        )
+        self.assertEqual(record_totals.call_args.args[1], {self.first.id: 2})
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.view_count, 2)
+
+    def test_leftover_batch_is_flushed_first(self):
+        record_view(self.first.id, "Kochi", "Kaloor", 1)
+        get_redis().rename(PENDING_KEY, FLUSHING_KEY)
+        record_view(self.second.id, "Kochi", "Kaloor", 1)
+
+        self.assertEqual(flush_views(write_dynamo=False), (1, 1, 0))
+        self.assertEqual(flush_views(write_dynamo=False), (1, 1, 0))
+
+    def test_batch_is_applied_once_when_flush_dies_before_clearing_it(self):
+        record_view(self.first.id, "Kochi", "Kaloor", 1)
+        record_view(self.first.id, "Kochi", "Kaloor", 2)
+
+        client = get_redis()
+        with mock.patch.object(client, "delete", side_effect=ConnectionError):
+            with self.assertRaises(ConnectionError):
+                flush_views(write_dynamo=False)
+        self.assertTrue(client.exists(FLUSHING_KEY))
+
+        # The retry finds the same batch and only clears it
+        flush_views(write_dynamo=False)
+        self.assertFalse(client.exists(FLUSHING_KEY))
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.view_count, 2)
+
+    def test_only_one_flush_runs_at_a_time(self):
+        record_view(self.first.id, "Kochi", "Kaloor", 1)
+        client = get_redis()
+        client.set(FLUSH_LOCK_KEY, "other-flush")
+
+        self.assertEqual(flush_views(write_dynamo=False), (0, 0, 0))
+        self.assertEqual(client.get(FLUSH_LOCK_KEY), "other-flush")
+
+        client.delete(FLUSH_LOCK_KEY)
+        self.assertEqual(flush_views(write_dynamo=False), (1, 1, 0))
+        self.assertIsNone(client.get(FLUSH_LOCK_KEY))
+
+    def test_repeat_views_are_not_counted(self):
+        self.assertTrue(record_view(self.first.id, "Kochi", "Kaloor", 1))
+        self.assertFalse(record_view(self.first.id, "Kochi", "Kaloor", 1))
+        self.assertTrue(record_view(self.first.id, "Kochi", "Kaloor", 2))
+        self.assertTrue(record_view(self.second.id, "Kochi", "Kaloor", 1))
+
+        self.assertEqual(flush_views(write_dynamo=False), (3, 2, 0))
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.view_count, 2)
+
+    def test_every_new_viewer_is_counted(self):
+        # A HyperLogLog check drops some of these as false repeats
+        counted = sum(
+            record_view(self.first.id, "Kochi", "Kaloor", viewer_id)
+            for viewer_id in range(2000)
+        )
+        self.assertEqual(counted, 2000)
+        self.assertFalse(record_view(self.first.id, "Kochi", "Kaloor", 1999))
+
+    def test_unique_viewer_estimates(self):
+        client = get_redis()
+        yesterday = (date.today() - timedelta(days=1)).isoformat()
+        client.pfadd(
+            VIEWERS_KEY.format(property_id=self.first.id, date=yesterday), 1, 2
+        )
+        record_view(self.first.id, "Kochi", "Kaloor", 2)
+        record_view(self.first.id, "Kochi", "Kaloor", 3)
+
+        total, daily = unique_viewers(self.first.id, days=2)
+
+        self.assertEqual(total, 3)
+        self.assertEqual(daily, [(date.today().isoformat(), 2), (yesterday, 2)])
+
+
+class UnbufferedViewCounterTest(TestCase):
+
+    @override_settings(USE_REDIS=False)
+    @mock.patch("properties.view_counter.record_property_view_task")
+    def test_falls_back_to_task_per_view(self, view_task):
+        cache.clear()
+        self.assertTrue(record_view(1, "Kochi", "Kaloor", 7))
+        self.assertFalse(record_view(1, "Kochi", "Kaloor", 7))
+        view_task.delay.assert_called_once_with(1, "Kochi", "Kaloor")
+        self.assertIsNone(unique_viewers(1))
+
+
+class RecordPropertyViewTaskTest(TestCase):
+
+    @mock.patch("properties.tasks.record_property_view")
+    def test_seeds_dynamodb_total_from_postgres(self, record_property_view):
+        seller = User.objects.create_user(username="seller", password="pass123")
+        prop = Property.objects.create(
+            seller=seller,
+            title="A",
+            description="Nice",
+            property_type="house",
+            price=1000000,
+            area_size=1000,
+            city="Kochi",
+            locality="Kaloor",
+            address="Some address",
+            view_count=41,
+        )
+
+        record_property_view_task(prop.id, "Kochi", "Kaloor")
+
+        prop.refresh_from_db()
+        self.assertEqual(prop.view_count, 42)
+        record_property_view.assert_called_once_with(
+            prop.id, "Kochi", "Kaloor", total_views=42
+        )
+
+
+class DynamoTotalsTest(TestCase):
+
+    def test_total_is_only_raised(self):
+        table = mock.Mock()
+        self.assertTrue(set_total(table, "date", "view_count", 5, 42))
+        kwargs = table.update_item.call_args.kwargs
+        self.assertEqual(kwargs["Key"], {"property_id": "5", "date": "total"})
+        self.assertIn("#total < :total", kwargs["ConditionExpression"])
+
+        # A concurrent writer already stored a newer, larger total
+        table.update_item.side_effect = ClientError(
+            {"Error": {"Code": "ConditionalCheckFailedException"}}, "UpdateItem"
+        )
+        self.assertFalse(set_total(table, "date", "view_count", 5, 41))
+
+        table.update_item.side_effect = ClientError(
+            {"Error": {"Code": "ProvisionedThroughputExceededException"}}, "UpdateItem"
+        )
+        with self.assertRaises(ClientError):
+            set_total(table, "date", "view_count", 5, 43)
+
+    @mock.patch(
+        "properties.management.commands.backfill_dynamo_totals.set_interest_total",
+        return_value=True,
+    )
+    @mock.patch(
+        "properties.management.commands.backfill_dynamo_totals.set_view_total",
+        side_effect=[True, False],
+    )
+    def test_backfill_writes_totals_of_published_properties(
+        self, set_view_total, set_interest_total
+    ):
+        seller = User.objects.create_user(username="seller", password="pass123")
+        defaults = {
+            "seller": seller,
+            "description": "Nice",
+            "property_type": "house",
+            "price": 1000000,
+            "area_size": 1000,
+            "city": "Kochi",
+            "locality": "Kaloor",
+            "address": "Some address",
+        }
+        first = Property.objects.create(
+            title="A", view_count=10, interest_count=2, **defaults
+        )
+        second = Property.objects.create(title="B", view_count=3, **defaults)
+        Property.objects.create(title="C", status="archived", **defaults)
+
+        out = io.StringIO()
+        call_command("backfill_dynamo_totals", stdout=out)
+
+        self.assertEqual(
+            set_view_total.call_args_list,
+            [mock.call(first.id, 10), mock.call(second.id, 3)],
+        )
+        self.assertEqual(
+            set_interest_total.call_args_list,
+            [mock.call(first.id, 2), mock.call(second.id, 0)],
+        )
+        self.assertIn("1 view totals and 2 interest totals", out.getvalue())
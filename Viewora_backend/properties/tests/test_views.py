@@ -1,9 +1,21 @@
+import io
+from unittest import mock
+
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
 from rest_framework import status
 from rest_framework.test import APITestCase
 
 from authentication.models import Profile
-from properties.models import Property
+from interests.models import PropertyInterest
+from properties.images import generate_image_variants, save_property_images
+from properties.models import Property, PropertyImage, PropertyVideo
 
 User = get_user_model()
 
@@ -103,6 +115,299 @@ class PropertyListViewTest(BasePropertyTestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data["results"]), 1)
 
+    def test_list_query_count_is_independent_of_page_size(self):
+        seller = self.create_seller()
+        client = self.create_client()
+
+        interests = []
+        for i in range(6):
+            prop = self.create_property(seller, title=f"Property {i}")
+            PropertyImage.objects.create(
+                property=prop, image=f"property_images/{i}a.jpg"
+            )
+            PropertyImage.objects.create(
+                property=prop, image=f"property_images/{i}b.jpg"
+            )
+            if i % 2 == 0:
+                interests.append(PropertyInterest(property=prop, client=client))
+        # bulk_create skips the post_save signal that enqueues Celery tasks
+        PropertyInterest.objects.bulk_create(interests)
+
+        self.client.force_authenticate(user=client)
+
+        def count_queries(page_size):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(
+                    "/api/properties/view/", {"page_size": page_size}
+                )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data["results"]), page_size)
+            return len(ctx.captured_queries), response.data["results"]
+
+        small, _ = count_queries(1)
+        large, results = count_queries(6)
+
+        self.assertEqual(small, large)
+        for item in results:
+            index = item["title"].split()[-1]
+            self.assertEqual(item["seller"], "seller")
+            self.assertEqual(item["is_interested"], int(index) % 2 == 0)
+            self.assertTrue(
+                item["cover_image"].endswith(f"property_images/{index}a.jpg")
+            )
+
+    def test_cursor_pagination_walks_all_pages_without_count(self):
+        seller = self.create_seller()
+        for i in range(5):
+            self.create_property(seller, title=f"Property {i}", price=1000 + i)
+
+        self.client.force_authenticate(user=seller)
+        response = self.client.get(
+            "/api/properties/view/",
+            {"pagination": "cursor", "page_size": 2, "ordering": "price"},
+        )
+
+        prices = []
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            prices += [float(item["price"]) for item in response.data["results"]]
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+
+        self.assertEqual(prices, [1000, 1001, 1002, 1003, 1004])
+
+    def walk_cursor(self, **params):
+        response = self.client.get(
+            "/api/properties/view/", {"pagination": "cursor", **params}
+        )
+        ids = []
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [item["id"] for item in response.data["results"]]
+            if not response.data["next"]:
+                return ids, response
+            response = self.client.get(response.data["next"])
+
+    @mock.patch("properties.pagination.PropertyCursorPagination.offset_cutoff", 3)
+    def test_cursor_pagination_pages_through_ties(self):
+        seller = self.create_seller()
+        properties = Property.objects.bulk_create(
+            Property(
+                seller=seller,
+                title=f"Property {i}",
+                description="Nice property",
+                property_type="house",
+                price=1000,
+                area_size=1000,
+                city="Kochi",
+                locality="Kaloor",
+                address="Some address",
+                status="published",
+                is_active=True,
+            )
+            for i in range(12)
+        )
+        expected = sorted((p.id for p in properties), reverse=True)
+
+        self.client.force_authenticate(user=seller)
+        # Every row has view_count 0, more than page_size and offset_cutoff
+        ids, last = self.walk_cursor(ordering="-view_count", page_size=5)
+        self.assertEqual(ids, expected)
+
+        previous = self.client.get(last.data["previous"])
+        self.assertEqual(
+            [item["id"] for item in previous.data["results"]], expected[5:10]
+        )
+
+        ids, _ = self.walk_cursor(ordering="price", page_size=5)
+        self.assertEqual(ids, expected[::-1])
+
+    def test_cursor_pagination_rejects_tampered_cursor(self):
+        seller = self.create_seller()
+        self.client.force_authenticate(user=seller)
+        # position "1:not-a-price"
+        response = self.client.get(
+            "/api/properties/view/",
+            {"ordering": "price", "cursor": "cD0xJTNBbm90LWEtcHJpY2U="},
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def search(self, term, **params):
+        response = self.client.get("/api/properties/view/", {"search": term, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item["title"] for item in response.data["results"]]
+
+    def test_search_matches_prefixes_and_typos(self):
+        seller = self.create_seller()
+        self.create_property(
+            seller, title="Villa", city="Palakkad", locality="Olavakkode"
+        )
+        self.create_property(
+            seller,
+            title="Apartment",
+            locality="Kakkanad",
+            description="Furnished flat near Infopark",
+        )
+
+        self.client.force_authenticate(user=seller)
+
+        self.assertEqual(self.search("kakka"), ["Apartment"])
+        self.assertEqual(self.search("infopa"), ["Apartment"])
+        self.assertEqual(self.search("Palakad"), ["Villa"])
+        self.assertEqual(self.search("bungalow"), [])
+
+    def test_search_orders_by_rank_unless_ordering_given(self):
+        seller = self.create_seller()
+        self.create_property(
+            seller, title="Flat", description="Close to a lake view", price=200
+        )
+        self.create_property(seller, title="Lake view villa", price=100)
+
+        self.client.force_authenticate(user=seller)
+
+        self.assertEqual(self.search("lake view"), ["Lake view villa", "Flat"])
+        self.assertEqual(
+            self.search("lake view", ordering="-price"), ["Flat", "Lake view villa"]
+        )
+
+
+# -------------------------
+# FACETS
+# -------------------------
+class PropertyFacetsTest(BasePropertyTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.seller = self.create_seller()
+        self.create_property(
+            self.seller, property_type="flat", bedrooms=2, price=2_000_000
+        )
+        self.create_property(
+            self.seller, property_type="flat", bedrooms=3, price=6_000_000
+        )
+        self.create_property(
+            self.seller,
+            city="Palakkad",
+            property_type="house",
+            bedrooms=3,
+            price=6_500_000,
+        )
+        self.create_property(self.seller, property_type="plot", price=30_000_000)
+        self.client.force_authenticate(user=self.seller)
+
+    def test_facets_counts_for_filtered_set(self):
+        response = self.client.get(
+            "/api/properties/view/", {"facets": "true", "min_price": 3_000_000}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        facets = response.data["facets"]
+        self.assertEqual(
+            facets["city"],
+            [{"value": "Kochi", "count": 2}, {"value": "Palakkad", "count": 1}],
+        )
+        self.assertEqual(
+            facets["property_type"],
+            [
+                {"value": "flat", "count": 1},
+                {"value": "house", "count": 1},
+                {"value": "plot", "count": 1},
+            ],
+        )
+        self.assertEqual(facets["bedrooms"], [{"value": 3, "count": 2}])
+        self.assertEqual(
+            facets["price"],
+            [{"value": "50L-1Cr", "count": 2}, {"value": "2Cr+", "count": 1}],
+        )
+
+    def test_facets_cost_one_query_and_are_cached(self):
+        def count_queries(params):
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.get("/api/properties/view/", params)
+            return len(ctx.captured_queries)
+
+        plain = count_queries({"city": "Kochi"})
+        with_facets = count_queries({"city": "Kochi", "facets": "true"})
+        cached = count_queries({"city": "Kochi", "facets": "true", "page": 1})
+
+        self.assertEqual(with_facets, plain + 1)
+        self.assertEqual(cached, plain)
+
+    def test_facets_omitted_by_default(self):
+        response = self.client.get("/api/properties/view/")
+        self.assertNotIn("facets", response.data)
+
+
+# -------------------------
+# NEARBY PROPERTIES
+# -------------------------
+class PropertyNearbyViewTest(BasePropertyTestCase):
+
+    # Kochi; 0.009 degrees of latitude is roughly 1 km
+    LAT, LNG = 9.9312, 76.2673
+
+    def setUp(self):
+        self.seller = self.create_seller()
+        for title, km, bedrooms in [
+            ("1km", 1, 3),
+            ("4km", 4, 2),
+            ("8km", 8, 3),
+            ("30km", 30, 3),
+        ]:
+            self.create_property(
+                self.seller,
+                title=title,
+                bedrooms=bedrooms,
+                latitude=round(self.LAT + 0.009 * km, 6),
+                longitude=self.LNG,
+            )
+        self.create_property(self.seller, title="No location")
+        self.client.force_authenticate(user=self.seller)
+
+    def nearby(self, **params):
+        return self.client.get("/api/properties/view/nearby/", params)
+
+    def test_radius_search_sorted_by_distance(self):
+        response = self.nearby(lat=self.LAT, lng=self.LNG, radius_km=10)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual([item["title"] for item in results], ["1km", "4km", "8km"])
+        self.assertAlmostEqual(results[0]["distance_km"], 1.0, delta=0.05)
+
+    def test_radius_search_combines_with_list_filters(self):
+        response = self.nearby(lat=self.LAT, lng=self.LNG, radius_km=5, bedrooms=3)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["title"] for item in response.data["results"]], ["1km"])
+
+    def test_bounding_box_search(self):
+        response = self.nearby(
+            min_lat=self.LAT + 0.02,
+            max_lat=self.LAT + 0.1,
+            min_lng=self.LNG - 0.01,
+            max_lng=self.LNG + 0.01,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # sorted by distance from the centre of the box
+        self.assertEqual(
+            [item["title"] for item in response.data["results"]], ["8km", "4km"]
+        )
+
+    def test_invalid_coordinates_rejected(self):
+        self.assertEqual(
+            self.nearby(lat=120, lng=self.LNG).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+        self.assertEqual(
+            self.nearby(lat=self.LAT, lng=self.LNG, radius_km=500).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+        self.assertEqual(self.nearby().status_code, status.HTTP_400_BAD_REQUEST)
+
 
 # -------------------------
 # PROPERTY DETAIL
@@ -128,6 +433,85 @@ class PropertyDetailViewTest(BasePropertyTestCase):
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
 
+@mock.patch("properties.views.record_view")
+class PropertyDetailCacheTest(BasePropertyTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.seller = self.create_seller()
+        self.prop = self.create_property(self.seller, title="Cached")
+        self.url = f"/api/properties/view/{self.prop.id}/"
+
+    def test_cached_detail_costs_one_query(self, record_view):
+        client = self.create_client()
+        PropertyInterest.objects.bulk_create(
+            [PropertyInterest(property=self.prop, client=client)]
+        )
+        interest = PropertyInterest.objects.get()
+        self.client.force_authenticate(user=client)
+
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(response.data["title"], "Cached")
+        self.assertTrue(response.data["is_interested"])
+        self.assertEqual(response.data["active_interest_id"], interest.id)
+        self.assertIsNone(response.data["video_url"])
+        self.assertNotIn("video_key", response.data)
+        record_view.assert_called_with(self.prop.id, "Kochi", "Kaloor", client.id)
+
+    def test_interest_flags_are_per_user(self, record_view):
+        self.client.force_authenticate(user=self.seller)
+        self.client.get(self.url)
+
+        client = self.create_client()
+        PropertyInterest.objects.bulk_create(
+            [PropertyInterest(property=self.prop, client=client)]
+        )
+        self.client.force_authenticate(user=client)
+        self.assertTrue(self.client.get(self.url).data["is_interested"])
+
+        self.client.force_authenticate(user=self.seller)
+        response = self.client.get(self.url)
+        self.assertFalse(response.data["is_interested"])
+        self.assertIsNone(response.data["active_interest_id"])
+
+    def test_signed_video_url_is_reused(self, record_view):
+        PropertyVideo.objects.create(
+            property=self.prop,
+            s3_key="property_videos/1/tour.mp4",
+            video_url="https://example.com/tour.mp4",
+        )
+        self.client.force_authenticate(user=self.seller)
+
+        first = self.client.get(self.url).data["video_url"]
+        second = self.client.get(self.url).data["video_url"]
+
+        self.assertIn("property_videos/1/tour.mp4", first)
+        self.assertIn("Signature=", first)
+        self.assertEqual(first, second)
+
+    def test_changes_invalidate_cached_payload(self, record_view):
+        self.client.force_authenticate(user=self.seller)
+        self.client.get(self.url)
+
+        self.prop.title = "Renamed"
+        self.prop.save()
+        self.assertEqual(self.client.get(self.url).data["title"], "Renamed")
+
+        PropertyImage.objects.create(property=self.prop, image="property_images/a.jpg")
+        self.assertEqual(len(self.client.get(self.url).data["images"]), 1)
+
+        self.prop.is_active = False
+        self.prop.status = "archived"
+        self.prop.save(update_fields=["is_active", "status"])
+        self.assertEqual(
+            self.client.get(self.url).status_code, status.HTTP_404_NOT_FOUND
+        )
+
+
 # -------------------------
 # SELLER OWN PROPERTIES
 # -------------------------
@@ -147,6 +531,24 @@ class SellerPropertyViewsTest(BasePropertyTestCase):
         self.assertEqual(len(response.data), 1)
         self.assertEqual(response.data[0]["title"], "Mine")
 
+    @mock.patch("properties.views.unique_viewers", return_value=(3, []))
+    def test_viewers_only_for_own_property(self, unique_viewers):
+        seller = self.create_seller("s1")
+        prop = self.create_property(self.create_seller("s2"))
+        url = f"/api/properties/seller/property/{prop.id}/viewers/"
+
+        self.client.force_authenticate(user=seller)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+        self.client.force_authenticate(user=prop.seller)
+        response = self.client.get(url, {"days": 14})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["unique_viewers"], 3)
+        unique_viewers.assert_called_once_with(prop.id, 14)
+
+        response = self.client.get(url, {"days": 90})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
 
 # -------------------------
 # TOGGLE ARCHIVE
@@ -167,3 +569,170 @@ class SellerPropertyToggleArchiveTest(BasePropertyTestCase):
         prop.refresh_from_db()
         self.assertFalse(prop.is_active)
         self.assertEqual(prop.status, "archived")
+
+
+# -------------------------
+# PROPERTY IMAGES
+# -------------------------
+@override_settings(
+    STORAGES={
+        "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        },
+    }
+)
+class PropertyImageUploadTest(BasePropertyTestCase):
+
+    def setUp(self):
+        self.seller = self.create_seller()
+        self.prop = self.create_property(self.seller)
+        self.client.force_authenticate(user=self.seller)
+
+    def make_image(self, name):
+        buffer = io.BytesIO()
+        Image.new("RGB", (4, 4)).save(buffer, format="PNG")
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+    def image_inserts(self, queries):
+        table = PropertyImage._meta.db_table
+        return [
+            query
+            for query in queries
+            if query["sql"].startswith(f'INSERT INTO "{table}"')
+        ]
+
+    def test_create_uploads_images_in_one_insert(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                "/api/properties/create/",
+                {
+                    "title": "Flat",
+                    "description": "Nice",
+                    "property_type": "flat",
+                    "price": 3000000,
+                    "area_size": 900,
+                    "city": "Kochi",
+                    "locality": "Kaloor",
+                    "address": "Some address",
+                    "images": [self.make_image(f"{i}.png") for i in range(3)],
+                },
+                format="multipart",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        images = PropertyImage.objects.filter(property_id=response.data["id"])
+        self.assertEqual(images.count(), 3)
+        self.assertEqual(len(self.image_inserts(ctx.captured_queries)), 1)
+        for image in images:
+            self.assertTrue(image.image.storage.exists(image.image.name))
+
+    def test_update_uploads_images(self):
+        response = self.client.patch(
+            f"/api/properties/seller/property/{self.prop.id}/update/",
+            {"images": [self.make_image("a.png"), self.make_image("b.png")]},
+            format="multipart",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.prop.images.count(), 2)
+
+    @mock.patch(
+        "properties.views.generate_presigned_upload_url", return_value="https://s3"
+    )
+    def test_presign_then_attach(self, presign):
+        response = self.client.post(
+            f"/api/properties/seller/property/{self.prop.id}/images/presign/",
+            {
+                "files": [
+                    {"file_name": "front.JPG", "content_type": "image/jpeg"},
+                    {"file_name": "back.png", "content_type": "image/png"},
+                ]
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        keys = [upload["key"] for upload in response.data["uploads"]]
+        self.assertTrue(keys[0].startswith(f"property_images/{self.prop.id}/"))
+        self.assertTrue(keys[0].endswith(".jpg"))
+        self.assertEqual(presign.call_count, 2)
+        for key in keys:
+            self.upload_to_storage(key)
+
+        url = f"/api/properties/seller/property/{self.prop.id}/images/attach/"
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(url, {"keys": keys}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(self.image_inserts(ctx.captured_queries)), 1)
+
+        # Attaching the same keys again adds nothing
+        response = self.client.post(url, {"keys": keys}, format="json")
+        self.assertEqual(response.data, [])
+        self.assertEqual(self.prop.images.count(), 2)
+
+    def upload_to_storage(self, key, size=100):
+        # What the client's PUT to the presigned URL does
+        storage = PropertyImage._meta.get_field("image").storage
+        storage.save(key, ContentFile(b"x" * size))
+
+    def test_attach_rejects_keys_that_were_not_uploaded(self):
+        uploaded = f"property_images/{self.prop.id}/uploaded.png"
+        self.upload_to_storage(uploaded)
+        response = self.client.post(
+            f"/api/properties/seller/property/{self.prop.id}/images/attach/",
+            {"keys": [uploaded, f"property_images/{self.prop.id}/missing.png"]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("missing.png", str(response.data))
+        self.assertEqual(PropertyImage.objects.count(), 0)
+
+    @mock.patch("properties.views.MAX_IMAGE_BYTES", 1000)
+    def test_attach_rejects_oversized_uploads(self):
+        key = f"property_images/{self.prop.id}/huge.png"
+        self.upload_to_storage(key, size=1001)
+        response = self.client.post(
+            f"/api/properties/seller/property/{self.prop.id}/images/attach/",
+            {"keys": [key]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(PropertyImage.objects.count(), 0)
+
+    def test_presign_rejects_non_images(self):
+        response = self.client.post(
+            f"/api/properties/seller/property/{self.prop.id}/images/presign/",
+            {"files": [{"file_name": "a.pdf", "content_type": "application/pdf"}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_attach_rejects_foreign_keys(self):
+        other = self.create_property(self.seller)
+        response = self.client.post(
+            f"/api/properties/seller/property/{self.prop.id}/images/attach/",
+            {"keys": [f"property_images/{other.id}/abc.png"]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(PropertyImage.objects.count(), 0)
+
+    @mock.patch("properties.images.generate_image_variants_task")
+    def test_variants_are_queued_built_and_listed(self, variants_task):
+        buffer = io.BytesIO()
+        Image.new("RGB", (1000, 500)).save(buffer, format="PNG")
+        image = SimpleUploadedFile("wide.png", buffer.getvalue())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            (created,) = save_property_images(self.prop, [image])
+        variants_task.delay.assert_called_once_with(created.id)
+
+        variants = generate_image_variants(created.id)
+        self.assertEqual(sorted(variants["webp"]), ["320", "640"])
+
+        response = self.client.get("/api/properties/view/")
+        card = response.data["results"][0]
+        self.assertTrue(card["cover_thumbnail"].endswith("320.webp"))
+        self.assertIn("640.webp 640w", card["cover_srcset"]["webp"])
+        self.assertTrue(card["cover_image"].endswith(".png"))
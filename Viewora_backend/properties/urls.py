@@ -4,17 +4,22 @@ from .views import (
     PropertyAttachVideoView,
     PropertyCreateView,
     PropertyDetailView,
+    PropertyImageAttachView,
+    PropertyImagePresignView,
     PropertyListView,
+    PropertyNearbyView,
     PropertyVideoPresignView,
     SellerPropertyDetailView,
     SellerPropertyListView,
     SellerPropertyToggleArchiveView,
     SellerPropertyUpdateView,
+    SellerPropertyViewersView,
 )
 
 urlpatterns = [
     path("create/", PropertyCreateView.as_view()),
     path("view/", PropertyListView.as_view()),
+    path("view/nearby/", PropertyNearbyView.as_view()),
     path("view/<int:pk>/", PropertyDetailView.as_view()),
     path("seller/my-properties/", SellerPropertyListView.as_view()),
     path(
@@ -23,9 +28,18 @@ urlpatterns = [
     ),
     path("seller/property/<int:pk>/", SellerPropertyDetailView.as_view()),
     path("seller/property/<int:pk>/update/", SellerPropertyUpdateView.as_view()),
+    path("seller/property/<int:pk>/viewers/", SellerPropertyViewersView.as_view()),
     path("seller/property/<int:pk>/video/presign/", PropertyVideoPresignView.as_view()),
     path(
         "seller/property/<int:pk>/video/attach/",
         PropertyAttachVideoView.as_view(),
     ),
+    path(
+        "seller/property/<int:pk>/images/presign/",
+        PropertyImagePresignView.as_view(),
+    ),
+    path(
+        "seller/property/<int:pk>/images/attach/",
+        PropertyImageAttachView.as_view(),
+    ),
 ]
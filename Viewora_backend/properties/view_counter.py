@@ -0,0 +1,255 @@
+"""
+Buffered property view counting.
+
+With Redis enabled, a detail page view is one pipelined HINCRBY into Redis
+instead of a Celery task per view. Repeat views by the same user on the same
+day are dropped first, using an exact set of the day's viewers per property,
+and a HyperLogLog per property per day gives the unique-viewer estimates
+shown to sellers over longer windows. flush_property_views_task (Celery beat,
+every minute) drains the buffer and writes it out with one bulk UPDATE in
+Postgres and one DynamoDB batch write, so write volume follows the number
+of distinct properties viewed rather than the number of views.
+
+Only one flush runs at a time (FLUSH_LOCK_KEY), and each batch carries an id
+that is recorded in Postgres together with its UPDATE, so a batch is added
+to view_count exactly once even if a flush dies before clearing it.
+
+Without Redis (local development) repeat views are dropped through the
+Django cache and every counted view still goes through
+record_property_view_task.
+"""
+
+import logging
+import uuid
+from collections import defaultdict
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+from redis.exceptions import ResponseError
+
+from utils.dynamodb import record_property_view_totals
+from utils.redis_client import get_redis
+
+from .models import Property, PropertyViewFlush
+from .tasks import record_property_view_task
+
+logger = logging.getLogger("viewora")
+
+# field "<property_id>:<date>" -> views since the last flush
+PENDING_KEY = "property_views:pending"
+# the pending hash is renamed here while a flush is writing it out
+FLUSHING_KEY = "property_views:flushing"
+# field of FLUSHING_KEY holding the batch id
+BATCH_ID_FIELD = "batch"
+# held by the running flush
+FLUSH_LOCK_KEY = "property_views:flush_lock"
+FLUSH_LOCK_TTL = 5 * 60
+# applied batch ids are kept long enough to outlive any retried flush
+FLUSH_RECORD_RETENTION = timedelta(days=7)
+# field "<property_id>" -> views for the whole day (DynamoDB keeps daily totals)
+DAILY_KEY = "property_views:daily:{date}"
+DAILY_KEY_TTL = 60 * 60 * 48
+# SET of the user ids that viewed a property today, for the exact repeat check.
+# Integer ids below set-max-intset-entries (512) are stored as an intset at a
+# few bytes each; above that Redis uses a hash table at roughly 50-60 bytes
+# per viewer, so a million distinct (viewer, property) pairs in a day cost
+# about 60 MB until the key expires. The HyperLogLog below stays at most 12 KB
+# per property per day but may mistake a new viewer for a repeat one, which
+# would drop a real view.
+SEEN_KEY = "property_views:seen:{property_id}:{date}"
+SEEN_KEY_TTL = 60 * 60 * 24
+# HyperLogLog of the users who viewed a property on a day
+VIEWERS_KEY = "property_views:viewers:{property_id}:{date}"
+VIEWERS_RETENTION_DAYS = 30
+# cache key used instead of SEEN_KEY when Redis is disabled
+SEEN_CACHE_KEY = "property_view_seen:{date}:{property_id}:{viewer_id}"
+
+
+def record_view(property_id, city, locality, viewer_id):
+    """
+    Count a detail page view unless viewer_id already viewed the property
+    today. Returns True when the view was counted.
+    """
+    today = date.today().isoformat()
+
+    if not settings.USE_REDIS:
+        seen_key = SEEN_CACHE_KEY.format(
+            date=today, property_id=property_id, viewer_id=viewer_id
+        )
+        if not cache.add(seen_key, True, 60 * 60 * 24):
+            return False
+        record_property_view_task.delay(property_id, city, locality)
+        return True
+
+    client = get_redis()
+    seen_key = SEEN_KEY.format(property_id=property_id, date=today)
+    viewers_key = VIEWERS_KEY.format(property_id=property_id, date=today)
+
+    # SADD returns 0 only when the viewer really was seen today
+    pipe = client.pipeline(transaction=False)
+    pipe.sadd(seen_key, viewer_id)
+    pipe.expire(seen_key, SEEN_KEY_TTL)
+    pipe.pfadd(viewers_key, viewer_id)
+    pipe.expire(viewers_key, 60 * 60 * 24 * VIEWERS_RETENTION_DAYS)
+    is_new, *_ = pipe.execute()
+    if not is_new:
+        return False
+
+    daily_key = DAILY_KEY.format(date=today)
+    pipe = client.pipeline(transaction=False)
+    pipe.hincrby(PENDING_KEY, f"{property_id}:{today}", 1)
+    pipe.hincrby(daily_key, property_id, 1)
+    pipe.expire(daily_key, DAILY_KEY_TTL)
+    pipe.execute()
+    return True
+
+
+def unique_viewers(property_id, days=7):
+    """
+    Estimated unique viewers of a property over the last `days` days
+    (HyperLogLog, about 1% standard error). Returns (total, [(date, count)])
+    or None without Redis.
+    """
+    if not settings.USE_REDIS:
+        return None
+
+    today = date.today()
+    dates = [(today - timedelta(days=n)).isoformat() for n in range(days)]
+    keys = [VIEWERS_KEY.format(property_id=property_id, date=d) for d in dates]
+
+    pipe = get_redis().pipeline(transaction=False)
+    for key in keys:
+        pipe.pfcount(key)
+    # PFCOUNT over several keys counts the union, so a returning viewer
+    # is only counted once across the window
+    pipe.pfcount(*keys)
+    *daily, total = pipe.execute()
+
+    return total, list(zip(dates, daily))
+
+
+def increment_view_counts(deltas):
+    """
+    Add {property_id: views} to Property.view_count in a single
+    UPDATE ... FROM (VALUES ...) statement. Returns the new
+    {property_id: view_count}.
+    """
+    if not deltas:
+        return {}
+
+    values = ", ".join(["(%s::bigint, %s::integer)"] * len(deltas))
+    params = [value for item in deltas.items() for value in item]
+    table = Property._meta.db_table
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {table} AS p SET view_count = p.view_count + v.delta "
+            f"FROM (VALUES {values}) AS v(id, delta) WHERE p.id = v.id "
+            f"RETURNING p.id, p.view_count",
+            params,
+        )
+        return dict(cursor.fetchall())
+
+
+# Deletes the lock only if this flush still holds it
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def flush_views(write_dynamo=True):
+    """
+    Drain the Redis buffer into Postgres and DynamoDB.
+    Returns (views flushed, distinct properties, DynamoDB items written).
+    """
+    client = get_redis()
+    token = uuid.uuid4().hex
+    if not client.set(FLUSH_LOCK_KEY, token, nx=True, ex=FLUSH_LOCK_TTL):
+        # another flush is running; its successor picks up what is pending
+        return 0, 0, 0
+    try:
+        return _flush_batch(client, write_dynamo)
+    finally:
+        client.eval(RELEASE_LOCK_SCRIPT, 1, FLUSH_LOCK_KEY, token)
+
+
+def apply_batch(batch_id, deltas):
+    """
+    Add deltas to view_count unless batch_id was applied before.
+    Returns the resulting {property_id: view_count}.
+    """
+    try:
+        with transaction.atomic():
+            PropertyViewFlush.objects.create(batch_id=batch_id)
+            return increment_view_counts(deltas)
+    except IntegrityError:
+        logger.warning(f"View batch {batch_id} was already applied; skipping it")
+        return dict(
+            Property.objects.filter(id__in=deltas).values_list("id", "view_count")
+        )
+
+
+def _flush_batch(client, write_dynamo):
+    # A batch left behind by a crashed flush is written out before a new one
+    if not client.exists(FLUSHING_KEY):
+        try:
+            client.renamenx(PENDING_KEY, FLUSHING_KEY)
+        except ResponseError:
+            # no views buffered since the last flush
+            return 0, 0, 0
+
+    # Kept if set by a flush that crashed, so a retry reuses its id
+    client.hsetnx(FLUSHING_KEY, BATCH_ID_FIELD, uuid.uuid4().hex)
+    pending = client.hgetall(FLUSHING_KEY)
+    batch_id = pending.pop(BATCH_ID_FIELD)
+
+    deltas = defaultdict(int)
+    days = defaultdict(set)
+    for field, count in pending.items():
+        property_id, day = field.split(":", 1)
+        deltas[int(property_id)] += int(count)
+        days[day].add(int(property_id))
+
+    view_totals = apply_batch(batch_id, deltas)
+    client.delete(FLUSHING_KEY)
+    PropertyViewFlush.objects.filter(
+        created_at__lt=timezone.now() - FLUSH_RECORD_RETENTION
+    ).delete()
+
+    items = []
+    written = 0
+    if write_dynamo:
+        locations = {
+            property_id: (city, locality)
+            for property_id, city, locality in Property.objects.filter(
+                id__in=deltas
+            ).values_list("id", "city", "locality")
+        }
+        for day, property_ids in days.items():
+            ids = [pid for pid in property_ids if pid in locations]
+            totals = client.hmget(DAILY_KEY.format(date=day), ids)
+            for property_id, total in zip(ids, totals):
+                city, locality = locations[property_id]
+                items.append(
+                    {
+                        "property_id": property_id,
+                        "date": day,
+                        "view_count": int(total or 0),
+                        "city": city,
+                        "locality": locality,
+                    }
+                )
+
+        try:
+            record_property_view_totals(items, view_totals)
+            written = len(items) + len(view_totals)
+        except Exception as e:
+            logger.error(f"[CELERY] Failed to write view totals to DynamoDB: {e}")
+
+    return sum(deltas.values()), len(deltas), written
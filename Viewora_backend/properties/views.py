@@ -1,28 +1,47 @@
 # properties/views.py
 from django.conf import settings
+from django.db.models import BooleanField, Exists, OuterRef, Value
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
-from rest_framework import filters, generics, status
-from rest_framework.exceptions import AuthenticationFailed
+from rest_framework import generics, status
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from authentication.permissions import IsApprovedSeller
+from interests.models import PropertyInterest
 from utils.s3 import generate_presigned_get_url, generate_presigned_upload_url
 
+from .cache import get_property_detail_payload
+from .facets import get_facets
+from .filters import PropertyOrderingFilter, PropertySearchFilter
+from .geo import bbox_around, cells_for_bbox, distance_km_expression
+from .images import (
+    MAX_IMAGE_BYTES,
+    MAX_IMAGES_PER_REQUEST,
+    attach_property_images,
+    image_key_prefix,
+    new_image_key,
+    save_property_images,
+    stored_image_sizes,
+)
 from .models import Property, PropertyImage, PropertyVideo
-from .pagination import PropertyPagination
+from .pagination import PropertyCursorPagination, PropertyPagination
 from .serializers import (
     PropertyCreateSerializer,
     PropertyDetailSerializer,
+    PropertyImageSerializer,
     PropertyListSerializer,
+    PropertyNearbySerializer,
     PropertyUpdateSerializer,
     SellerPropertyListSerializer,
+    cover_images_prefetch,
 )
-from .tasks import record_property_view_task
+from .view_counter import VIEWERS_RETENTION_DAYS, record_view, unique_viewers
 
 
 class PropertyCreateView(APIView):
@@ -63,12 +82,10 @@ class PropertyCreateView(APIView):
         serializer.is_valid(raise_exception=True)
         property_obj = serializer.save(seller=request.user)
         
-        # Manually create PropertyImage objects
-        for img in images:
-            PropertyImage.objects.create(property=property_obj, image=img)
-            logger.info(f"Created PropertyImage for {img.name}")
+        # Upload images concurrently and insert them in one query
+        created = save_property_images(property_obj, images)
         
-        logger.info(f"Property {property_obj.id} created with {property_obj.images.count()} images")
+        logger.info(f"Property {property_obj.id} created with {len(created)} images")
         
         return Response(serializer.data, status=201)
 
@@ -78,21 +95,34 @@ class PropertyListView(generics.ListAPIView):
     serializer_class = PropertyListSerializer
     pagination_class = PropertyPagination
 
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-
-    search_fields = ["title", "description", "city", "locality"]
+    # ?search= runs against Property.search_vector, see properties/filters.py
+    filter_backends = [PropertySearchFilter, PropertyOrderingFilter]
 
     ordering_fields = ["price", "created_at", "view_count", "interest_count"]
 
     ordering = ["-created_at"]
 
+    @property
+    def paginator(self):
+        # ?pagination=cursor (or following a `next` cursor link) switches to
+        # keyset pagination, which skips OFFSET and the total count
+        if not hasattr(self, "_paginator"):
+            params = self.request.query_params
+            if params.get("pagination") == "cursor" or "cursor" in params:
+                self._paginator = PropertyCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
     def get_queryset(self):
         qs = Property.objects.filter(status="published", is_active=True)
+        qs = self.annotate_list_fields(qs)
 
         city = self.request.query_params.get("city")
         property_type = self.request.query_params.get("property_type")
         min_price = self.request.query_params.get("min_price")
         max_price = self.request.query_params.get("max_price")
+        bedrooms = self.request.query_params.get("bedrooms")
 
         if city:
             qs = qs.filter(city__iexact=city)
@@ -106,19 +136,172 @@ class PropertyListView(generics.ListAPIView):
         if max_price:
             qs = qs.filter(price__lte=max_price)
 
+        if bedrooms:
+            qs = qs.filter(bedrooms=bedrooms)
+
         return qs
 
+    def annotate_list_fields(self, qs):
+        """
+        Load everything PropertyListSerializer needs in a fixed number of
+        queries: seller via a join, the interest flag via Exists() and only
+        the first image of each property via a sliced prefetch.
+        """
+        user = self.request.user
+
+        if user.is_authenticated:
+            user_interested = Exists(
+                PropertyInterest.objects.filter(property=OuterRef("pk"), client=user)
+            )
+        else:
+            user_interested = Value(False, output_field=BooleanField())
+
+        return (
+            qs.select_related("seller")
+            .defer("search_vector")
+            .annotate(user_interested=user_interested)
+            .prefetch_related(cover_images_prefetch())
+        )
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+
+        # ?facets=true adds counts per city/type/bedrooms/price bucket
+        if request.query_params.get("facets") == "true":
+            queryset = self.filter_queryset(self.get_queryset())
+            response.data["facets"] = get_facets(queryset, request)
+
+        return response
+
     @swagger_auto_schema(
         tags=["Properties"],
         operation_summary="List properties",
         operation_description="List published properties with filters and pagination",
         security=[{"cookieAuth": []}],
+        manual_parameters=[
+            openapi.Parameter(
+                "pagination",
+                openapi.IN_QUERY,
+                description="Set to 'cursor' for keyset pagination without a total count",
+                type=openapi.TYPE_STRING,
+                enum=["page", "cursor"],
+            ),
+            openapi.Parameter(
+                "facets",
+                openapi.IN_QUERY,
+                description="Set to 'true' to include facet counts for the filtered set",
+                type=openapi.TYPE_BOOLEAN,
+            ),
+        ],
         responses={200: PropertyListSerializer(many=True)},
     )
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
 
 
+class PropertyNearbyView(PropertyListView):
+    """
+    Published properties around a point (?lat=&lng=&radius_km=) or inside a
+    bounding box (?min_lat=&max_lat=&min_lng=&max_lng=), nearest first.
+    The usual list filters, search and pagination still apply.
+    """
+
+    serializer_class = PropertyNearbySerializer
+
+    ordering_fields = PropertyListView.ordering_fields + ["distance_km"]
+
+    ordering = ["distance_km"]
+
+    DEFAULT_RADIUS_KM = 5
+    MAX_RADIUS_KM = 50
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        params = self.request.query_params
+
+        if "lat" in params or "lng" in params:
+            lat = self.get_coordinate("lat", -90, 90)
+            lng = self.get_coordinate("lng", -180, 180)
+            radius_km = self.get_radius()
+            min_lat, max_lat, min_lng, max_lng = bbox_around(lat, lng, radius_km)
+        else:
+            min_lat = self.get_coordinate("min_lat", -90, 90)
+            max_lat = self.get_coordinate("max_lat", -90, 90)
+            min_lng = self.get_coordinate("min_lng", -180, 180)
+            max_lng = self.get_coordinate("max_lng", -180, 180)
+            if min_lat > max_lat or min_lng > max_lng:
+                raise ValidationError("Invalid bounding box")
+            lat, lng = (min_lat + max_lat) / 2, (min_lng + max_lng) / 2
+            radius_km = None
+
+        cells = cells_for_bbox(min_lat, max_lat, min_lng, max_lng)
+        if cells is None:
+            raise ValidationError("Bounding box is too large")
+
+        # geo_cell narrows the scan to a few index ranges; the exact box and
+        # distance checks then run only on those candidates
+        qs = qs.filter(
+            geo_cell__in=cells,
+            latitude__range=(min_lat, max_lat),
+            longitude__range=(min_lng, max_lng),
+        ).annotate(distance_km=distance_km_expression(lat, lng))
+
+        if radius_km is not None:
+            qs = qs.filter(distance_km__lte=radius_km)
+
+        return qs
+
+    def get_coordinate(self, name, lower, upper):
+        value = self.request.query_params.get(name)
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            raise ValidationError(f"{name} is required and must be a number")
+        if not lower <= value <= upper:
+            raise ValidationError(f"{name} must be between {lower} and {upper}")
+        return value
+
+    def get_radius(self):
+        value = self.request.query_params.get("radius_km", self.DEFAULT_RADIUS_KM)
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            raise ValidationError("radius_km must be a number")
+        if not 0 < value <= self.MAX_RADIUS_KM:
+            raise ValidationError(
+                f"radius_km must be between 0 and {self.MAX_RADIUS_KM}"
+            )
+        return value
+
+    @swagger_auto_schema(
+        tags=["Properties"],
+        operation_summary="Nearby properties",
+        operation_description=(
+            "Published properties within radius_km of lat/lng, or inside a "
+            "bounding box, sorted by distance"
+        ),
+        security=[{"cookieAuth": []}],
+        manual_parameters=[
+            openapi.Parameter(name, openapi.IN_QUERY, type=openapi.TYPE_NUMBER)
+            for name in [
+                "lat",
+                "lng",
+                "radius_km",
+                "min_lat",
+                "max_lat",
+                "min_lng",
+                "max_lng",
+            ]
+        ],
+        responses={
+            200: PropertyNearbySerializer(many=True),
+            400: "Invalid coordinates",
+        },
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
 class PropertyDetailView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -132,21 +315,27 @@ class PropertyDetailView(APIView):
         },
     )
     def get(self, request, pk):
-        property_obj = get_object_or_404(
-            Property, id=pk, status="published", is_active=True
-        )
-        if hasattr(property_obj, "video") and property_obj.video:
-            property_obj.video.video_url = generate_presigned_get_url(
-                property_obj.video.s3_key
-            )
-        record_property_view_task.delay(
-            property_obj.id, property_obj.city, property_obj.locality
-        )
-        serializer = PropertyDetailSerializer(
-            property_obj, context={"request": request}
+        data = get_property_detail_payload(pk)
+        if not data or data["status"] != "published" or not data["is_active"]:
+            raise Http404
+
+        data = dict(data)
+        video_key = data.pop("video_key")
+        data["video_url"] = generate_presigned_get_url(video_key) if video_key else None
+
+        # Single per-user lookup merged into the shared payload
+        interest_id = (
+            PropertyInterest.objects.filter(property_id=pk, client=request.user)
+            .values_list("id", flat=True)
+            .first()
         )
+        data["is_interested"] = interest_id is not None
+        data["active_interest_id"] = interest_id
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # Repeat views by the same user on the same day are not counted
+        record_view(data["id"], data["city"], data["locality"], request.user.id)
+
+        return Response(data, status=status.HTTP_200_OK)
 
 
 class SellerPropertyListView(generics.ListAPIView):
@@ -154,9 +343,13 @@ class SellerPropertyListView(generics.ListAPIView):
     serializer_class = SellerPropertyListSerializer
 
     def get_queryset(self):
-        return Property.objects.filter(
-            seller=self.request.user,
-        ).order_by("-created_at")
+        return (
+            Property.objects.filter(
+                seller=self.request.user,
+            )
+            .prefetch_related(cover_images_prefetch())
+            .order_by("-created_at")
+        )
 
     @swagger_auto_schema(
         tags=["Seller Properties"],
@@ -219,6 +412,60 @@ class SellerPropertyDetailView(generics.RetrieveAPIView):
         return Response(serializer.data)
 
 
+class SellerPropertyViewersView(APIView):
+    permission_classes = [IsApprovedSeller]
+
+    DEFAULT_DAYS = 7
+
+    @swagger_auto_schema(
+        tags=["Seller Properties"],
+        operation_summary="Unique viewers of a property",
+        operation_description=(
+            "Estimated unique viewers per day and over the whole window "
+            f"(?days=, at most {VIEWERS_RETENTION_DAYS})"
+        ),
+        security=[{"cookieAuth": []}],
+        manual_parameters=[
+            openapi.Parameter("days", openapi.IN_QUERY, type=openapi.TYPE_INTEGER)
+        ],
+        responses={
+            200: "Unique viewer estimates",
+            400: "Invalid days",
+            404: "Property not found",
+        },
+    )
+    def get(self, request, pk):
+        prop = get_object_or_404(Property, id=pk, seller=request.user)
+
+        try:
+            days = int(request.query_params.get("days", self.DEFAULT_DAYS))
+        except ValueError:
+            raise ValidationError("days must be a number")
+        if not 1 <= days <= VIEWERS_RETENTION_DAYS:
+            raise ValidationError(
+                f"days must be between 1 and {VIEWERS_RETENTION_DAYS}"
+            )
+
+        estimates = unique_viewers(prop.id, days)
+        if estimates is None:
+            # Unique viewers are only tracked when Redis is enabled
+            return Response(
+                {"id": prop.id, "view_count": prop.view_count, "unique_viewers": None}
+            )
+
+        total, daily = estimates
+        return Response(
+            {
+                "id": prop.id,
+                "view_count": prop.view_count,
+                "unique_viewers": total,
+                "daily": [
+                    {"date": day, "unique_viewers": count} for day, count in daily
+                ],
+            }
+        )
+
+
 class SellerPropertyUpdateView(generics.UpdateAPIView):
     permission_classes = [IsApprovedSeller]
     serializer_class = PropertyUpdateSerializer
@@ -320,3 +567,140 @@ class PropertyAttachVideoView(APIView):
         )
 
         return Response({"message": "Video attached"})
+
+
+class PropertyImagePresignView(APIView):
+    permission_classes = [IsApprovedSeller]
+
+    @swagger_auto_schema(
+        tags=["Properties"],
+        operation_summary="Generate presigned image upload URLs",
+        operation_description=(
+            "Generate one S3 presigned URL per image, up to "
+            f"{MAX_IMAGES_PER_REQUEST} per request. Upload each file with PUT, "
+            "then attach the returned keys."
+        ),
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "files": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        properties={
+                            "file_name": openapi.Schema(type=openapi.TYPE_STRING),
+                            "content_type": openapi.Schema(type=openapi.TYPE_STRING),
+                        },
+                    ),
+                ),
+            },
+            required=["files"],
+        ),
+        responses={
+            200: "Presigned URLs generated",
+            400: "Invalid files",
+            403: "Forbidden",
+            404: "Property not found",
+        },
+    )
+    def post(self, request, pk):
+        property_obj = get_object_or_404(Property, id=pk, seller=request.user)
+
+        files = request.data.get("files")
+        if not isinstance(files, list) or not files:
+            raise ValidationError("files must be a non-empty list")
+        if len(files) > MAX_IMAGES_PER_REQUEST:
+            raise ValidationError(
+                f"At most {MAX_IMAGES_PER_REQUEST} images per request"
+            )
+
+        uploads = []
+        for file in files:
+            file_name = file.get("file_name") if isinstance(file, dict) else None
+            content_type = file.get("content_type") if isinstance(file, dict) else None
+            if not file_name or not content_type:
+                raise ValidationError("file_name and content_type required")
+            if not content_type.startswith("image/"):
+                raise ValidationError(f"{file_name} is not an image")
+
+            key = new_image_key(property_obj.id, file_name)
+            uploads.append(
+                {
+                    "file_name": file_name,
+                    "key": key,
+                    "upload_url": generate_presigned_upload_url(key, content_type),
+                }
+            )
+
+        return Response({"uploads": uploads})
+
+
+class PropertyImageAttachView(APIView):
+    permission_classes = [IsApprovedSeller]
+
+    @swagger_auto_schema(
+        tags=["Properties"],
+        operation_summary="Attach uploaded images to property",
+        operation_description="Attach images uploaded with presigned URLs",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "keys": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(type=openapi.TYPE_STRING),
+                ),
+            },
+            required=["keys"],
+        ),
+        responses={
+            201: PropertyImageSerializer(many=True),
+            400: "Invalid keys, or an image was not uploaded or is too large",
+            403: "Forbidden",
+            404: "Property not found",
+        },
+    )
+    def post(self, request, pk):
+        property_obj = get_object_or_404(Property, id=pk, seller=request.user)
+
+        keys = request.data.get("keys")
+        if not isinstance(keys, list) or not keys:
+            raise ValidationError("keys must be a non-empty list")
+        if len(keys) > MAX_IMAGES_PER_REQUEST:
+            raise ValidationError(
+                f"At most {MAX_IMAGES_PER_REQUEST} images per request"
+            )
+
+        # Only keys issued by the presign endpoint for this property
+        prefix = image_key_prefix(property_obj.id)
+        for key in keys:
+            if (
+                not isinstance(key, str)
+                or not key.startswith(prefix)
+                or "/" in key[len(prefix) :]
+            ):
+                raise ValidationError(f"Invalid image key: {key}")
+
+        existing = set(
+            PropertyImage.objects.filter(
+                property=property_obj, image__in=keys
+            ).values_list("image", flat=True)
+        )
+        new_keys = [key for key in dict.fromkeys(keys) if key not in existing]
+
+        # A key is only a name until the client's PUT has succeeded. The
+        # content type needs no check: the presigned PUT is signed for the
+        # image/* type accepted by the presign endpoint.
+        for key, size in stored_image_sizes(new_keys).items():
+            if size is None:
+                raise ValidationError(f"Image not uploaded: {key}")
+            if size > MAX_IMAGE_BYTES:
+                raise ValidationError(
+                    f"Image larger than {MAX_IMAGE_BYTES // (1024 * 1024)} MB: {key}"
+                )
+
+        images = attach_property_images(property_obj, new_keys)
+
+        return Response(
+            PropertyImageSerializer(images, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
@@ -3,6 +3,7 @@ import os
 from datetime import date
 
 import boto3
+from botocore.exceptions import ClientError
 
 dynamodb = boto3.resource(
     "dynamodb",
@@ -13,8 +14,17 @@ dynamodb = boto3.resource(
 
 table = dynamodb.Table("PropertyViewEvents")
 
+# Sort key of the per-property all-time totals, which the AI service reads
+# for many properties at once with batch_get_item
+TOTAL_SORT_KEY = "total"
 
-def record_property_view(property_id, city, locality):
+
+def record_property_view(property_id, city, locality, total_views=None):
+    """
+    Count one view in today's item. total_views is the property's all-time
+    count from Postgres (after this view), copied into the total item; ADD
+    would start it from 0 and lose every view from before the total existed.
+    """
     today = date.today().isoformat()
 
     table.update_item(
@@ -29,3 +39,59 @@ def record_property_view(property_id, city, locality):
             ":locality": locality,
         },
     )
+    if total_views is not None:
+        set_view_total(property_id, total_views)
+
+
+def set_total(table, sort_key, attribute, property_id, total):
+    """
+    Store a property's all-time total from Postgres in its total item. The
+    write only raises the total, so when concurrent writers race the larger
+    (newer) value wins instead of the last one to arrive.
+    Returns False when the stored total was already as high.
+    """
+    try:
+        table.update_item(
+            Key={"property_id": str(property_id), sort_key: TOTAL_SORT_KEY},
+            UpdateExpression="SET #total = :total",
+            ConditionExpression="attribute_not_exists(#total) OR #total < :total",
+            ExpressionAttributeNames={"#total": attribute},
+            ExpressionAttributeValues={":total": total},
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            raise
+        return False
+    return True
+
+
+def set_view_total(property_id, total_views):
+    return set_total(table, "date", "view_count", property_id, total_views)
+
+
+def record_property_view_totals(items, totals=None):
+    """
+    Write daily view totals in bulk. Each item is a dict with property_id,
+    date, view_count, city and locality; view_count is the full total for
+    that day, so repeated flushes overwrite rather than add.
+    totals ({property_id: all-time views}) go into the same batch.
+    """
+    with table.batch_writer(overwrite_by_pkeys=["property_id", "date"]) as batch:
+        for property_id, view_count in (totals or {}).items():
+            batch.put_item(
+                Item={
+                    "property_id": str(property_id),
+                    "date": TOTAL_SORT_KEY,
+                    "view_count": view_count,
+                }
+            )
+        for item in items:
+            batch.put_item(
+                Item={
+                    "property_id": str(item["property_id"]),
+                    "date": item["date"],
+                    "view_count": item["view_count"],
+                    "city": item["city"],
+                    "locality": item["locality"],
+                }
+            )
@@ -5,6 +5,8 @@ from datetime import datetime
 
 import boto3
 
+from utils.dynamodb import set_total
+
 dynamodb = boto3.resource(
     "dynamodb",
     aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
@@ -15,10 +17,11 @@ dynamodb = boto3.resource(
 table = dynamodb.Table("PropertyInterestEvents")
 
 
-def record_property_interest(property_id, user):
+def record_property_interest(property_id, user, interest_count=None):
     """
     Store interest event ONLY for analytics / AI.
     Never used for business logic.
+    interest_count, the property's all-time total, is stored alongside it.
     """
     ttl = int(time.time()) + (60 * 60 * 24 * 90)  # 90 days
 
@@ -34,3 +37,11 @@ def record_property_interest(property_id, user):
             "ttl": ttl,
         }
     )
+    if interest_count is not None:
+        set_interest_total(property_id, interest_count)
+
+
+def set_interest_total(property_id, interest_count):
+    return set_total(
+        table, "interested_at", "interest_count", property_id, interest_count
+    )
@@ -0,0 +1,23 @@
+import threading
+
+import redis
+from django.conf import settings
+
+_lock = threading.Lock()
+_client = None
+
+
+def get_redis():
+    """
+    Shared Redis client for counters and other non-cache data
+    (settings.REDIS_URL, db 0). redis-py resets its connection pool after a
+    fork, so Celery and gunicorn workers can share the module-level client.
+    """
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = redis.Redis.from_url(
+                    settings.REDIS_URL, decode_responses=True
+                )
+    return _client
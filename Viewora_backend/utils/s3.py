@@ -1,17 +1,47 @@
+import hashlib
+import os
+import threading
+
 import boto3
+from botocore.config import Config
 from django.conf import settings
+from django.core.cache import cache
+
+# A signed GET URL is reused until it has this many seconds of validity left,
+# so every client receives a link that stays valid for at least 15 minutes
+PRESIGNED_URL_MIN_VALIDITY = 900
+
+_client_lock = threading.Lock()
+_clients = {}
+
+
+def get_s3_client():
+    """
+    Process-wide S3 client. boto3 clients are thread-safe, so one client (and
+    its connection pool) is shared by all threads; a forked worker builds its
+    own on first use.
+    """
+    pid = os.getpid()
+    client = _clients.get(pid)
+    if client is None:
+        with _client_lock:
+            client = _clients.get(pid)
+            if client is None:
+                client = boto3.client(
+                    "s3",
+                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                    region_name=settings.AWS_REGION,
+                    config=Config(max_pool_connections=20),
+                )
+                _clients.clear()
+                _clients[pid] = client
+    return client
 
 
 # seller upload
 def generate_presigned_upload_url(key, content_type):
-    s3 = boto3.client(
-        "s3",
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        region_name=settings.AWS_REGION,
-    )
-
-    return s3.generate_presigned_url(
+    return get_s3_client().generate_presigned_url(
         "put_object",
         Params={
             "Bucket": settings.AWS_S3_BUCKET,
@@ -24,14 +54,13 @@ def generate_presigned_upload_url(key, content_type):
 
 # client get
 def generate_presigned_get_url(key, expires=3600):
-    s3 = boto3.client(
-        "s3",
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        region_name=settings.AWS_REGION,
-    )
+    digest = hashlib.md5(key.encode()).hexdigest()
+    cache_key = f"s3_presigned_get:{expires}:{digest}"
+    url = cache.get(cache_key)
+    if url is not None:
+        return url
 
-    return s3.generate_presigned_url(
+    url = get_s3_client().generate_presigned_url(
         "get_object",
         Params={
             "Bucket": settings.AWS_S3_BUCKET,
@@ -40,5 +69,10 @@ def generate_presigned_get_url(key, expires=3600):
         ExpiresIn=expires,
     )
 
+    reuse_for = expires - PRESIGNED_URL_MIN_VALIDITY
+    if reuse_for > 0:
+        cache.set(cache_key, url, reuse_for)
+    return url
+
 
 # s3-permissions-cors change in into domain while hosting
@@ -40,6 +40,7 @@ CHANNEL_LAYERS = {
 }
 
 USE_REDIS = os.getenv("USE_REDIS") == "true"
+REDIS_URL = f"redis://{get_env_str('REDIS_HOST', 'redis')}:{get_env_int('REDIS_PORT', 6379)}"
 if USE_REDIS:
     CHANNEL_LAYERS = {
         "default": {
@@ -50,6 +51,21 @@ if USE_REDIS:
         },
     }
 
+# Shared cache (per-process memory unless Redis is enabled)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+}
+
+if USE_REDIS:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": f"{REDIS_URL}/1",
+        },
+    }
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
@@ -93,6 +109,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "authentication",
     "properties",
@@ -5,3 +5,79 @@ export const getAreaInsights = (question) => {
     question,
   });
 };
+
+// Streams the answer as Server-Sent Events. onToken(text) is called for each
+// chunk as it is generated; resolves with the final
+// { answer, references, sources, cached } sent in the "done" event.
+export const streamAreaInsights = async (question, onToken) => {
+  const headers = {
+    "Content-Type": "application/json",
+    Accept: "text/event-stream",
+  };
+  const token = localStorage.getItem("access_token");
+  if (token) {
+    headers.Authorization = `Bearer ${token}`;
+  }
+
+  const response = await fetch(
+    `${import.meta.env.VITE_API_BASE_URL || ""}/api/ai/area-insights/stream/`,
+    {
+      method: "POST",
+      credentials: "include",
+      headers,
+      body: JSON.stringify({ question }),
+    }
+  );
+
+  if (response.status === 401) {
+    // axiosInstance refreshes the access token; answer this one in one piece
+    const res = await getAreaInsights(question);
+    return res.data;
+  }
+
+  if (!response.ok) {
+    const data = await response.json().catch(() => ({}));
+    const error = new Error(data.error || `AI service error (${response.status})`);
+    error.response = { status: response.status, data };
+    throw error;
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    // Events are separated by a blank line
+    let boundary;
+    while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+      const block = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+
+      let type = "message";
+      let data = "";
+      for (const line of block.split("\n")) {
+        if (line.startsWith("event:")) type = line.slice(6).trim();
+        else if (line.startsWith("data:")) data += line.slice(5).trim();
+      }
+      const payload = data ? JSON.parse(data) : {};
+
+      if (type === "token") {
+        onToken(payload.text);
+      } else if (type === "done") {
+        reader.cancel();
+        return payload;
+      } else if (type === "error") {
+        reader.cancel();
+        const error = new Error(payload.error);
+        error.response = { data: payload };
+        throw error;
+      }
+    }
+  }
+
+  throw new Error("The AI answer ended unexpectedly. Please try again.");
+};
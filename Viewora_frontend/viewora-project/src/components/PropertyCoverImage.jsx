@@ -0,0 +1,45 @@
+import { useState } from "react";
+
+// Browsers pick the first <source> they support, so the smallest format goes first
+const FORMATS = [
+  ["avif", "image/avif"],
+  ["webp", "image/webp"],
+];
+
+/*
+ * Cover photo of a list row. Uses the resized AVIF/WebP variants from
+ * cover_srcset and cover_thumbnail, and the original cover_image until the
+ * variants exist (cover_srcset is {} right after upload) or if one fails to load.
+ */
+export default function PropertyCoverImage({ property, sizes, alt = "", className }) {
+  const [failed, setFailed] = useState(false);
+  const srcset = property.cover_srcset || {};
+  const src = failed
+    ? property.cover_image
+    : property.cover_thumbnail || property.cover_image;
+
+  if (!src) return null;
+
+  const img = (
+    <img
+      src={src}
+      alt={alt}
+      loading="lazy"
+      decoding="async"
+      className={className}
+      onError={() => setFailed(true)}
+    />
+  );
+
+  const sources = FORMATS.filter(([format]) => srcset[format]);
+  if (failed || sources.length === 0) return img;
+
+  return (
+    <picture className="contents">
+      {sources.map(([format, type]) => (
+        <source key={format} type={type} srcSet={srcset[format]} sizes={sizes} />
+      ))}
+      {img}
+    </picture>
+  );
+}
@@ -2,7 +2,7 @@
 import { useState, useRef, useEffect, useContext, forwardRef, useImperativeHandle } from "react";
 import { useNavigate } from "react-router-dom";
 import { AuthContext } from "../../auth/AuthContext";
-import { getAreaInsights } from "../../api/aiApi";
+import { streamAreaInsights } from "../../api/aiApi";
 import MarkdownRenderer from "../ui/MarkdownRenderer";
 import { 
   Send, Sparkles, RefreshCw, Bot, User, 
@@ -69,16 +69,44 @@ const AIChatBot = forwardRef((props, ref) => {
     setInput("");
     setLoading(true);
 
+    // The answer is shown as it streams in; its message is added with the first chunk
+    let streamed = "";
+    const updateAnswer = (changes) => {
+      setMessages(prev => {
+        const next = [...prev];
+        next[next.length - 1] = { ...next[next.length - 1], ...changes };
+        return next;
+      });
+    };
+
     try {
-      const res = await getAreaInsights(query);
-      const aiMsg = { 
-        role: "assistant", 
-        content: res.data.answer, 
-        sources: res.data.sources || [],
-        time: new Date() 
+      const result = await streamAreaInsights(query, (text) => {
+        if (!streamed) {
+          setMessages(prev => [...prev, { role: "assistant", content: "", streaming: true, time: new Date() }]);
+        }
+        streamed += text;
+        updateAnswer({ content: streamed });
+      });
+
+      // Only the properties the advisor referenced are shown as cards
+      const refIds = (result.references || []).map(String);
+      const sources = result.sources || [];
+      const finalMsg = {
+        role: "assistant",
+        content: result.answer,
+        sources: refIds.length ? sources.filter(s => refIds.includes(String(s.property_id))) : sources,
+        streaming: false,
+        time: new Date()
       };
-      setMessages(prev => [...prev, aiMsg]);
+      if (streamed) {
+        updateAnswer(finalMsg);
+      } else {
+        setMessages(prev => [...prev, finalMsg]);
+      }
     } catch (err) {
+      if (streamed) {
+        updateAnswer({ streaming: false });
+      }
       const errorMessage = err.response?.data?.error || "I'm sorry, I'm having trouble connecting to the AI service. Please try again in a moment.";
       const errorMsg = { 
         role: "assistant", 
@@ -227,7 +255,7 @@ const AIChatBot = forwardRef((props, ref) => {
           );
         })}
         
-        {loading && (
+        {loading && !messages[messages.length - 1]?.streaming && (
           <div className="flex justify-start">
             <div className="flex gap-3">
               <div className="w-8 h-8 rounded-xl bg-brand-primary/5 border border-brand-primary/10 flex items-center justify-center">
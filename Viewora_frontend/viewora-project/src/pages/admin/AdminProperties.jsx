@@ -1,6 +1,7 @@
 import { useEffect, useState } from "react";
 import { fetchAdminProperties, togglePropertyStatus } from "../../api/authApi";
 import AdminLayout from "../../components/admin/AdminLayout";
+import PropertyCoverImage from "../../components/PropertyCoverImage";
 import { toast } from "react-toastify";
 import useDebounce from "../../hooks/useDebounce";
 import { 
@@ -91,7 +92,7 @@ export default function AdminProperties() {
                       <div className="flex items-center gap-3">
                         <div className="w-14 h-14 rounded-xl bg-gray-50 overflow-hidden border border-gray-100 flex-shrink-0 relative group/img">
                           {p.cover_image ? (
-                            <img src={p.cover_image} alt="" className="w-full h-full object-cover transition-transform duration-500 group-hover/img:scale-110" />
+                            <PropertyCoverImage property={p} sizes="56px" className="w-full h-full object-cover transition-transform duration-500 group-hover/img:scale-110" />
                           ) : (
                             <div className="w-full h-full flex items-center justify-center bg-gray-50">
                               <Building2 className="text-gray-200" size={24} />
@@ -1,5 +1,6 @@
 
 import { MapPin, Bed, Bath, Move, Eye, Users, ChevronRight, CheckCircle2 } from "lucide-react";
+import PropertyCoverImage from "../../components/PropertyCoverImage";
 
 export default function PropertyCard({ property, onView }) {
   const imageUrl = property.cover_image;
@@ -12,9 +13,10 @@ export default function PropertyCard({ property, onView }) {
       {/* IMAGE SECTION */}
       <div className="relative h-64 overflow-hidden">
         {imageUrl ? (
-          <img
-            src={imageUrl}
+          <PropertyCoverImage
+            property={property}
             alt={property.title}
+            sizes="(min-width: 1024px) 33vw, (min-width: 640px) 50vw, 100vw"
             className="w-full h-full object-cover transition-transform duration-1000 group-hover:scale-105"
           />
         ) : (
@@ -1,5 +1,6 @@
 
 import { useNavigate } from "react-router-dom";
+import PropertyCoverImage from "../../components/PropertyCoverImage";
 
 export default function SellerPropertyCard({ property, onToggle }) {
   const navigate = useNavigate();
@@ -21,9 +22,10 @@ export default function SellerPropertyCard({ property, onToggle }) {
       {/* Image */}
       {imageUrl && (
         <div className="relative h-52 overflow-hidden">
-          <img
-            src={imageUrl}
+          <PropertyCoverImage
+            property={property}
             alt={property.title}
+            sizes="(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw"
             className="
               h-full w-full object-cover
               group-hover:scale-105 transition-transform duration-500